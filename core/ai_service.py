@@ -9,6 +9,9 @@ AI 服務模組
 - 生成複習題
 - 根據標籤生成題目
 - 分析常見錯誤
+
+每個公開方法都提供 `*_async` 版本，透過 SDK 原生的異步 API 調用模型，
+供 FastAPI 的 async 路由使用而不阻塞事件循環。
 """
 
 import asyncio
@@ -18,7 +21,165 @@ import os
 import time
 from typing import Any, Optional
 
+from core.grading_cache import build_grading_cache_key, create_grading_cache_from_env
 from core.log_config import get_module_logger
+from core.prompt_registry import get_prompt_registry
+
+# 批改提示詞版本（範本 "grade" 的版本號）
+GRADE_PROMPT_VERSION = "2"
+
+# 系統提示詞範本（str.format 語法，JSON 範例的大括號寫成 {{ }}），AIService 初始化時編譯並註冊。
+# 修改內容時請遞增版本號；版本標記另含內容雜湊，依賴它的批改快取會自動失效
+PROMPT_TEMPLATES: dict[str, tuple[str, str]] = {
+    "grade": (
+        GRADE_PROMPT_VERSION,
+        """
+        你是一位專業的英文教師，請批改學生的翻譯。
+
+        中文原句：{chinese}
+        {hint_line}
+
+        請以 JSON 格式回覆，包含以下欄位：
+
+        1. is_generally_correct (boolean): 翻譯是否基本正確。
+
+        2. overall_suggestion (string): 建議的最佳翻譯（完整句子，使用英文）。
+
+        3. error_analysis (array): 錯誤分析列表，每個錯誤包含：
+           - category (string): 錯誤分類代碼，必須是以下其中一種：
+             * "systematic" - 系統性錯誤：涉及文法規則，學會規則後可避免同類錯誤（如時態、主謂一致、動詞變化）。
+             * "isolated" - 單一性錯誤：需要個別記憶的內容（如特定詞彙、搭配詞、介係詞、拼寫）。
+             * "enhancement" - 可以更好：文法正確但表達可以更自然、更道地。
+             * "other" - 其他錯誤：不屬於上述類別的錯誤（如漏譯、理解錯誤）。
+
+           - key_point_summary (string): 錯誤重點的具體描述，格式為「錯誤類型: 具體錯誤內容」。
+             例如：「單字拼寫錯誤: irrevertable」、「時態錯誤: have → has」、「介系詞搭配: in → on」。
+             這樣可以區分不同的具體錯誤，避免把不相關的錯誤歸在一起（使用繁體中文）。
+
+           - original_phrase (string): 學生寫錯的片語或句子部分。
+
+           - correction (string): 正確的寫法。
+
+           - explanation (string): 詳細解釋為什麼錯了，以及正確的用法（使用繁體中文）。
+
+           - severity (string): 嚴重程度，"major"（重要錯誤）或 "minor"（次要問題）。
+
+        分類原則：
+        - 如果錯誤涉及可以通過學習規則解決的文法問題，使用 "systematic"。
+        - 如果錯誤需要記憶特定用法或單字，使用 "isolated"。
+        - 如果翻譯正確但可以更自然，使用 "enhancement"（通常是 minor）。
+        - 其他情況使用 "other"。
+
+        重要：
+        - 請確保 category 欄位完全匹配上述四個代碼之一。
+        - 每個錯誤都要有清楚的 explanation。
+        - overall_suggestion 必須是完整、正確的英文句子。
+        """,
+    ),
+    "practice": (
+        "1",
+        """
+        你是一位專業的英文出題教師，
+        請生成一個{difficulty}、且{length_hint}的中文句子，
+        用於英文翻譯練習。
+
+        要求：
+        1. 句子要自然、實用、符合日常對話或寫作情境。
+        2. 長度適中（10-30字）。
+        3. 包含明確的語法重點或常見表達。
+        4. 避免過於文言或罕見的表達方式。
+        5. 請參考以下代表例句風格，但不要重複：
+        {examples_text}
+
+        請以 JSON 格式回覆：
+        {{
+            "sentence": "中文句子",
+            "hint": "這個句子的翻譯重點或提示（例如：注意時態、注意介係詞等）",
+            "difficulty_level": {level},
+            "grammar_points": ["涉及的文法點1", "涉及的文法點2"]
+        }}
+        """,
+    ),
+    "review": (
+        "1",
+        """
+        你是一位專業的英文教師，正在幫助學生複習。
+        請使用以下知識點設計一個{length_hint}的中文句子讓學生翻譯：
+        {points_json}
+
+        要求：
+        - 必須考察到所有提供的知識點。
+        - 句子要自然、實用，不要生硬堆砌。
+        - 確保錯誤點能在翻譯中被自然考察到。
+
+        請以 JSON 格式回覆：
+        {{
+            "sentence": "要翻譯的中文句子",
+            "hint": "給學生的提示（簡潔指出要注意什麼）",
+            "target_point_ids": {target_ids},
+            "target_points_description": "本題考察：{target_description}",
+            "difficulty_level": {level}
+        }}
+        """,
+    ),
+    "tagged": (
+        "1",
+        """
+        你是專業的英文教師，請設計一個翻譯練習題目。
+        要求使用的文法句型：
+        {tag_details_json}
+        組合要求：{mode_instruction}
+        題目要求：
+        1. 設計一個{length_hint}的中文句子。
+        2. 難度等級：{level}/5。
+        3. 必須自然地融入指定的文法句型。
+        4. 句子要實用、貼近生活或工作場景。
+        5. 避免生硬堆砌，確保語意流暢。
+        請以 JSON 格式回覆：
+        {{
+            "sentence": "要翻譯的中文句子",
+            "hint": "給學生的提示（簡潔指出要注意的文法重點）",
+            "covered_points": ["實際使用的文法點1", "實際使用的文法點2"],
+            "expected_patterns": ["預期使用的句型結構"],
+            "difficulty_level": {level}
+        }}
+        """,
+    ),
+    "mistake_analysis": (
+        "1",
+        """
+        你是一位英語教學專家，請分析學生的錯誤模式並提供學習建議。
+        請以 JSON 格式回覆：
+        {{
+            "common_patterns": [{{"pattern": "錯誤模式描述", "frequency": "出現頻率（高/中/低）", "examples": ["例子1", "例子2"]}}],
+            "learning_suggestions": [{{"priority": "優先級（高/中/低）", "focus_area": "需要加強的領域", "specific_advice": "具體的學習建議", "resources": ["建議的學習資源或方法"]}}],
+            "overall_assessment": "整體評估和鼓勵的話"
+        }}
+        """,
+    ),
+    "pattern": (
+        "1",
+        """
+        你是一位專業的英文教師，請根據指定的文法句型生成一個中文練習句子。
+        目標句型：{pattern_name}
+        句型公式：{formula}
+        核心概念：{core_concept}
+        參考例句：{example_text}
+        要求：
+        1. 生成一個{length_hint}的中文句子。
+        2. 難度為{difficulty_hint}。
+        3. 句子必須能夠自然地使用「{pattern_name}」句型來翻譯。
+        4. 句子要實用、貼近生活或工作場景。
+        5. 不要直接複製例句，要有創意。
+        請以 JSON 格式回覆：
+        {{
+            "sentence": "要翻譯的中文句子",
+            "hint": "給學生的提示（簡短說明這個句型的使用要點）",
+            "expected_structure": "預期的英文句型結構（使用 ... 表示可填入的部分）"
+        }}
+        """,
+    ),
+}
 
 
 class AIService:
@@ -39,6 +200,15 @@ class AIService:
         self.grade_model_name = os.getenv("GEMINI_GRADE_MODEL", "gemini-2.5-pro")
         self.generate_model = None
         self.grade_model = None
+        # 限制同時進行的異步 LLM 調用數量，避免單一 worker 被大量並行請求壓垮
+        self.max_concurrent_calls = int(os.getenv("GEMINI_MAX_CONCURRENT_CALLS", "8"))
+        self._call_semaphore: Optional[asyncio.Semaphore] = None
+        # 批改結果快取：相同內容的提交直接重用先前的批改結果
+        self.grading_cache = create_grading_cache_from_env()
+        # 系統提示詞範本只在此編譯一次，並依範本累計提示詞與回應大小
+        self.prompts = get_prompt_registry()
+        for name, (version, template) in PROMPT_TEMPLATES.items():
+            self.prompts.register(name, version, template)
         self._init_gemini()
         # 儲存最近的 LLM 互動記錄，方便調試
         self.last_llm_interaction = None
@@ -87,108 +257,257 @@ class AIService:
             self.logger.error(f"Gemini 初始化失敗: {e}")
             raise
 
+    def _build_request_options(self, timeout: int, use_async: bool = False):
+        """
+        建立 Gemini API 的請求選項（超時與重試策略）。
+
+        Args:
+            timeout: API 調用超時時間（秒）。
+            use_async: 是否為異步調用建立選項（使用 `AsyncRetry`）。
+
+        Returns:
+            `genai.types.RequestOptions` 實例。
+        """
+        import google.generativeai as genai
+        from google.api_core import retry, retry_async
+
+        retry_class = retry_async.AsyncRetry if use_async else retry.Retry
+        # 🔧 修復：添加超時和重試機制
+        return genai.types.RequestOptions(
+            timeout=timeout,  # 設置超時時間
+            retry=retry_class(
+                initial=1.0,        # 初始重試延遲 1 秒
+                maximum=3.0,        # 最大重試延遲 3 秒
+                multiplier=1.5,     # 重試延遲倍增係數
+                deadline=timeout,   # 總體超時時間
+                predicate=retry.if_transient_error  # 只重試暫時性錯誤
+            )
+        )
+
+    def _get_model_config(self, model) -> dict[str, Any]:
+        """安全地獲取模型配置信息，用於記錄互動。"""
+        generation_config = getattr(model, "generation_config", None)
+        return {
+            "model_name": getattr(model, "model_name", str(model)),
+            "temperature": getattr(generation_config, "temperature", None),
+            "top_p": getattr(generation_config, "top_p", None),
+            "top_k": getattr(generation_config, "top_k", None),
+        }
+
+    def _record_success(
+        self,
+        model_config: dict[str, Any],
+        system_prompt: str,
+        user_prompt: str,
+        full_prompt: str,
+        response_text: str,
+        result: Any,
+        duration_ms: int,
+        prompt_name: Optional[str] = None,
+    ) -> None:
+        """記錄一次成功的 LLM 互動並寫入 API 調用日誌。"""
+        if prompt_name:
+            self.prompts.record(prompt_name, full_prompt, response_text, duration_ms)
+        self.last_llm_interaction = {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_ms": duration_ms,
+            "model_config": model_config,
+            "input": {
+                "system_prompt": system_prompt,
+                "user_prompt": user_prompt,
+                "prompt_template": prompt_name,
+                "full_prompt": full_prompt,
+                "prompt_length": len(full_prompt),
+            },
+            "output": {
+                "raw_response": response_text,
+                "parsed_result": result,
+                "response_length": len(response_text),
+            },
+            "status": "success",
+        }
+
+        # 記錄 API 調用日誌
+        with contextlib.suppress(Exception):
+            self.logger.log_api_call(
+                api_name="gemini",
+                method="generate_content",
+                params={"prompt_preview": full_prompt[:200]},
+                response={k: result.get(k) for k in list(result.keys())[:3]}
+                if isinstance(result, dict)
+                else None,
+            )
+
+    def _record_failure(
+        self,
+        model_config: dict[str, Any],
+        system_prompt: str,
+        user_prompt: str,
+        error: Exception,
+        duration_ms: int,
+        prompt_name: Optional[str] = None,
+    ) -> None:
+        """記錄一次失敗的 LLM 互動並寫入 API 調用日誌。"""
+        full_prompt = f"{system_prompt}\n\n{user_prompt}"
+        if prompt_name:
+            self.prompts.record(prompt_name, full_prompt, duration_ms=duration_ms, error=True)
+        self.last_llm_interaction = {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_ms": duration_ms,
+            "model_config": model_config,
+            "input": {
+                "system_prompt": system_prompt,
+                "user_prompt": user_prompt,
+                "prompt_template": prompt_name,
+                "full_prompt": full_prompt,
+                "prompt_length": len(full_prompt),
+            },
+            "output": {"error": str(error), "error_type": type(error).__name__},
+            "status": "error",
+        }
+        self.logger.log_api_call(
+            api_name="gemini",
+            method="generate_content",
+            params={"prompt_preview": (system_prompt + user_prompt)[:200]},
+            error=error,
+        )
+
     def _call_model(
-        self, model, system_prompt: str, user_prompt: str, use_cache: bool = True, timeout: int = 30
+        self,
+        model,
+        system_prompt: str,
+        user_prompt: str,
+        use_cache: bool = True,
+        timeout: int = 30,
+        prompt_name: Optional[str] = None,
     ) -> dict[str, Any]:
         """
         內部方法，用於調用指定的 Gemini 模型。
 
+        此方法會阻塞呼叫端直到模型回應；在 async 路由中請改用 `_call_model_async`。
+
         Args:
             model: 要調用的 Gemini 模型實例。
             system_prompt: 系統提示詞。
             user_prompt: 使用者提示詞。
-            use_cache: 是否使用快取（目前已禁用）。
+            use_cache: 保留參數；批改結果快取改由 `grade_translation` 在呼叫前處理。
             timeout: API 調用超時時間（秒），預設 30 秒。
+            prompt_name: 系統提示詞的範本名稱，用於累計提示詞與回應大小。
 
         Returns:
             一個包含模型回應的字典。
         """
         start_time = time.time()
+        model_config: dict[str, Any] = {}
 
         try:
-            import google.generativeai as genai
-            from google.api_core import retry
-            
             full_prompt = f"{system_prompt}\n\n{user_prompt}"
-            # 🔧 修復：安全地獲取模型配置信息
-            model_config = {
-                "model_name": getattr(model, "model_name", str(model)),
-                "temperature": getattr(getattr(model, "generation_config", None), "temperature", None),
-                "top_p": getattr(getattr(model, "generation_config", None), "top_p", None),
-                "top_k": getattr(getattr(model, "generation_config", None), "top_k", None),
-            }
-
-            # 🔧 修復：添加超時和重試機制
-            request_options = genai.types.RequestOptions(
-                timeout=timeout,  # 設置超時時間
-                retry=retry.Retry(
-                    initial=1.0,        # 初始重試延遲 1 秒
-                    maximum=3.0,        # 最大重試延遲 3 秒  
-                    multiplier=1.5,     # 重試延遲倍增係數
-                    deadline=timeout,   # 總體超時時間
-                    predicate=retry.if_transient_error  # 只重試暫時性錯誤
-                )
-            )
+            model_config = self._get_model_config(model)
+            request_options = self._build_request_options(timeout)
 
             response = model.generate_content(full_prompt, request_options=request_options)
             duration_ms = int((time.time() - start_time) * 1000)
             result = self._parse_response(response.text)
 
             # 記錄詳細的互動資訊以供調試
-            self.last_llm_interaction = {
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "duration_ms": duration_ms,
-                "model_config": model_config,
-                "input": {
-                    "system_prompt": system_prompt,
-                    "user_prompt": user_prompt,
-                    "full_prompt": full_prompt,
-                    "prompt_length": len(full_prompt),
-                },
-                "output": {
-                    "raw_response": response.text,
-                    "parsed_result": result,
-                    "response_length": len(response.text),
-                },
-                "status": "success",
-            }
+            self._record_success(
+                model_config,
+                system_prompt,
+                user_prompt,
+                full_prompt,
+                response.text,
+                result,
+                duration_ms,
+                prompt_name,
+            )
+            return result
+
+        except Exception as e:
+            # 記錄失敗的互動資訊
+            self._record_failure(
+                model_config,
+                system_prompt,
+                user_prompt,
+                e,
+                int((time.time() - start_time) * 1000),
+                prompt_name,
+            )
+            return self._get_fallback_response()
+
+    async def _call_model_async(
+        self,
+        model,
+        system_prompt: str,
+        user_prompt: str,
+        use_cache: bool = True,
+        timeout: int = 30,
+        prompt_name: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        `_call_model` 的異步版本。
+
+        使用 SDK 原生的 `generate_content_async`，等待模型回應期間不會阻塞事件循環，
+        讓單一緩慢的批改請求不會凍結同一 worker 上的其他請求。
+
+        Args:
+            model: 要調用的 Gemini 模型實例。
+            system_prompt: 系統提示詞。
+            user_prompt: 使用者提示詞。
+            use_cache: 保留參數；批改結果快取改由 `grade_translation` 在呼叫前處理。
+            timeout: API 調用超時時間（秒），預設 30 秒。
+            prompt_name: 系統提示詞的範本名稱，用於累計提示詞與回應大小。
+
+        Returns:
+            一個包含模型回應的字典。
+        """
+        start_time = time.time()
+        model_config: dict[str, Any] = {}
+
+        try:
+            full_prompt = f"{system_prompt}\n\n{user_prompt}"
+            model_config = self._get_model_config(model)
+            request_options = self._build_request_options(timeout, use_async=True)
 
-            # 記錄 API 調用日誌
-            with contextlib.suppress(Exception):
-                self.logger.log_api_call(
-                    api_name="gemini",
-                    method="generate_content",
-                    params={"prompt_preview": full_prompt[:200]},
-                    response={k: result.get(k) for k in list(result.keys())[:3]}
-                    if isinstance(result, dict)
-                    else None,
+            async with self._get_call_semaphore():
+                response = await model.generate_content_async(
+                    full_prompt, request_options=request_options
                 )
+            duration_ms = int((time.time() - start_time) * 1000)
+            result = self._parse_response(response.text)
 
+            self._record_success(
+                model_config,
+                system_prompt,
+                user_prompt,
+                full_prompt,
+                response.text,
+                result,
+                duration_ms,
+                prompt_name,
+            )
             return result
 
         except Exception as e:
-            # 記錄失敗的互動資訊
-            self.last_llm_interaction = {
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "duration_ms": int((time.time() - start_time) * 1000),
-                "model_config": locals().get("model_config", {}),
-                "input": {
-                    "system_prompt": system_prompt,
-                    "user_prompt": user_prompt,
-                    "full_prompt": f"{system_prompt}\n\n{user_prompt}",
-                    "prompt_length": len(f"{system_prompt}\n\n{user_prompt}"),
-                },
-                "output": {"error": str(e), "error_type": type(e).__name__},
-                "status": "error",
-            }
-            self.logger.log_api_call(
-                api_name="gemini",
-                method="generate_content",
-                params={"prompt_preview": (system_prompt + user_prompt)[:200]},
-                error=e,
+            self._record_failure(
+                model_config,
+                system_prompt,
+                user_prompt,
+                e,
+                int((time.time() - start_time) * 1000),
+                prompt_name,
             )
             return self._get_fallback_response()
 
+    def _get_call_semaphore(self) -> asyncio.Semaphore:
+        """
+        獲取限制並行 LLM 調用數量的信號量。
+
+        信號量綁定於建立它的事件循環，因此延遲到第一次異步調用時才建立。
+        """
+        if self._call_semaphore is None:
+            self._call_semaphore = asyncio.Semaphore(self.max_concurrent_calls)
+        return self._call_semaphore
+
     def _parse_response(self, text: str) -> dict[str, Any]:
         """
         解析模型的 JSON 回應。
@@ -230,16 +549,9 @@ class AIService:
             "service_error": True,  # 新增標記，方便後端識別服務錯誤
         }
 
-    def health_check(self) -> dict[str, Any]:
-        """
-        🔥 透明化改造：AI 服務健康檢查
-        
-        真實檢測 AI 服務的可用性，不說謊！
-        
-        Returns:
-            包含服務健康狀況的詳細報告
-        """
-        health_status = {
+    def _new_health_status(self) -> dict[str, Any]:
+        """建立健康檢查報告的初始結構。"""
+        return {
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "service_name": "AI Service (Gemini)",
             "status": "unknown",
@@ -247,67 +559,124 @@ class AIService:
             "last_error": None,
             "recommendations": []
         }
-        
+
+    def _build_health_request_options(self, use_async: bool = False):
+        """建立健康檢查專用的請求選項（較短的超時時間）。"""
+        import google.generativeai as genai
+        from google.api_core import retry, retry_async
+
+        retry_class = retry_async.AsyncRetry if use_async else retry.Retry
+        return genai.types.RequestOptions(
+            timeout=10,  # 健康檢查只給 10 秒超時
+            retry=retry_class(
+                initial=0.5,
+                maximum=2.0,
+                multiplier=1.5,
+                deadline=10,
+                predicate=retry.if_transient_error
+            )
+        )
+
+    def _apply_health_response(
+        self, health_status: dict[str, Any], response: Any, duration_ms: int
+    ) -> None:
+        """根據測試調用的回應更新健康檢查報告。"""
+        if response and response.text:
+            health_status.update({
+                "status": "healthy",
+                "details": {
+                    "response_time_ms": duration_ms,
+                    "model_accessible": True,
+                    "api_responsive": True,
+                    "test_response_length": len(response.text)
+                },
+                "recommendations": ["服務運行正常"] if duration_ms < 5000 else ["響應時間較慢，建議檢查網路連接"]
+            })
+        else:
+            health_status.update({
+                "status": "degraded",
+                "details": {"reason": "empty_response"},
+                "last_error": "API 回應為空",
+                "recommendations": ["檢查 API 配額", "檢查網路連接"]
+            })
+
+    def _apply_health_error(self, health_status: dict[str, Any], error: Exception) -> None:
+        """根據測試調用的異常更新健康檢查報告。"""
+        health_status.update({
+            "status": "failed",
+            "details": {"reason": "api_call_failed", "error_type": type(error).__name__},
+            "last_error": str(error),
+            "recommendations": ["檢查 API Key 是否有效", "檢查網路連接", "檢查 API 配額"]
+        })
+
+    def _apply_health_unavailable(self, health_status: dict[str, Any]) -> None:
+        """模型未初始化時的健康檢查報告。"""
+        health_status.update({
+            "status": "unavailable",
+            "details": {"reason": "generate_model_not_initialized"},
+            "last_error": "Gemini API 未正確初始化",
+            "recommendations": ["檢查 GEMINI_API_KEY 環境變數", "重啟服務"]
+        })
+
+    def health_check(self) -> dict[str, Any]:
+        """
+        🔥 透明化改造：AI 服務健康檢查
+
+        真實檢測 AI 服務的可用性，不說謊！
+
+        Returns:
+            包含服務健康狀況的詳細報告
+        """
+        health_status = self._new_health_status()
+
         try:
             # 檢查模型是否已初始化
             if not self.generate_model:
-                health_status.update({
-                    "status": "unavailable",
-                    "details": {"reason": "generate_model_not_initialized"},
-                    "last_error": "Gemini API 未正確初始化",
-                    "recommendations": ["檢查 GEMINI_API_KEY 環境變數", "重啟服務"]
-                })
+                self._apply_health_unavailable(health_status)
                 return health_status
-            
+
             # 進行實際的 API 測試調用
             test_prompt = "簡單測試：回答 'OK'"
             start_time = time.time()
-            
+
             # 🔧 修復：健康檢查使用較短的超時時間
-            import google.generativeai as genai
-            from google.api_core import retry
-            
-            request_options = genai.types.RequestOptions(
-                timeout=10,  # 健康檢查只給 10 秒超時
-                retry=retry.Retry(
-                    initial=0.5,
-                    maximum=2.0,
-                    multiplier=1.5,
-                    deadline=10,
-                    predicate=retry.if_transient_error
-                )
-            )
-            
+            request_options = self._build_health_request_options()
             response = self.generate_model.generate_content(test_prompt, request_options=request_options)
             duration_ms = int((time.time() - start_time) * 1000)
-            
-            if response and response.text:
-                health_status.update({
-                    "status": "healthy",
-                    "details": {
-                        "response_time_ms": duration_ms,
-                        "model_accessible": True,
-                        "api_responsive": True,
-                        "test_response_length": len(response.text)
-                    },
-                    "recommendations": ["服務運行正常"] if duration_ms < 5000 else ["響應時間較慢，建議檢查網路連接"]
-                })
-            else:
-                health_status.update({
-                    "status": "degraded",
-                    "details": {"reason": "empty_response"},
-                    "last_error": "API 回應為空",
-                    "recommendations": ["檢查 API 配額", "檢查網路連接"]
-                })
-                
+            self._apply_health_response(health_status, response, duration_ms)
+
         except Exception as e:
-            health_status.update({
-                "status": "failed",
-                "details": {"reason": "api_call_failed", "error_type": type(e).__name__},
-                "last_error": str(e),
-                "recommendations": ["檢查 API Key 是否有效", "檢查網路連接", "檢查 API 配額"]
-            })
-            
+            self._apply_health_error(health_status, e)
+
+        return health_status
+
+    async def health_check_async(self) -> dict[str, Any]:
+        """
+        `health_check` 的異步版本，測試調用期間不阻塞事件循環。
+
+        Returns:
+            包含服務健康狀況的詳細報告
+        """
+        health_status = self._new_health_status()
+
+        try:
+            if not self.generate_model:
+                self._apply_health_unavailable(health_status)
+                return health_status
+
+            test_prompt = "簡單測試：回答 'OK'"
+            start_time = time.time()
+
+            request_options = self._build_health_request_options(use_async=True)
+            response = await self.generate_model.generate_content_async(
+                test_prompt, request_options=request_options
+            )
+            duration_ms = int((time.time() - start_time) * 1000)
+            self._apply_health_response(health_status, response, duration_ms)
+
+        except Exception as e:
+            self._apply_health_error(health_status, e)
+
         return health_status
 
     async def generate_async(
@@ -352,12 +721,35 @@ class AIService:
 
         return await loop.run_in_executor(None, _generate)
 
+    # ========== 批改翻譯 ==========
+
+    def _build_grade_prompts(
+        self, chinese: str, english: str, hint: Optional[str] = None
+    ) -> tuple[str, str]:
+        """建立批改翻譯用的系統與使用者提示詞。"""
+        system_prompt = self.prompts.render(
+            "grade", chinese=chinese, hint_line="提示：" + hint if hint else ""
+        )
+        user_prompt = f"學生的翻譯：「{english}」"
+        return system_prompt, user_prompt
+
+    def _grading_cache_key(
+        self, chinese: str, english: str, hint: Optional[str] = None
+    ) -> Optional[str]:
+        """計算批改快取鍵；快取停用時返回 None。"""
+        if self.grading_cache is None:
+            return None
+        return build_grading_cache_key(
+            chinese, english, self.grade_model_name, self.prompts.get("grade").version_tag, hint
+        )
+
     def grade_translation(
         self, chinese: str, english: str, hint: Optional[str] = None
     ) -> dict[str, Any]:
         """
         批改學生的翻譯。
         使用詳細的系統提示詞指導模型進行多維度分析，並以結構化的 JSON 格式回傳。
+        相同內容的提交會直接返回批改快取中的結果，不再調用模型。
 
         Args:
             chinese: 中文原句。
@@ -367,81 +759,71 @@ class AIService:
         Returns:
             包含批改結果的字典。
         """
-        system_prompt = f"""
-        你是一位專業的英文教師，請批改學生的翻譯。
+        system_prompt, user_prompt = self._build_grade_prompts(chinese, english, hint)
 
-        中文原句：{chinese}
-        {"提示：" + hint if hint else ""}
+        if not self.grade_model:
+            return self._get_fallback_response()
 
-        請以 JSON 格式回覆，包含以下欄位：
-
-        1. is_generally_correct (boolean): 翻譯是否基本正確。
-
-        2. overall_suggestion (string): 建議的最佳翻譯（完整句子，使用英文）。
-
-        3. error_analysis (array): 錯誤分析列表，每個錯誤包含：
-           - category (string): 錯誤分類代碼，必須是以下其中一種：
-             * \"systematic\" - 系統性錯誤：涉及文法規則，學會規則後可避免同類錯誤（如時態、主謂一致、動詞變化）。
-             * \"isolated\" - 單一性錯誤：需要個別記憶的內容（如特定詞彙、搭配詞、介係詞、拼寫）。
-             * \"enhancement\" - 可以更好：文法正確但表達可以更自然、更道地。
-             * \"other\" - 其他錯誤：不屬於上述類別的錯誤（如漏譯、理解錯誤）。
-
-           - key_point_summary (string): 錯誤重點的具體描述，格式為「錯誤類型: 具體錯誤內容」。
-             例如：「單字拼寫錯誤: irrevertable」、「時態錯誤: have → has」、「介系詞搭配: in → on」。
-             這樣可以區分不同的具體錯誤，避免把不相關的錯誤歸在一起（使用繁體中文）。
-
-           - original_phrase (string): 學生寫錯的片語或句子部分。
+        cache_key = self._grading_cache_key(chinese, english, hint)
+        if cache_key:
+            cached = self.grading_cache.get(cache_key)
+            if cached is not None:
+                self.logger.debug(f"批改快取命中: {cache_key[:12]}")
+                return cached
+
+        result = self._call_model(
+            self.grade_model,
+            system_prompt,
+            user_prompt,
+            timeout=20,
+            prompt_name="grade",
+        )
 
-           - correction (string): 正確的寫法。
+        # 確保返回的結果是字典
+        if not isinstance(result, dict):
+            return self._get_fallback_response()
 
-           - explanation (string): 詳細解釋為什麼錯了，以及正確的用法（使用繁體中文）。
+        if cache_key and not result.get("service_error"):
+            self.grading_cache.set(cache_key, result)
 
-           - severity (string): 嚴重程度，"major"（重要錯誤）或 "minor"（次要問題）。
-
-        分類原則：
-        - 如果錯誤涉及可以通過學習規則解決的文法問題，使用 \"systematic\"。
-        - 如果錯誤需要記憶特定用法或單字，使用 \"isolated\"。
-        - 如果翻譯正確但可以更自然，使用 \"enhancement\"（通常是 minor）。
-        - 其他情況使用 \"other\"。
+        return result
 
-        重要：
-        - 請確保 category 欄位完全匹配上述四個代碼之一。
-        - 每個錯誤都要有清楚的 explanation。
-        - overall_suggestion 必須是完整、正確的英文句子。
-        """
-        user_prompt = f"學生的翻譯：「{english}」"
+    async def grade_translation_async(
+        self, chinese: str, english: str, hint: Optional[str] = None
+    ) -> dict[str, Any]:
+        """`grade_translation` 的異步版本，參數與回傳值相同。"""
+        system_prompt, user_prompt = self._build_grade_prompts(chinese, english, hint)
 
         if not self.grade_model:
             return self._get_fallback_response()
 
-        result = self._call_model(self.grade_model, system_prompt, user_prompt, timeout=20)
+        cache_key = self._grading_cache_key(chinese, english, hint)
+        if cache_key:
+            cached = await self.grading_cache.get_async(cache_key)
+            if cached is not None:
+                self.logger.debug(f"批改快取命中: {cache_key[:12]}")
+                return cached
+
+        result = await self._call_model_async(
+            self.grade_model, system_prompt, user_prompt, timeout=20, prompt_name="grade"
+        )
 
-        # 確保返回的結果是字典
         if not isinstance(result, dict):
             return self._get_fallback_response()
 
-        return result
+        if cache_key and not result.get("service_error"):
+            await self.grading_cache.set_async(
+                cache_key, result, self.grade_model_name, self.prompts.get("grade").version_tag
+            )
 
-    def generate_practice_sentence(
-        self,
-        level: int = 1,
-        length: str = "short",
-        examples: Optional[list[str]] = None,
-        shuffle: bool = False,
-    ) -> dict[str, str]:
-        """
-        生成新的練習句子。
-        使用 few-shot context（examples）和詳細的提示詞來引導模型生成高品質的題目。
+        return result
 
-        Args:
-            level: 難度等級 (1-5)。
-            length: 句子長度 ("short", "medium", "long")。
-            examples: 用於 few-shot learning 的例句。
-            shuffle: 是否強制生成新句子（目前預設強制）。
+    # ========== 新題生成 ==========
 
-        Returns:
-            包含中文句子、提示、難度等級等資訊的字典。
-        """
+    def _build_practice_prompts(
+        self, level: int, length: str, examples: Optional[list[str]]
+    ) -> tuple[str, str]:
+        """建立新題生成用的系統與使用者提示詞。"""
         difficulty_map = {
             1: "國中基礎程度，簡單詞彙和基本句型",
             2: "高中程度，包含常見片語和複雜句型",
@@ -457,38 +839,22 @@ class AIService:
 
         examples_text = "\n".join(f"- {s}" for s in (examples or [])[:5])
 
-        system_prompt = f"""
-        你是一位專業的英文出題教師，
-        請生成一個{difficulty_map.get(level, difficulty_map[1])}、且{length_hint}的中文句子，
-        用於英文翻譯練習。
-
-        要求：
-        1. 句子要自然、實用、符合日常對話或寫作情境。
-        2. 長度適中（10-30字）。
-        3. 包含明確的語法重點或常見表達。
-        4. 避免過於文言或罕見的表達方式。
-        5. 請參考以下代表例句風格，但不要重複：
-        {examples_text}
-
-        請以 JSON 格式回覆：
-        {{
-            "sentence": "中文句子",
-            "hint": "這個句子的翻譯重點或提示（例如：注意時態、注意介係詞等）",
-            "difficulty_level": {level},
-            "grammar_points": ["涉及的文法點1", "涉及的文法點2"]
-        }}
-        """
+        system_prompt = self.prompts.render(
+            "practice",
+            difficulty=difficulty_map.get(level, difficulty_map[1]),
+            length_hint=length_hint,
+            examples_text=examples_text,
+            level=level,
+        )
         import time as _t
 
         user_prompt = f"請生成一個適合練習的中文句子\n[variant_nonce={int(_t.time() * 1000)} ]"
+        return system_prompt, user_prompt
 
-        if not self.generate_model:
-            result = {}
-        else:
-            result = self._call_model(
-                self.generate_model, system_prompt, user_prompt, use_cache=False, timeout=25
-            )
-
+    def _format_practice_result(
+        self, result: Any, level: int, examples: Optional[list[str]]
+    ) -> dict[str, Any]:
+        """將模型回應整理為新題的標準回傳格式。"""
         if not isinstance(result, dict):
             result = {}
 
@@ -513,27 +879,78 @@ class AIService:
             "service_error": False,  # 明確標記這是成功狀態
         }
 
-    def generate_review_sentence(
+    def generate_practice_sentence(
         self,
-        knowledge_points: list,
-        level: int = 2,
-        length: str = "medium",
-    ) -> dict[str, Any]:
+        level: int = 1,
+        length: str = "short",
+        examples: Optional[list[str]] = None,
+        shuffle: bool = False,
+    ) -> dict[str, str]:
         """
-        根據待複習的知識點生成複習句子。
+        生成新的練習句子。
+        使用 few-shot context（examples）和詳細的提示詞來引導模型生成高品質的題目。
 
         Args:
-            knowledge_points: 待複習的知識點列表。
-            level: 難度等級。
-            length: 句子長度。
+            level: 難度等級 (1-5)。
+            length: 句子長度 ("short", "medium", "long")。
+            examples: 用於 few-shot learning 的例句。
+            shuffle: 是否強制生成新句子（目前預設強制）。
 
         Returns:
-            包含複習句子、提示、目標知識點ID等資訊的字典。
+            包含中文句子、提示、難度等級等資訊的字典。
         """
-        import random
+        system_prompt, user_prompt = self._build_practice_prompts(level, length, examples)
 
-        if not knowledge_points:
-            return self.generate_practice_sentence(level=level, length=length)
+        if not self.generate_model:
+            result = {}
+        else:
+            result = self._call_model(
+                self.generate_model,
+                system_prompt,
+                user_prompt,
+                use_cache=False,
+                timeout=25,
+                prompt_name="practice",
+            )
+
+        return self._format_practice_result(result, level, examples)
+
+    async def generate_practice_sentence_async(
+        self,
+        level: int = 1,
+        length: str = "short",
+        examples: Optional[list[str]] = None,
+        shuffle: bool = False,
+    ) -> dict[str, str]:
+        """`generate_practice_sentence` 的異步版本，參數與回傳值相同。"""
+        system_prompt, user_prompt = self._build_practice_prompts(level, length, examples)
+
+        if not self.generate_model:
+            result = {}
+        else:
+            result = await self._call_model_async(
+                self.generate_model,
+                system_prompt,
+                user_prompt,
+                use_cache=False,
+                timeout=25,
+                prompt_name="practice",
+            )
+
+        return self._format_practice_result(result, level, examples)
+
+    # ========== 複習題生成 ==========
+
+    def _prepare_review_prompts(
+        self, knowledge_points: list, level: int, length: str
+    ) -> tuple[list, list[dict[str, Any]], str, str]:
+        """
+        選取要考察的知識點並建立複習題的提示詞。
+
+        Returns:
+            (selected_points, points_info, system_prompt, user_prompt) 元組。
+        """
+        import random
 
         num_points = 2 if length == "long" else 1
         length_hint = "較長句子（35-60字）" if length == "long" else "中等長度（20-35字）"
@@ -554,39 +971,32 @@ class AIService:
 
         self.logger.info(f"為複習環節選取了 {len(selected_points)} 個知識點。")
 
-        system_prompt = f"""
-        你是一位專業的英文教師，正在幫助學生複習。
-        請使用以下知識點設計一個{length_hint}的中文句子讓學生翻譯：
-        {json.dumps(points_info, ensure_ascii=False, indent=2)}
-
-        要求：
-        - 必須考察到所有提供的知識點。
-        - 句子要自然、實用，不要生硬堆砌。
-        - 確保錯誤點能在翻譯中被自然考察到。
-
-        請以 JSON 格式回覆：
-        {{
-            "sentence": "要翻譯的中文句子",
-            "hint": "給學生的提示（簡潔指出要注意什麼）",
-            "target_point_ids": {[p["id"] for p in points_info]},
-            "target_points_description": "本題考察：{", ".join([p["key_point"] for p in points_info])}",
-            "difficulty_level": {level}
-        }}
-        """
+        system_prompt = self.prompts.render(
+            "review",
+            length_hint=length_hint,
+            points_json=json.dumps(points_info, ensure_ascii=False, indent=2),
+            target_ids=[p["id"] for p in points_info],
+            target_description=", ".join(p["key_point"] for p in points_info),
+            level=level,
+        )
         user_prompt = "請設計一個複習句子，要有創意且每次都不同。"
+        return selected_points, points_info, system_prompt, user_prompt
 
-        if not self.generate_model:
-            return {
-                "sentence": "今天天氣很好。",
-                "hint": "注意時態",
-                "target_point_ids": [],
-                "difficulty_level": level,
-            }
+    def _review_fallback_response(self, level: int) -> dict[str, Any]:
+        """模型未初始化時的複習題預設回應。"""
+        return {
+            "sentence": "今天天氣很好。",
+            "hint": "注意時態",
+            "target_point_ids": [],
+            "difficulty_level": level,
+        }
 
-        result = self._call_model(self.generate_model, system_prompt, user_prompt, use_cache=False, timeout=30)
-        
+    def _format_review_result(
+        self, result: Any, selected_points: list, points_info: list[dict[str, Any]], level: int
+    ) -> dict[str, Any]:
+        """將模型回應整理為複習題的標準回傳格式。"""
         # 🔥 透明化改造：Review 模式的 AI 服務層也要檢查錯誤！
-        if result.get("service_error"):
+        if isinstance(result, dict) and result.get("service_error"):
             return {
                 "service_error": True,
                 "error_message": "AI 服務不可用",
@@ -596,7 +1006,7 @@ class AIService:
                 "target_points": [],
                 "target_points_description": "",
             }
-        
+
         if not isinstance(result, dict):
             result = {}
 
@@ -621,31 +1031,86 @@ class AIService:
             "service_error": False,  # 明確標記成功狀態
         }
 
-    def generate_tagged_sentence(
+    def generate_review_sentence(
         self,
-        tags: list[dict[str, str]],
+        knowledge_points: list,
         level: int = 2,
         length: str = "medium",
-        combination_mode: str = "all",
     ) -> dict[str, Any]:
         """
-        基於標籤生成練習題目。
+        根據待複習的知識點生成複習句子。
 
         Args:
-            tags: 標籤列表，例如 [{"type": "grammar", "id": "GP001", "name": "強調句"}]。
+            knowledge_points: 待複習的知識點列表。
             level: 難度等級。
             length: 句子長度。
-            combination_mode: 標籤組合模式 ("all", "any", "focus")。
 
         Returns:
-            包含題目、提示、覆蓋點等資訊的字典。
+            包含複習句子、提示、目標知識點ID等資訊的字典。
         """
-        import json
+        if not knowledge_points:
+            return self.generate_practice_sentence(level=level, length=length)
 
-        from core.tag_system import tag_manager
+        selected_points, points_info, system_prompt, user_prompt = self._prepare_review_prompts(
+            knowledge_points, level, length
+        )
 
-        if not tags:
-            return self.generate_practice_sentence(level=level, length=length)
+        if not self.generate_model:
+            return self._review_fallback_response(level)
+
+        result = self._call_model(
+            self.generate_model,
+            system_prompt,
+            user_prompt,
+            use_cache=False,
+            timeout=30,
+            prompt_name="review",
+        )
+        return self._format_review_result(result, selected_points, points_info, level)
+
+    async def generate_review_sentence_async(
+        self,
+        knowledge_points: list,
+        level: int = 2,
+        length: str = "medium",
+    ) -> dict[str, Any]:
+        """`generate_review_sentence` 的異步版本，參數與回傳值相同。"""
+        if not knowledge_points:
+            return await self.generate_practice_sentence_async(level=level, length=length)
+
+        selected_points, points_info, system_prompt, user_prompt = self._prepare_review_prompts(
+            knowledge_points, level, length
+        )
+
+        if not self.generate_model:
+            return self._review_fallback_response(level)
+
+        result = await self._call_model_async(
+            self.generate_model,
+            system_prompt,
+            user_prompt,
+            use_cache=False,
+            timeout=30,
+            prompt_name="review",
+        )
+        return self._format_review_result(result, selected_points, points_info, level)
+
+    # ========== 標籤題生成 ==========
+
+    def _build_tagged_prompts(
+        self,
+        tags: list[dict[str, str]],
+        level: int,
+        length: str,
+        combination_mode: str,
+    ) -> Optional[tuple[str, str]]:
+        """
+        建立標籤題的提示詞。
+
+        Returns:
+            (system_prompt, user_prompt) 元組；若沒有任何有效標籤則返回 None。
+        """
+        from core.tag_system import tag_manager
 
         tag_details = []
         for tag_info in tags:
@@ -666,7 +1131,7 @@ class AIService:
                 )
 
         if not tag_details:
-            return self.generate_practice_sentence(level=level, length=length)
+            return None
 
         length_hint = {
             "short": "簡短句子（10-20字）",
@@ -679,37 +1144,29 @@ class AIService:
             "focus": "以第一個文法句型為主，其他可選擇性加入",
         }.get(combination_mode, "包含所有文法句型")
 
-        system_prompt = f"""
-        你是專業的英文教師，請設計一個翻譯練習題目。
-        要求使用的文法句型：
-        {json.dumps(tag_details, ensure_ascii=False, indent=2)}
-        組合要求：{mode_instruction}
-        題目要求：
-        1. 設計一個{length_hint}的中文句子。
-        2. 難度等級：{level}/5。
-        3. 必須自然地融入指定的文法句型。
-        4. 句子要實用、貼近生活或工作場景。
-        5. 避免生硬堆砌，確保語意流暢。
-        請以 JSON 格式回覆：
-        {{
-            "sentence": "要翻譯的中文句子",
-            "hint": "給學生的提示（簡潔指出要注意的文法重點）",
-            "covered_points": ["實際使用的文法點1", "實際使用的文法點2"],
-            "expected_patterns": ["預期使用的句型結構"],
-            "difficulty_level": {level}
-        }}
-        """
+        system_prompt = self.prompts.render(
+            "tagged",
+            tag_details_json=json.dumps(tag_details, ensure_ascii=False, indent=2),
+            mode_instruction=mode_instruction,
+            length_hint=length_hint,
+            level=level,
+        )
         user_prompt = "請設計一個包含指定文法句型的練習題目。"
+        return system_prompt, user_prompt
 
-        if not self.generate_model:
-            return {
-                "sentence": "今天天氣很好。",
-                "hint": "注意句型結構",
-                "covered_points": [],
-                "difficulty_level": level,
-            }
+    def _tagged_fallback_response(self, level: int) -> dict[str, Any]:
+        """模型未初始化時的標籤題預設回應。"""
+        return {
+            "sentence": "今天天氣很好。",
+            "hint": "注意句型結構",
+            "covered_points": [],
+            "difficulty_level": level,
+        }
 
-        result = self._call_model(self.generate_model, system_prompt, user_prompt, use_cache=False, timeout=35)
+    def _format_tagged_result(
+        self, result: Any, tags: list[dict[str, str]], level: int, combination_mode: str
+    ) -> dict[str, Any]:
+        """將模型回應整理為標籤題的標準回傳格式。"""
         if not isinstance(result, dict):
             result = {}
 
@@ -724,26 +1181,77 @@ class AIService:
             "is_tagged": True,
         }
 
-    def generate_tagged_preview(
+    def generate_tagged_sentence(
         self,
-        tags: list[str],
+        tags: list[dict[str, str]],
+        level: int = 2,
+        length: str = "medium",
         combination_mode: str = "all",
     ) -> dict[str, Any]:
         """
-        生成標籤組合的預覽題目，並評估其難度和變化性。
+        基於標籤生成練習題目。
 
         Args:
-            tags: 標籤ID列表。
-            combination_mode: 組合模式。
+            tags: 標籤列表，例如 [{"type": "grammar", "id": "GP001", "name": "強調句"}]。
+            level: 難度等級。
+            length: 句子長度。
+            combination_mode: 標籤組合模式 ("all", "any", "focus")。
 
         Returns:
-            包含預覽題目和評估分數的字典。
+            包含題目、提示、覆蓋點等資訊的字典。
         """
-        tag_list = [{"type": "grammar", "id": tag_id} for tag_id in tags]
-        result = self.generate_tagged_sentence(
-            tags=tag_list, level=2, length="medium", combination_mode=combination_mode
+        if not tags:
+            return self.generate_practice_sentence(level=level, length=length)
+
+        prompts = self._build_tagged_prompts(tags, level, length, combination_mode)
+        if prompts is None:
+            return self.generate_practice_sentence(level=level, length=length)
+        system_prompt, user_prompt = prompts
+
+        if not self.generate_model:
+            return self._tagged_fallback_response(level)
+
+        result = self._call_model(
+            self.generate_model,
+            system_prompt,
+            user_prompt,
+            use_cache=False,
+            timeout=35,
+            prompt_name="tagged",
+        )
+        return self._format_tagged_result(result, tags, level, combination_mode)
+
+    async def generate_tagged_sentence_async(
+        self,
+        tags: list[dict[str, str]],
+        level: int = 2,
+        length: str = "medium",
+        combination_mode: str = "all",
+    ) -> dict[str, Any]:
+        """`generate_tagged_sentence` 的異步版本，參數與回傳值相同。"""
+        if not tags:
+            return await self.generate_practice_sentence_async(level=level, length=length)
+
+        prompts = self._build_tagged_prompts(tags, level, length, combination_mode)
+        if prompts is None:
+            return await self.generate_practice_sentence_async(level=level, length=length)
+        system_prompt, user_prompt = prompts
+
+        if not self.generate_model:
+            return self._tagged_fallback_response(level)
+
+        result = await self._call_model_async(
+            self.generate_model,
+            system_prompt,
+            user_prompt,
+            use_cache=False,
+            timeout=35,
+            prompt_name="tagged",
         )
+        return self._format_tagged_result(result, tags, level, combination_mode)
 
+    def _score_tagged_preview(self, tags: list[str], result: Any) -> dict[str, Any]:
+        """為標籤預覽題目加上難度與變化性評分。"""
         from core.tag_system import tag_manager
 
         complexity_scores = [
@@ -759,6 +1267,39 @@ class AIService:
         result["variety_score"] = variety_score
         return result
 
+    def generate_tagged_preview(
+        self,
+        tags: list[str],
+        combination_mode: str = "all",
+    ) -> dict[str, Any]:
+        """
+        生成標籤組合的預覽題目，並評估其難度和變化性。
+
+        Args:
+            tags: 標籤ID列表。
+            combination_mode: 組合模式。
+
+        Returns:
+            包含預覽題目和評估分數的字典。
+        """
+        tag_list = [{"type": "grammar", "id": tag_id} for tag_id in tags]
+        result = self.generate_tagged_sentence(
+            tags=tag_list, level=2, length="medium", combination_mode=combination_mode
+        )
+        return self._score_tagged_preview(tags, result)
+
+    async def generate_tagged_preview_async(
+        self,
+        tags: list[str],
+        combination_mode: str = "all",
+    ) -> dict[str, Any]:
+        """`generate_tagged_preview` 的異步版本，參數與回傳值相同。"""
+        tag_list = [{"type": "grammar", "id": tag_id} for tag_id in tags]
+        result = await self.generate_tagged_sentence_async(
+            tags=tag_list, level=2, length="medium", combination_mode=combination_mode
+        )
+        return self._score_tagged_preview(tags, result)
+
     def get_last_interaction(self) -> dict[str, Any]:
         """
         獲取最近一次與 LLM 的互動記錄，用於調試。
@@ -768,19 +1309,15 @@ class AIService:
         """
         return self.last_llm_interaction or {"status": "no_data", "message": "尚無 LLM 互動記錄"}
 
-    def analyze_common_mistakes(self, practice_history: list) -> dict[str, Any]:
-        """
-        分析最近的練習歷史，找出常見的錯誤模式並提供學習建議。
+    # ========== 錯誤模式分析 ==========
 
-        Args:
-            practice_history: 練習歷史記錄列表。
+    def _build_mistake_analysis_prompts(self, practice_history: list) -> Optional[tuple[str, str]]:
+        """
+        從練習歷史中擷取最近的錯誤並建立分析提示詞。
 
         Returns:
-            包含錯誤模式分析和學習建議的字典。
+            (system_prompt, user_prompt) 元組；若沒有可分析的錯誤則返回 None。
         """
-        if not practice_history:
-            return {"patterns": [], "suggestions": []}
-
         recent_mistakes = [
             {
                 "nature": error.get("error_nature", ""),
@@ -792,43 +1329,74 @@ class AIService:
         ]
 
         if not recent_mistakes:
-            return {"patterns": [], "suggestions": []}
+            return None
 
-        system_prompt = """
-        你是一位英語教學專家，請分析學生的錯誤模式並提供學習建議。
-        請以 JSON 格式回覆：
-        {
-            "common_patterns": [{"pattern": "錯誤模式描述", "frequency": "出現頻率（高/中/低）", "examples": ["例子1", "例子2"]}],
-            "learning_suggestions": [{"priority": "優先級（高/中/低）", "focus_area": "需要加強的領域", "specific_advice": "具體的學習建議", "resources": ["建議的學習資源或方法"]}],
-            "overall_assessment": "整體評估和鼓勵的話"
-        }
-        """
+        system_prompt = self.prompts.render("mistake_analysis")
         user_prompt = f"以下是學生最近的錯誤記錄：\n{json.dumps(recent_mistakes, ensure_ascii=False, indent=2)}"
+        return system_prompt, user_prompt
+
+    def analyze_common_mistakes(self, practice_history: list) -> dict[str, Any]:
+        """
+        分析最近的練習歷史，找出常見的錯誤模式並提供學習建議。
+
+        Args:
+            practice_history: 練習歷史記錄列表。
+
+        Returns:
+            包含錯誤模式分析和學習建議的字典。
+        """
+        if not practice_history:
+            return {"patterns": [], "suggestions": []}
+
+        prompts = self._build_mistake_analysis_prompts(practice_history)
+        if prompts is None:
+            return {"patterns": [], "suggestions": []}
+        system_prompt, user_prompt = prompts
 
         if not self.grade_model:
             return {"patterns": [], "suggestions": []}
 
-        result = self._call_model(self.grade_model, system_prompt, user_prompt, timeout=25)
+        result = self._call_model(
+            self.grade_model,
+            system_prompt,
+            user_prompt,
+            timeout=25,
+            prompt_name="mistake_analysis",
+        )
         if not isinstance(result, dict):
             return {"patterns": [], "suggestions": []}
         return result
 
-    def generate_sentence_for_pattern(
-        self,
-        pattern_data: dict,
-        level: int = 2,
-        length: str = "medium",
-    ) -> dict[str, Any]:
-        """
-        根據特定的文法句型生成練習題目。
+    async def analyze_common_mistakes_async(self, practice_history: list) -> dict[str, Any]:
+        """`analyze_common_mistakes` 的異步版本，參數與回傳值相同。"""
+        if not practice_history:
+            return {"patterns": [], "suggestions": []}
 
-        Args:
-            pattern_data: 包含句型詳情的字典。
-            level: 難度等級。
-            length: 句子長度。
+        prompts = self._build_mistake_analysis_prompts(practice_history)
+        if prompts is None:
+            return {"patterns": [], "suggestions": []}
+        system_prompt, user_prompt = prompts
+
+        if not self.grade_model:
+            return {"patterns": [], "suggestions": []}
+
+        result = await self._call_model_async(
+            self.grade_model, system_prompt, user_prompt, timeout=25, prompt_name="mistake_analysis"
+        )
+        if not isinstance(result, dict):
+            return {"patterns": [], "suggestions": []}
+        return result
+
+    # ========== 句型題生成 ==========
+
+    def _build_pattern_prompts(
+        self, pattern_data: dict, level: int, length: str
+    ) -> tuple[str, str, str, str]:
+        """
+        建立句型題的提示詞。
 
         Returns:
-            包含題目、提示和預期結構的字典。
+            (pattern_name, formula, system_prompt, user_prompt) 元組。
         """
         pattern_name = pattern_data.get("pattern", "")
         formula = pattern_data.get("formula", "")
@@ -853,38 +1421,22 @@ class AIService:
             5: "進階程度",
         }.get(level, "中級程度")
 
-        system_prompt = f"""
-        你是一位專業的英文教師，請根據指定的文法句型生成一個中文練習句子。
-        目標句型：{pattern_name}
-        句型公式：{formula}
-        核心概念：{core_concept}
-        參考例句：{example_text or "無"}
-        要求：
-        1. 生成一個{length_hint}的中文句子。
-        2. 難度為{difficulty_hint}。
-        3. 句子必須能夠自然地使用「{pattern_name}」句型來翻譯。
-        4. 句子要實用、貼近生活或工作場景。
-        5. 不要直接複製例句，要有創意。
-        請以 JSON 格式回覆：
-        {{
-            "sentence": "要翻譯的中文句子",
-            "hint": "給學生的提示（簡短說明這個句型的使用要點）",
-            "expected_structure": "預期的英文句型結構（使用 ... 表示可填入的部分）"
-        }}
-        """
+        system_prompt = self.prompts.render(
+            "pattern",
+            pattern_name=pattern_name,
+            formula=formula,
+            core_concept=core_concept,
+            example_text=example_text or "無",
+            length_hint=length_hint,
+            difficulty_hint=difficulty_hint,
+        )
         user_prompt = "請生成一個適合練習此文法句型的中文句子。"
+        return pattern_name, formula, system_prompt, user_prompt
 
-        if not self.generate_model:
-            return {
-                "sentence": "今天天氣很好。",
-                "hint": f"注意使用 {pattern_name} 句型",
-                "expected_structure": "",
-            }
-
-        result = self._call_model(self.generate_model, system_prompt, user_prompt, use_cache=False, timeout=30)
-        
+    def _format_pattern_result(self, result: Any, pattern_name: str, formula: str) -> dict[str, Any]:
+        """將模型回應整理為句型題的標準回傳格式。"""
         # 🔥 透明化改造：Pattern 模式也要檢查服務錯誤！
-        if result.get("service_error"):
+        if isinstance(result, dict) and result.get("service_error"):
             return {
                 "service_error": True,
                 "error_message": "AI 服務不可用",
@@ -892,7 +1444,7 @@ class AIService:
                 "hint": None,
                 "expected_structure": None,
             }
-        
+
         if not isinstance(result, dict):
             result = {"sentence": "今天天氣很好。", "hint": f"注意使用 {pattern_name} 句型"}
 
@@ -902,3 +1454,69 @@ class AIService:
             "expected_structure": result.get("expected_structure", formula),
             "service_error": False,  # 明確標記成功狀態
         }
+
+    def generate_sentence_for_pattern(
+        self,
+        pattern_data: dict,
+        level: int = 2,
+        length: str = "medium",
+    ) -> dict[str, Any]:
+        """
+        根據特定的文法句型生成練習題目。
+
+        Args:
+            pattern_data: 包含句型詳情的字典。
+            level: 難度等級。
+            length: 句子長度。
+
+        Returns:
+            包含題目、提示和預期結構的字典。
+        """
+        pattern_name, formula, system_prompt, user_prompt = self._build_pattern_prompts(
+            pattern_data, level, length
+        )
+
+        if not self.generate_model:
+            return {
+                "sentence": "今天天氣很好。",
+                "hint": f"注意使用 {pattern_name} 句型",
+                "expected_structure": "",
+            }
+
+        result = self._call_model(
+            self.generate_model,
+            system_prompt,
+            user_prompt,
+            use_cache=False,
+            timeout=30,
+            prompt_name="pattern",
+        )
+        return self._format_pattern_result(result, pattern_name, formula)
+
+    async def generate_sentence_for_pattern_async(
+        self,
+        pattern_data: dict,
+        level: int = 2,
+        length: str = "medium",
+    ) -> dict[str, Any]:
+        """`generate_sentence_for_pattern` 的異步版本，參數與回傳值相同。"""
+        pattern_name, formula, system_prompt, user_prompt = self._build_pattern_prompts(
+            pattern_data, level, length
+        )
+
+        if not self.generate_model:
+            return {
+                "sentence": "今天天氣很好。",
+                "hint": f"注意使用 {pattern_name} 句型",
+                "expected_structure": "",
+            }
+
+        result = await self._call_model_async(
+            self.generate_model,
+            system_prompt,
+            user_prompt,
+            use_cache=False,
+            timeout=30,
+            prompt_name="pattern",
+        )
+        return self._format_pattern_result(result, pattern_name, formula)
@@ -0,0 +1,248 @@
+"""
+靜態資源快照模組
+
+將 `assets/*.json` 與 `core.assets.EXAMPLE_SENTENCE_BANK` 預先編譯為單一 marshal 快照檔，
+啟動或 worker fork 後以 mmap 開啟，只在第一次存取某個資源時反序列化該區段，
+不需要再解析 JSON。
+
+檔案格式（版本 1）：
+
+    MAGIC (8 bytes) | 標頭長度 (uint32, little-endian) | 標頭 (marshal dict) | 區段資料 ...
+
+標頭記錄格式版本、Python 版本（marshal 格式依版本而定）、每個區段的 (offset, length)
+以及來源檔案的 (mtime_ns, size)。來源檔案變更後，對應區段視為過期，
+呼叫端會自動改回讀取 JSON，直到重新建置快照。
+
+建置：`python scripts/build_asset_snapshot.py`
+"""
+
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from core.log_config import get_module_logger
+
+logger = get_module_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = PROJECT_ROOT / "assets"
+DEFAULT_SNAPSHOT_PATH = ASSETS_DIR / "assets.snapshot"
+
+SNAPSHOT_MAGIC = b"LNKASNP\x00"
+SNAPSHOT_FORMAT = 1
+_HEADER_LENGTH = struct.Struct("<I")
+
+# 例句庫區段名稱；JSON 資源的區段名稱為相對於專案根目錄的路徑
+EXAMPLE_BANK_SECTION = "example_bank"
+_EXAMPLE_BANK_SOURCE = PROJECT_ROOT / "core" / "assets.py"
+
+
+def _source_signature(path: Path) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _section_name(path: Path) -> str:
+    """JSON 資源的區段名稱（相對於專案根目錄的 POSIX 路徑）。"""
+    try:
+        return Path(path).resolve().relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return Path(path).resolve().as_posix()
+
+
+def build_snapshot(
+    output: Path = DEFAULT_SNAPSHOT_PATH, assets_dir: Path = ASSETS_DIR
+) -> dict[str, Any]:
+    """
+    建置資源快照。
+
+    Args:
+        output: 快照檔輸出路徑。
+        assets_dir: 要編譯的 JSON 資源目錄。
+
+    Returns:
+        每個區段的大小摘要。
+    """
+    from core.assets import EXAMPLE_SENTENCE_BANK
+
+    sections: list[tuple[str, Path, Any]] = [
+        (_section_name(path), path, json.loads(path.read_text(encoding="utf-8")))
+        for path in sorted(Path(assets_dir).glob("*.json"))
+    ]
+    sections.append((EXAMPLE_BANK_SECTION, _EXAMPLE_BANK_SOURCE, EXAMPLE_SENTENCE_BANK))
+
+    blobs = [(name, path, marshal.dumps(value)) for name, path, value in sections]
+
+    # 標頭中的 offset 取決於標頭本身的長度，反覆計算直到長度不再改變
+    def build_header(base: int) -> bytes:
+        offset = base
+        index = {}
+        sources = {}
+        for name, path, blob in blobs:
+            index[name] = (offset, len(blob))
+            sources[name] = _source_signature(path)
+            offset += len(blob)
+        return marshal.dumps(
+            {
+                "format": SNAPSHOT_FORMAT,
+                "python": tuple(sys.version_info[:2]),
+                "sections": index,
+                "sources": sources,
+            }
+        )
+
+    prefix = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+    header = build_header(prefix)
+    while True:
+        rebuilt = build_header(prefix + len(header))
+        if len(rebuilt) == len(header):
+            header = rebuilt
+            break
+        header = rebuilt
+
+    output = Path(output)
+    temp_path = output.with_suffix(output.suffix + ".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for _, _, blob in blobs:
+            f.write(blob)
+    # 原子替換，避免執行中的程序讀到寫到一半的檔案
+    os.replace(temp_path, output)
+
+    return {name: len(blob) for name, _, blob in blobs}
+
+
+class AssetSnapshot:
+    """以 mmap 開啟的資源快照，區段在第一次存取時才反序列化。"""
+
+    def __init__(self, path: Path = DEFAULT_SNAPSHOT_PATH):
+        """
+        開啟快照檔。
+
+        Raises:
+            OSError: 檔案不存在或無法讀取。
+            ValueError: 檔案格式或 Python 版本不符。
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        prefix = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+        if self._mmap[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"不是資源快照檔: {self.path}")
+        (header_length,) = _HEADER_LENGTH.unpack(self._mmap[len(SNAPSHOT_MAGIC) : prefix])
+        header = marshal.loads(self._mmap[prefix : prefix + header_length])
+        if header.get("format") != SNAPSHOT_FORMAT or tuple(header.get("python", ())) != tuple(
+            sys.version_info[:2]
+        ):
+            self.close()
+            raise ValueError(
+                f"資源快照版本不符 (format={header.get('format')}, python={header.get('python')})，"
+                "請重新執行 scripts/build_asset_snapshot.py"
+            )
+
+        self._sections: dict[str, tuple[int, int]] = header["sections"]
+        self._sources: dict[str, tuple[int, int]] = header["sources"]
+        self._loaded: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> list[str]:
+        """快照中的區段名稱。"""
+        return list(self._sections)
+
+    def is_fresh(self, name: str, source: Path) -> bool:
+        """檢查區段是否與來源檔案目前的內容一致。"""
+        expected = self._sources.get(name)
+        if expected is None:
+            return False
+        try:
+            return tuple(expected) == _source_signature(source)
+        except OSError:
+            return False
+
+    def get(self, name: str) -> Any:
+        """
+        取得區段內容（只反序列化一次，之後返回同一個物件，呼叫端不應修改）。
+
+        Raises:
+            KeyError: 區段不存在。
+        """
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+        offset, length = self._sections[name]
+        with self._lock:
+            if name not in self._loaded:
+                with memoryview(self._mmap) as view, view[offset : offset + length] as section:
+                    self._loaded[name] = marshal.loads(section)
+            return self._loaded[name]
+
+    def close(self) -> None:
+        if self._mmap is not None and not self._mmap.closed:
+            self._mmap.close()
+
+
+_snapshot: Optional[AssetSnapshot] = None
+_snapshot_loaded = False
+_snapshot_lock = threading.Lock()
+
+
+def get_asset_snapshot() -> Optional[AssetSnapshot]:
+    """
+    獲取全域資源快照（線程安全）。
+
+    - `ASSET_SNAPSHOT_ENABLED`：是否使用快照（預設 true）。
+    - `ASSET_SNAPSHOT_PATH`：快照檔路徑（預設 assets/assets.snapshot）。
+
+    Returns:
+        `AssetSnapshot` 實例；停用、檔案不存在或版本不符時返回 None。
+    """
+    global _snapshot, _snapshot_loaded
+    if not _snapshot_loaded:
+        with _snapshot_lock:
+            # 雙重檢查鎖定模式
+            if not _snapshot_loaded:
+                if os.getenv("ASSET_SNAPSHOT_ENABLED", "true").lower() == "true":
+                    path = Path(os.getenv("ASSET_SNAPSHOT_PATH", str(DEFAULT_SNAPSHOT_PATH)))
+                    try:
+                        _snapshot = AssetSnapshot(path)
+                    except FileNotFoundError:
+                        logger.debug(f"資源快照不存在，使用 JSON 資源: {path}")
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"無法使用資源快照，改用 JSON 資源: {e}")
+                _snapshot_loaded = True
+    return _snapshot
+
+
+def load_json_asset(path: Path) -> Any:
+    """
+    讀取 JSON 資源：快照中的對應區段仍與來源檔案一致時直接使用快照，否則解析 JSON。
+
+    從快照取得的物件由所有呼叫端共用，呼叫端不應修改。
+    """
+    path = Path(path)
+    snapshot = get_asset_snapshot()
+    if snapshot is not None:
+        name = _section_name(path)
+        if snapshot.is_fresh(name, path):
+            return snapshot.get(name)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_example_bank() -> Optional[dict[str, Any]]:
+    """從快照讀取例句庫；快照不可用或已過期時返回 None，由呼叫端改為匯入 `core.assets`。"""
+    snapshot = get_asset_snapshot()
+    if snapshot is not None and snapshot.is_fresh(EXAMPLE_BANK_SECTION, _EXAMPLE_BANK_SOURCE):
+        return snapshot.get(EXAMPLE_BANK_SECTION)
+    return None
@@ -0,0 +1,476 @@
+"""
+批量任務佇列模組
+
+以 Postgres `batch_jobs` 資料表保存知識點批量操作（刪除、更新、標籤、復原、匯出），
+取代原本只存在於單一程序記憶體中的任務字典。
+
+- **持久化**：任務與進度寫入資料庫，重啟後仍可查詢，多 worker 之間共享。
+- **工作者池**：每個程序以固定數量的工作者協程領取任務（`FOR UPDATE SKIP LOCKED`），
+  同時執行的任務數量因此有上限。
+- **進度檢查點**：每處理完一個分塊就寫回進度；工作者崩潰時，租約逾期的任務
+  會由其他工作者從最後的檢查點繼續。
+- **協作式取消**：取消請求寫入資料表，工作者在下一個檢查點停止。
+- **保留期限清理**：已結束的任務超過保留時間後由背景任務刪除。
+
+實際的批量操作由外部以 executor 注入，佇列本身只負責排程、進度與生命週期。
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from core.exceptions import DatabaseError
+from core.log_config import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# 任務狀態
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED, STATUS_CANCELLED)
+
+
+@dataclass
+class ChunkOutcome:
+    """
+    單一分塊的執行結果。
+
+    任務結果（`result`）只在提交時寫入，分塊不會累積資料到任務記錄中；
+    需要大量輸出的操作（例如匯出）應在結果中提供下載連結。
+
+    Attributes:
+        done_ids: 實際處理成功的 ID；分塊中其餘的 ID 會以 `error` 記為錯誤。
+        error: 未處理成功的 ID 所使用的錯誤訊息。
+    """
+
+    done_ids: list[int]
+    error: str
+
+
+BatchExecutor = Callable[[str, list[int], dict[str, Any]], Awaitable[ChunkOutcome]]
+
+
+class BatchJobQueue:
+    """
+    以 Postgres 為後端的批量任務佇列。
+
+    任務以分塊方式執行，每個分塊結束後寫回檢查點並檢查取消請求。
+    """
+
+    _JOB_COLUMNS = (
+        "id, operation, ids, data, status, total, processed, progress, errors, result, "
+        "cancel_requested, attempts, created_at, started_at, finished_at"
+    )
+
+    # 領取一個待處理或租約逾期的任務；$3 不為 NULL 時只領取指定任務
+    _CLAIM_QUERY = f"""
+        UPDATE batch_jobs SET
+            status = '{STATUS_PROCESSING}',
+            worker_id = $1,
+            attempts = attempts + 1,
+            started_at = COALESCE(started_at, CURRENT_TIMESTAMP),
+            heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id = (
+            SELECT id FROM batch_jobs
+            WHERE (
+                status = '{STATUS_PENDING}'
+                OR (status = '{STATUS_PROCESSING}'
+                    AND heartbeat_at < CURRENT_TIMESTAMP - make_interval(secs => $2))
+            )
+            AND ($3::text IS NULL OR id = $3)
+            ORDER BY created_at
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING {_JOB_COLUMNS}
+    """
+
+    # 寫回分塊進度；只有仍持有租約的工作者能寫入，返回是否已被要求取消
+    _CHECKPOINT_QUERY = f"""
+        UPDATE batch_jobs SET
+            processed = $3,
+            progress = CASE WHEN total > 0 THEN ($3 * 100) / total ELSE 100 END,
+            errors = errors || $4::jsonb,
+            heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id = $1 AND worker_id = $2 AND status = '{STATUS_PROCESSING}'
+        RETURNING cancel_requested
+    """
+
+    # 資料庫不可用時，工作者重試領取任務的最長間隔（秒）
+    MAX_RETRY_DELAY = 60.0
+
+    def __init__(
+        self,
+        workers: int = 2,
+        chunk_size: int = 1000,
+        poll_interval: float = 2.0,
+        lease_timeout: int = 300,
+        max_attempts: int = 3,
+        retention: int = 7 * 24 * 3600,
+        cleanup_interval: int = 3600,
+    ):
+        """
+        初始化批量任務佇列。
+
+        Args:
+            workers: 本程序的工作者數量，即同時執行的任務上限。
+            chunk_size: 每個分塊的 ID 數量，同時決定檢查點與取消檢查的粒度。
+            poll_interval: 工作者閒置時輪詢資料表的間隔（秒）。
+            lease_timeout: 處理中任務超過此秒數沒有寫回檢查點，視為工作者已崩潰並重新領取。
+            max_attempts: 任務最多被領取的次數，超過後標記為失敗。
+            retention: 已結束任務的保留時間（秒）。
+            cleanup_interval: 清理已結束任務的間隔（秒）。
+        """
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.retention = retention
+        self.cleanup_interval = cleanup_interval
+
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[BatchExecutor] = None
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "recovered": 0}
+
+    def set_executor(self, executor: BatchExecutor) -> None:
+        """
+        設定分塊執行函數。
+
+        Args:
+            executor: 接收 (operation, ids, data)、返回 `ChunkOutcome` 的異步函數。
+        """
+        self._executor = executor
+
+    async def _get_pool(self):
+        from core.database.connection import get_database_connection
+
+        return await get_database_connection().connect()
+
+    # ========== 提交與查詢 ==========
+
+    async def submit(
+        self,
+        operation: str,
+        ids: list[int],
+        data: Optional[dict[str, Any]] = None,
+        result: Optional[dict[str, Any]] = None,
+        wait: bool = False,
+        job_id: Optional[str] = None,
+    ) -> str:
+        """
+        建立批量任務。
+
+        Args:
+            operation: 操作類型，原樣傳給 executor。
+            ids: 要處理的知識點 ID。
+            data: 操作相關數據。
+            result: 任務結果（例如匯出的下載連結）。
+            wait: 為 True 時由目前的協程直接執行並等待完成，不經過工作者池。
+            job_id: 預先產生的任務 ID（例如已寫入結果中的下載連結），未指定時自動產生。
+
+        Returns:
+            任務 ID。
+        """
+        job_id = job_id or str(uuid.uuid4())
+        pool = await self._get_pool()
+        try:
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    f"""INSERT INTO batch_jobs
+                            (id, operation, ids, data, result, total, status, worker_id,
+                             attempts, started_at, heartbeat_at)
+                        VALUES ($1, $2, $3::int[], $4::jsonb, $5::jsonb, $6, $7, $8,
+                                $9, CASE WHEN $9 > 0 THEN CURRENT_TIMESTAMP END,
+                                CASE WHEN $9 > 0 THEN CURRENT_TIMESTAMP END)
+                        RETURNING {self._JOB_COLUMNS}""",
+                    job_id,
+                    operation,
+                    ids,
+                    json.dumps(data or {}, ensure_ascii=False),
+                    json.dumps(result, ensure_ascii=False) if result is not None else None,
+                    len(ids),
+                    STATUS_PROCESSING if wait else STATUS_PENDING,
+                    self.worker_id if wait else None,
+                    1 if wait else 0,
+                )
+        except Exception as e:
+            logger.error(f"建立批量任務失敗: {e}")
+            raise DatabaseError(
+                "建立批量任務失敗", operation="batch_submit", original_error=e
+            ) from e
+
+        self._stats["submitted"] += 1
+        if wait:
+            await self._execute(self._row_to_job(row))
+        elif self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        """查詢任務狀態，不存在時返回 None。"""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                f"SELECT {self._JOB_COLUMNS} FROM batch_jobs WHERE id = $1", job_id
+            )
+        return self._row_to_job(row) if row else None
+
+    async def cancel(self, job_id: str) -> Optional[str]:
+        """
+        取消任務。
+
+        待處理的任務直接標記為已取消；處理中的任務記錄取消請求，由工作者在下一個檢查點停止；
+        已結束的任務會被刪除。
+
+        Returns:
+            任務在取消前的狀態；任務不存在時返回 None。
+        """
+        pool = await self._get_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            status = await conn.fetchval(
+                "SELECT status FROM batch_jobs WHERE id = $1 FOR UPDATE", job_id
+            )
+            if status is None:
+                return None
+            if status == STATUS_PENDING:
+                await conn.execute(
+                    f"""UPDATE batch_jobs SET status = '{STATUS_CANCELLED}',
+                            cancel_requested = TRUE, finished_at = CURRENT_TIMESTAMP
+                        WHERE id = $1""",
+                    job_id,
+                )
+                self._stats["cancelled"] += 1
+            elif status == STATUS_PROCESSING:
+                await conn.execute(
+                    "UPDATE batch_jobs SET cancel_requested = TRUE WHERE id = $1", job_id
+                )
+            else:
+                await conn.execute("DELETE FROM batch_jobs WHERE id = $1", job_id)
+        return status
+
+    async def purge_finished(self) -> int:
+        """刪除超過保留時間的已結束任務，返回刪除數量。"""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            result = await conn.execute(
+                """DELETE FROM batch_jobs
+                   WHERE status = ANY($1::text[])
+                     AND finished_at < CURRENT_TIMESTAMP - make_interval(secs => $2)""",
+                list(FINISHED_STATUSES),
+                float(self.retention),
+            )
+        return int(result.split()[-1])
+
+    @staticmethod
+    def _row_to_job(row) -> dict[str, Any]:
+        """將資料庫記錄轉換為任務字典，JSONB 欄位解析為 Python 物件。"""
+        job = dict(row)
+        for column in ("data", "errors", "result"):
+            if isinstance(job.get(column), str):
+                job[column] = json.loads(job[column])
+        job["ids"] = list(job.get("ids") or [])
+        return job
+
+    # ========== 執行 ==========
+
+    async def _claim(self, job_id: Optional[str] = None) -> Optional[dict[str, Any]]:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                self._CLAIM_QUERY, self.worker_id, float(self.lease_timeout), job_id
+            )
+        return self._row_to_job(row) if row else None
+
+    async def _execute(self, job: dict[str, Any]) -> None:
+        """從任務的檢查點開始逐塊執行，直到完成、被取消或失去租約。"""
+        job_id = job["id"]
+        if job["processed"] > 0:
+            self._stats["recovered"] += 1
+            logger.info(f"批量任務 {job_id} 從第 {job['processed']} 項繼續執行")
+
+        if job["cancel_requested"]:
+            await self._finish(job_id, STATUS_CANCELLED)
+            return
+        if job["attempts"] > self.max_attempts:
+            await self._finish(job_id, STATUS_FAILED, f"任務已重試 {self.max_attempts} 次仍未完成")
+            return
+        if self._executor is None:
+            await self._finish(job_id, STATUS_FAILED, "批量任務佇列未設定執行函數")
+            return
+
+        ids, offset = job["ids"], job["processed"]
+        try:
+            while offset < len(ids):
+                chunk = ids[offset : offset + self.chunk_size]
+                try:
+                    outcome = await self._executor(job["operation"], chunk, job["data"] or {})
+                    done = set(outcome.done_ids)
+                    errors = [
+                        {"id": point_id, "error": outcome.error}
+                        for point_id in chunk
+                        if point_id not in done
+                    ]
+                except Exception as e:
+                    errors = [{"id": point_id, "error": str(e)} for point_id in chunk]
+
+                offset += len(chunk)
+                cancel_requested = await self._checkpoint(job_id, offset, errors)
+                if cancel_requested is None:
+                    logger.warning(f"批量任務 {job_id} 的租約已被其他工作者接手，停止執行")
+                    return
+                if cancel_requested and offset < len(ids):
+                    await self._finish(job_id, STATUS_CANCELLED)
+                    return
+        except Exception as e:
+            logger.error(f"批量任務 {job_id} 執行失敗: {e}")
+            await self._finish(job_id, STATUS_FAILED, f"批量操作失敗: {e}")
+            return
+
+        await self._finish(job_id, STATUS_COMPLETED)
+
+    async def _checkpoint(
+        self, job_id: str, processed: int, errors: list[dict[str, Any]]
+    ) -> Optional[bool]:
+        """寫回進度，返回是否已被要求取消；失去租約時返回 None。"""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            return await conn.fetchval(
+                self._CHECKPOINT_QUERY,
+                job_id,
+                self.worker_id,
+                processed,
+                json.dumps(errors, ensure_ascii=False),
+            )
+
+    async def _finish(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        """將任務標記為已結束。"""
+        self._stats[status] += 1
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    """UPDATE batch_jobs SET
+                           status = $3,
+                           errors = CASE WHEN $4::text IS NULL THEN errors
+                                         ELSE errors || jsonb_build_array(jsonb_build_object('error', $4::text))
+                                    END,
+                           finished_at = CURRENT_TIMESTAMP
+                       WHERE id = $1 AND worker_id = $2""",
+                    job_id,
+                    self.worker_id,
+                    status,
+                    error,
+                )
+        except Exception as e:
+            logger.error(f"更新批量任務 {job_id} 狀態失敗: {e}")
+
+    # ========== 工作者池 ==========
+
+    async def start(self) -> None:
+        """
+        啟動工作者與清理任務。
+
+        啟動時資料庫或 `batch_jobs` 資料表不可用也照常啟動：工作者領取失敗時以退避重試，
+        資料庫恢復後即開始處理期間提交的任務。
+        """
+        if self._tasks:
+            return
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                await conn.execute("SELECT 1 FROM batch_jobs LIMIT 1")
+        except Exception as e:
+            logger.error(
+                f"批量任務佇列目前無法存取 batch_jobs，工作者將持續重試"
+                f"（資料表不存在時請執行 scripts/add_batch_jobs_table.sql）: {e}"
+            )
+
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker_loop()) for _ in range(self.workers)]
+        self._tasks.append(loop.create_task(self._cleanup_loop()))
+        logger.info(f"批量任務佇列已啟動 ({self.workers} 個工作者, worker_id={self.worker_id})")
+
+    async def stop(self) -> None:
+        """停止工作者；執行中的任務會在租約逾期後由其他工作者從檢查點繼續。"""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    async def _worker_loop(self) -> None:
+        failures = 0
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                # 資料庫不可用時以指數退避重試，避免每個輪詢間隔都記錄錯誤
+                failures += 1
+                delay = min(self.poll_interval * 2**failures, self.MAX_RETRY_DELAY)
+                logger.error(f"領取批量任務失敗，{delay:.0f} 秒後重試: {e}")
+                await asyncio.sleep(delay)
+                continue
+
+            if failures:
+                logger.info("批量任務佇列已恢復存取資料庫")
+                failures = 0
+            if job is not None:
+                await self._execute(job)
+                continue
+
+            # 沒有任務時等待新任務通知或輪詢間隔
+            self._wakeup.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            try:
+                removed = await self.purge_finished()
+                if removed:
+                    logger.info(f"已清理 {removed} 個過期的批量任務")
+            except Exception as e:
+                logger.error(f"清理批量任務失敗: {e}")
+            await asyncio.sleep(self.cleanup_interval)
+
+    def get_stats(self) -> dict[str, Any]:
+        """獲取佇列統計數據。"""
+        return {
+            **self._stats,
+            "worker_id": self.worker_id,
+            "workers": self.workers,
+            "running": bool(self._tasks),
+            "chunk_size": self.chunk_size,
+        }
+
+
+def create_batch_queue_from_env() -> BatchJobQueue:
+    """
+    根據環境變數建立批量任務佇列。
+
+    - `BATCH_QUEUE_WORKERS`：每個程序的工作者數量（預設 2）。
+    - `BATCH_QUEUE_CHUNK_SIZE`：每個分塊的 ID 數量（預設 1000）。
+    - `BATCH_QUEUE_POLL_INTERVAL`：閒置輪詢間隔秒數（預設 2）。
+    - `BATCH_QUEUE_LEASE_TIMEOUT`：租約逾時秒數（預設 300）。
+    - `BATCH_QUEUE_RETENTION`：已結束任務的保留秒數（預設 7 天）。
+    """
+    return BatchJobQueue(
+        workers=int(os.getenv("BATCH_QUEUE_WORKERS", "2")),
+        chunk_size=int(os.getenv("BATCH_QUEUE_CHUNK_SIZE", "1000")),
+        poll_interval=float(os.getenv("BATCH_QUEUE_POLL_INTERVAL", "2")),
+        lease_timeout=int(os.getenv("BATCH_QUEUE_LEASE_TIMEOUT", "300")),
+        retention=int(os.getenv("BATCH_QUEUE_RETENTION", str(7 * 24 * 3600))),
+    )
@@ -0,0 +1,283 @@
+"""
+快取失效匯流排
+
+多 worker 部署時，每個程序都有自己的記憶體快取；一個 worker 寫入資料後，
+其他 worker 的 `statistics`、`review_candidates_*` 等快取仍會保留舊值。
+此模組提供可替換的失效廣播後端，讓所有 worker 在寫入後一致失效，
+同時保留各自的本地熱快取。
+
+- `CacheInvalidationBus`：程序內實作，將失效事件轉發給同一程序內同命名空間的其他快取實例。
+- `PostgresInvalidationBus`：透過 Postgres LISTEN/NOTIFY 將失效事件廣播給所有程序。
+
+後端由環境變數 `CACHE_INVALIDATION_BACKEND`（"local" 或 "postgres"）決定。
+"""
+
+import asyncio
+import json
+import os
+import threading
+import uuid
+import weakref
+from typing import TYPE_CHECKING, Any, Optional
+
+from core.log_config import get_module_logger
+
+if TYPE_CHECKING:
+    from core.cache_manager import UnifiedCacheManager
+
+logger = get_module_logger(__name__)
+
+# 失效事件的操作類型
+OP_ALL = "all"
+OP_PATTERN = "pattern"
+OP_TAGS = "tags"
+
+
+class CacheInvalidationBus:
+    """
+    程序內的快取失效匯流排。
+
+    快取實例以命名空間登記；任一實例發布失效事件時，同命名空間的其他實例會套用相同的失效。
+    子類別可覆寫 `_broadcast` 將事件送往其他程序。
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex  # 用於辨識並略過自己發出的遠端事件
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, weakref.WeakSet[UnifiedCacheManager]] = {}
+        self._stats = {"published": 0, "received": 0, "applied": 0}
+
+    def register(self, namespace: str, manager: "UnifiedCacheManager") -> None:
+        """登記快取實例，接收該命名空間的失效事件。"""
+        with self._lock:
+            self._subscribers.setdefault(namespace, weakref.WeakSet()).add(manager)
+
+    def publish(
+        self,
+        namespace: str,
+        op: str,
+        args: list[str],
+        source: Optional["UnifiedCacheManager"] = None,
+    ) -> None:
+        """
+        發布失效事件。
+
+        Args:
+            namespace: 快取命名空間。
+            op: 操作類型（`OP_ALL`、`OP_PATTERN`、`OP_TAGS`）。
+            args: 操作參數（模式字串或標籤列表）。
+            source: 發出事件的快取實例，不會再收到自己的事件。
+        """
+        self._stats["published"] += 1
+        self._apply_local(namespace, op, args, exclude=source)
+        self._broadcast({"origin": self.origin, "ns": namespace, "op": op, "args": args})
+
+    def _apply_local(
+        self,
+        namespace: str,
+        op: str,
+        args: list[str],
+        exclude: Optional["UnifiedCacheManager"] = None,
+    ) -> None:
+        """將事件套用到本程序內同命名空間的快取實例。"""
+        with self._lock:
+            managers = list(self._subscribers.get(namespace, ()))
+        for manager in managers:
+            if manager is exclude:
+                continue
+            manager.apply_remote_invalidation(op, args)
+            self._stats["applied"] += 1
+
+    def _broadcast(self, event: dict[str, Any]) -> None:
+        """將事件送往其他程序；程序內實作不需要。"""
+
+    def _handle_remote(self, payload: str) -> None:
+        """處理其他程序送來的事件。"""
+        try:
+            event = json.loads(payload)
+        except (TypeError, ValueError):
+            logger.warning(f"忽略無法解析的快取失效事件: {payload!r}")
+            return
+        if event.get("origin") == self.origin:
+            return
+        self._stats["received"] += 1
+        self._apply_local(event.get("ns", ""), event.get("op", ""), event.get("args") or [])
+
+    async def start(self) -> None:
+        """啟動匯流排；程序內實作不需要任何連線。"""
+
+    async def stop(self) -> None:
+        """停止匯流排。"""
+
+    def get_stats(self) -> dict[str, Any]:
+        """獲取匯流排統計數據。"""
+        with self._lock:
+            namespaces = {ns: len(managers) for ns, managers in self._subscribers.items()}
+        return {"backend": "local", **self._stats, "namespaces": namespaces}
+
+
+class PostgresInvalidationBus(CacheInvalidationBus):
+    """
+    以 Postgres LISTEN/NOTIFY 廣播失效事件的匯流排。
+
+    使用一條專用連線 LISTEN，發布時透過連線池執行 `pg_notify`；發送不依賴 LISTEN 連線，
+    即使 LISTEN 端尚未建立，本程序的寫入仍會通知其他 worker。
+    LISTEN 連線建立失敗或中斷時，以指數退避在背景重新連線；重新連線後清空本程序登記的快取，
+    因為中斷期間可能錯過其他 worker 的失效事件。
+    """
+
+    CHANNEL = "linker_cache_invalidation"
+
+    # 重新連線的退避時間（秒）
+    RECONNECT_INITIAL_DELAY = 1.0
+    RECONNECT_MAX_DELAY = 60.0
+
+    def __init__(self, channel: Optional[str] = None):
+        super().__init__()
+        self.channel = channel or self.CHANNEL
+        self._listen_conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: set[asyncio.Task] = set()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stats["notify_failures"] = 0
+        self._stats["reconnects"] = 0
+
+    async def start(self) -> None:
+        """建立 LISTEN 專用連線；失敗時在背景持續重試。"""
+        if self._listen_conn is not None or self._reconnect_task is not None:
+            return
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self._connect()
+            logger.info(f"快取失效匯流排已啟動 (LISTEN {self.channel})")
+        except Exception as e:
+            logger.error(f"啟動快取失效匯流排失敗，背景重試中（通知仍會發送）: {e}")
+            self._schedule_reconnect()
+
+    async def _connect(self) -> None:
+        """建立 LISTEN 連線並登記通知與中斷回呼。"""
+        import asyncpg
+
+        from core.database.connection import DatabaseSettings
+
+        conn = await asyncpg.connect(dsn=DatabaseSettings().DATABASE_URL)
+        try:
+            await conn.add_listener(self.channel, self._on_notify)
+            conn.add_termination_listener(self._on_terminated)
+        except Exception:
+            await conn.close()
+            raise
+        self._listen_conn = conn
+
+    def _on_terminated(self, connection) -> None:
+        """asyncpg 的連線中斷回呼。"""
+        if connection is not self._listen_conn:
+            return
+        self._listen_conn = None
+        if not self._stopping:
+            logger.warning(f"快取失效匯流排的 LISTEN 連線中斷，準備重新連線 ({self.channel})")
+            self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is not None or self._loop is None or self._loop.is_closed():
+            return
+        self._reconnect_task = self._loop.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """以指數退避重新建立 LISTEN 連線，直到成功或匯流排停止。"""
+        delay = self.RECONNECT_INITIAL_DELAY
+        try:
+            while not self._stopping:
+                await asyncio.sleep(delay)
+                try:
+                    await self._connect()
+                except Exception as e:
+                    delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+                    logger.warning(f"快取失效匯流排重新連線失敗，{delay:.0f} 秒後重試: {e}")
+                    continue
+                self._stats["reconnects"] += 1
+                logger.info(f"快取失效匯流排已重新連線 (LISTEN {self.channel})")
+                # 斷線期間可能錯過其他 worker 的失效事件，清空本程序的快取
+                with self._lock:
+                    namespaces = list(self._subscribers)
+                for namespace in namespaces:
+                    self._apply_local(namespace, OP_ALL, [])
+                return
+        finally:
+            self._reconnect_task = None
+
+    async def stop(self) -> None:
+        """停止重新連線、關閉 LISTEN 連線並等待尚未送出的通知。"""
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+            self._reconnect_task = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._listen_conn is not None:
+            conn, self._listen_conn = self._listen_conn, None
+            try:
+                conn.remove_termination_listener(self._on_terminated)
+                await conn.remove_listener(self.channel, self._on_notify)
+            finally:
+                await conn.close()
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        """asyncpg 的 LISTEN 回呼。"""
+        self._handle_remote(payload)
+
+    def _broadcast(self, event: dict[str, Any]) -> None:
+        """在事件循環中排程 NOTIFY（不論 LISTEN 連線是否可用）；沒有可用的事件循環時略過。"""
+        payload = json.dumps(event, ensure_ascii=False)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if self._loop is None or self._loop.is_closed():
+                return
+            # 由其他線程的同步程式碼觸發時，交給匯流排所在的事件循環執行
+            asyncio.run_coroutine_threadsafe(self._notify(payload), self._loop)
+            return
+        task = loop.create_task(self._notify(payload))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _notify(self, payload: str) -> None:
+        try:
+            from core.database.connection import get_database_connection
+
+            pool = await get_database_connection().connect()
+            async with pool.acquire() as conn:
+                await conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+        except Exception as e:
+            self._stats["notify_failures"] += 1
+            logger.error(f"發送快取失效通知失敗: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        stats = super().get_stats()
+        stats["backend"] = "postgres"
+        stats["listening"] = self._listen_conn is not None
+        return stats
+
+
+_bus: Optional[CacheInvalidationBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_invalidation_bus() -> CacheInvalidationBus:
+    """獲取全域快取失效匯流排（線程安全），後端由 `CACHE_INVALIDATION_BACKEND` 決定。"""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            # 雙重檢查鎖定模式
+            if _bus is None:
+                backend = os.getenv("CACHE_INVALIDATION_BACKEND", "local").lower()
+                if backend == "postgres":
+                    _bus = PostgresInvalidationBus()
+                else:
+                    if backend != "local":
+                        logger.warning(f"未知的快取失效後端 {backend}，改用 local")
+                    _bus = CacheInvalidationBus()
+    return _bus
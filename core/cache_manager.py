@@ -4,7 +4,10 @@
 提供一個線程安全的記憶體快取，支援同步和異步操作。
 主要功能包括：
 - TTL (Time-To-Live) 自動過期機制。
-- 基於鍵模式的快取失效。
+- 異步計算的請求合併（single-flight）與過期後短暫回傳舊值的 stale-while-revalidate。
+- 基於鍵模式的快取失效，以及透過依賴標籤反向索引精確失效相關條目。
+- 指定命名空間的實例會透過失效匯流排（見 `core.cache_bus`）同步其他 worker 的失效。
+- 條目數量與近似記憶體用量上限，超出時以 LRU 或 LFU 策略淘汰，並由背景線程定期清理過期條目。
 - 快取命中率、錯過率等統計。
 - 分層快取管理，可為不同類型的數據設定不同的 TTL。
 - 快取同步管理器，用於確保多個快取實例之間的一致性。
@@ -12,27 +15,174 @@
 
 import asyncio
 import logging
+import os
+import sys
 import threading
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterable
 from typing import Any, Callable, Optional
 
+from core.cache_bus import OP_ALL, OP_PATTERN, OP_TAGS, CacheInvalidationBus, get_invalidation_bus
+
 logger = logging.getLogger(__name__)
 
+# 快取容量與清理的預設值，可由環境變數覆蓋（0 表示不限制 / 停用）
+DEFAULT_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+# 記憶體上限預設停用：啟用後每次 set 都要遞迴估算值的大小
+DEFAULT_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", "0"))
+DEFAULT_EVICTION_POLICY = os.getenv("CACHE_EVICTION_POLICY", "lru").lower()
+DEFAULT_SWEEP_INTERVAL = int(os.getenv("CACHE_SWEEP_INTERVAL", "60"))
+
+# 估算大型容器時最多實際走訪的元素數量，其餘按平均值推算
+_SIZE_SAMPLE_LIMIT = 64
+
+
+def estimate_size(value: Any, _depth: int = 0, _seen: Optional[set] = None) -> int:
+    """
+    近似估算一個值佔用的記憶體位元組數。
+
+    會遞迴走訪容器與物件屬性；大型容器只抽樣前若干個元素並按比例推算，
+    結果僅用於快取容量控制，不保證精確。
+
+    Args:
+        value: 要估算的值。
+
+    Returns:
+        估算的位元組數。
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen or _depth > 6:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+
+    if isinstance(value, dict):
+        items = list(value.items())
+        sample = items[:_SIZE_SAMPLE_LIMIT]
+        inner = sum(
+            estimate_size(k, _depth + 1, _seen) + estimate_size(v, _depth + 1, _seen)
+            for k, v in sample
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value)
+        sample = items[:_SIZE_SAMPLE_LIMIT]
+        inner = sum(estimate_size(item, _depth + 1, _seen) for item in sample)
+    elif hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value), _depth + 1, _seen)
+    else:
+        return size
+
+    if sample and len(items) > len(sample):
+        inner = inner * len(items) // len(sample)
+    return size + inner
+
 
-@dataclass
 class CacheEntry:
-    """表示一個快取條目的資料結構。"""
+    """
+    表示一個快取條目的資料結構。
+
+    使用 `__slots__` 省去每個條目的 `__dict__`，並在建立時預先計算單調時鐘的到期時間，
+    讓每次讀取只需一次 `time.monotonic()` 與浮點數比較，不會產生 datetime/timedelta 物件。
+    """
 
-    value: Any
-    timestamp: datetime
-    ttl: int  # 存活時間（秒）
-    hit_count: int = 0
+    __slots__ = ("value", "ttl", "stale_ttl", "expires_at", "hit_count", "size", "tags")
+
+    def __init__(
+        self,
+        value: Any,
+        ttl: int,
+        stale_ttl: int = 0,
+        size: int = 0,
+        tags: tuple[str, ...] = (),
+        now: Optional[float] = None,
+    ):
+        """
+        Args:
+            value: 快取的值。
+            ttl: 存活時間（秒）。
+            stale_ttl: 過期後仍可作為舊值回傳的秒數。
+            size: 近似佔用位元組數。
+            tags: 依賴標籤，用於精確失效。
+            now: 建立時間（`time.monotonic()`），預設為目前時間。
+        """
+        if now is None:
+            now = time.monotonic()
+        self.value = value
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.expires_at = now + ttl
+        self.hit_count = 0
+        self.size = size
+        self.tags = tags
 
     @property
     def is_expired(self) -> bool:
         """檢查此快取條目是否已過期。"""
-        return datetime.now() > self.timestamp + timedelta(seconds=self.ttl)
+        return time.monotonic() >= self.expires_at
+
+    @property
+    def is_dead(self) -> bool:
+        """檢查此快取條目是否已超過可回傳舊值的期限，可被移除。"""
+        return time.monotonic() >= self.dead_at
+
+    @property
+    def dead_at(self) -> float:
+        """可回傳舊值的最後期限（單調時鐘）；只在條目已過期時才需要計算。"""
+        return self.expires_at + self.stale_ttl
+
+    @property
+    def created_at(self) -> float:
+        """建立時間（單調時鐘）。"""
+        return self.expires_at - self.ttl
+
+    def __repr__(self) -> str:
+        return f"CacheEntry(ttl={self.ttl}, hit_count={self.hit_count}, size={self.size})"
+
+
+class _CacheSweeper:
+    """
+    所有快取管理器共用的背景清理線程。
+
+    以弱引用登記快取實例，定期呼叫 `cleanup_expired`；
+    實例被回收後會自動從清單中移除，不會阻止垃圾回收。
+    """
+
+    def __init__(self):
+        self._managers: weakref.WeakSet[UnifiedCacheManager] = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._interval: Optional[int] = None
+
+    def register(self, manager: "UnifiedCacheManager", interval: int) -> None:
+        """登記快取實例，必要時啟動清理線程。"""
+        with self._lock:
+            self._managers.add(manager)
+            # 多個實例共用一條線程，以最短的間隔為準
+            self._interval = interval if self._interval is None else min(self._interval, interval)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="cache-sweeper", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        event = threading.Event()
+        while True:
+            event.wait(self._interval)
+            with self._lock:
+                managers = list(self._managers)
+            for manager in managers:
+                try:
+                    manager.cleanup_expired()
+                except Exception as e:
+                    logger.error(f"背景清理快取失敗: {e}")
+
+
+_sweeper = _CacheSweeper()
 
 
 class UnifiedCacheManager:
@@ -40,19 +190,127 @@ class UnifiedCacheManager:
     統一的記憶體快取管理器。
 
     提供線程安全的快取操作，支援 TTL、統計和模式匹配失效。
+    快取大小受 `max_entries` 與 `max_bytes` 限制，超出時依 `eviction_policy` 淘汰條目。
     """
 
-    def __init__(self, default_ttl: int = 300):
+    def __init__(
+        self,
+        default_ttl: int = 300,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction_policy: Optional[str] = None,
+        sweep_interval: Optional[int] = None,
+        namespace: Optional[str] = None,
+        bus: Optional[CacheInvalidationBus] = None,
+    ):
         """
         初始化快取管理器。
 
         Args:
             default_ttl: 預設的快取存活時間（秒），預設為 5 分鐘。
+            max_entries: 最大條目數量，0 表示不限制；預設讀取 `CACHE_MAX_ENTRIES`。
+            max_bytes: 近似記憶體上限（位元組），0 表示不限制且不估算條目大小；
+                預設讀取 `CACHE_MAX_BYTES`（未設定時為 0）。
+            eviction_policy: 淘汰策略，"lru"（最久未使用）或 "lfu"（最少使用）。
+            sweep_interval: 背景清理過期條目的間隔（秒），0 表示停用。
+            namespace: 失效廣播的命名空間；指定時，此實例的失效會同步到其他程序中
+                同命名空間的快取。未指定時僅在本實例內失效。
+            bus: 使用的失效匯流排，預設為 `get_invalidation_bus()`。
         """
-        self._cache: dict[str, CacheEntry] = {}
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self._cache_lock = threading.RLock()  # 使用可重入鎖，允許同一線程多次獲取
         self._default_ttl = default_ttl
-        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "refreshes": 0}
+        self._max_entries = DEFAULT_MAX_ENTRIES if max_entries is None else max_entries
+        self._max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        self._eviction_policy = (eviction_policy or DEFAULT_EVICTION_POLICY).lower()
+        if self._eviction_policy not in ("lru", "lfu"):
+            logger.warning(f"未知的快取淘汰策略 {self._eviction_policy}，改用 lru")
+            self._eviction_policy = "lru"
+        self._sweep_interval = DEFAULT_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
+        self._total_bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "capacity_evictions": 0,
+            "oversized_rejections": 0,
+            "refreshes": 0,
+            "coalesced": 0,
+            "stale_hits": 0,
+        }
+        # 進行中的異步計算：key -> Future，讓同一鍵的並發未命中共用一次計算
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._inflight_tags: dict[str, tuple[str, ...]] = {}
+        # 標籤反向索引：tag -> 帶有該標籤的快取鍵集合
+        self._tag_index: dict[str, set[str]] = {}
+        # LFU 頻率桶：命中次數 -> 該次數的鍵（依進入該桶的順序），淘汰時取最小次數桶的第一個鍵
+        self._freq_buckets: dict[int, OrderedDict[str, None]] = {}
+        self._min_freq = 0
+
+        if self._sweep_interval > 0:
+            _sweeper.register(self, self._sweep_interval)
+
+        self._namespace = namespace
+        self._bus = (bus or get_invalidation_bus()) if namespace else None
+        if self._bus is not None:
+            self._bus.register(namespace, self)
+
+    def _remove_entry(self, key: str) -> None:
+        """移除條目並更新記憶體用量（呼叫端需持有鎖）。"""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+            if self._eviction_policy == "lfu":
+                bucket = self._freq_buckets.get(entry.hit_count)
+                if bucket is not None:
+                    bucket.pop(key, None)
+                    if not bucket:
+                        del self._freq_buckets[entry.hit_count]
+            for tag in entry.tags:
+                keys = self._tag_index.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tag_index[tag]
+
+    def _touch_frequency(self, key: str, entry: CacheEntry) -> None:
+        """命中時將鍵移到下一個頻率桶（呼叫端需持有鎖，且已遞增 hit_count）。"""
+        previous = entry.hit_count - 1
+        bucket = self._freq_buckets.get(previous)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._freq_buckets[previous]
+                if self._min_freq == previous:
+                    self._min_freq = entry.hit_count
+        self._freq_buckets.setdefault(entry.hit_count, OrderedDict())[key] = None
+
+    def _next_victim(self) -> Optional[str]:
+        """選出下一個淘汰的鍵（呼叫端需持有鎖），成本與快取大小無關。"""
+        if not self._cache:
+            return None
+        if self._eviction_policy == "lfu":
+            # 命中次數最少者優先；同次數時淘汰最早進入該次數的條目
+            bucket = self._freq_buckets.get(self._min_freq)
+            if bucket is None:
+                # 最小桶已因移除條目而消失，重新取最小值（只發生在桶清空之後）
+                self._min_freq = min(self._freq_buckets)
+                bucket = self._freq_buckets[self._min_freq]
+            return next(iter(bucket))
+        # OrderedDict 的順序即為最近使用順序，開頭為最久未使用
+        return next(iter(self._cache))
+
+    def _enforce_limits(self) -> None:
+        """淘汰條目直到符合數量與記憶體上限（呼叫端需持有鎖）。"""
+        while (self._max_entries > 0 and len(self._cache) > self._max_entries) or (
+            self._max_bytes > 0 and self._total_bytes > self._max_bytes
+        ):
+            key = self._next_victim()
+            if key is None:
+                break
+            self._remove_entry(key)
+            self._stats["capacity_evictions"] += 1
+            logger.debug(f"快取容量淘汰 ({self._eviction_policy}): {key}")
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -74,18 +332,32 @@ class UnifiedCacheManager:
                 self._stats["misses"] += 1
                 return default
 
-            if entry.is_expired:
-                del self._cache[key]
-                self._stats["evictions"] += 1
+            now = time.monotonic()
+            if now >= entry.expires_at:
+                # 仍在 stale 期限內的條目保留給 get_or_compute_async 回傳舊值
+                if now >= entry.dead_at:
+                    self._remove_entry(key)
+                    self._stats["evictions"] += 1
+                    logger.debug(f"快取過期並清除: {key}")
                 self._stats["misses"] += 1
-                logger.debug(f"快取過期並清除: {key}")
                 return default
 
             entry.hit_count += 1
+            if self._eviction_policy == "lfu":
+                self._touch_frequency(key, entry)
+            else:
+                self._cache.move_to_end(key)
             self._stats["hits"] += 1
             return entry.value
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        stale_ttl: int = 0,
+        tags: Iterable[str] = (),
+    ) -> None:
         """
         在快取中設定一個值。
 
@@ -93,12 +365,47 @@ class UnifiedCacheManager:
             key: 快取鍵。
             value: 要快取的值。
             ttl: 存活時間（秒）。如果為 None，則使用預設 TTL。
+            stale_ttl: 過期後仍可由 `get_or_compute_async` 作為舊值回傳的秒數。
+            tags: 此條目依賴的資料標籤，之後可用 `invalidate_tags` 精確失效。
         """
+        tags = tuple(tags)
+        # 只有設定記憶體上限時才需要估算大小（遞迴估算的成本不低）
+        size = estimate_size(key) + estimate_size(value) if self._max_bytes > 0 else 0
         with self._cache_lock:
             ttl = ttl or self._default_ttl
-            self._cache[key] = CacheEntry(value=value, timestamp=datetime.now(), ttl=ttl)
+            self._remove_entry(key)
+            if self._max_bytes > 0 and size > self._max_bytes:
+                # 單一條目超過總上限時不快取，避免把其他條目全部擠出
+                self._stats["oversized_rejections"] += 1
+                logger.debug(f"快取條目過大不儲存: {key} ({size} bytes)")
+                return
+            self._cache[key] = CacheEntry(
+                value=value,
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                size=size,
+                tags=tags,
+            )
+            self._total_bytes += size
+            if self._eviction_policy == "lfu":
+                self._freq_buckets.setdefault(0, OrderedDict())[key] = None
+                self._min_freq = 0
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            self._enforce_limits()
             logger.debug(f"快取設定: {key}, TTL: {ttl}s")
 
+    def _get_stale(self, key: str) -> Optional[CacheEntry]:
+        """返回已過期但仍在 stale 期限內的條目，否則返回 None。"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            now = time.monotonic()
+            if now < entry.expires_at or now >= entry.dead_at:
+                return None
+            return entry
+
     def invalidate(self, pattern: Optional[str] = None) -> int:
         """
         使快取失效。
@@ -111,21 +418,101 @@ class UnifiedCacheManager:
         Returns:
             被清除的快取條目數量。
         """
+        count = self._invalidate_pattern_local(pattern)
+        if self._bus is not None:
+            if pattern is None:
+                self._bus.publish(self._namespace, OP_ALL, [], source=self)
+            else:
+                self._bus.publish(self._namespace, OP_PATTERN, [pattern], source=self)
+        return count
+
+    def _invalidate_pattern_local(self, pattern: Optional[str]) -> int:
+        """僅在本實例內依模式失效，不發布事件。"""
         with self._cache_lock:
             if pattern is None:
                 count = len(self._cache)
                 self._cache.clear()
+                self._tag_index.clear()
+                self._freq_buckets.clear()
+                self._min_freq = 0
+                self._total_bytes = 0
+                self._inflight.clear()
+                self._inflight_tags.clear()
                 logger.info(f"清除所有快取: {count} 個")
                 return count
 
             keys_to_remove = [k for k in self._cache if pattern in k]
             for key in keys_to_remove:
-                del self._cache[key]
+                self._remove_entry(key)
+            # 失效前已開始的計算結果可能已過時，讓後續請求重新計算而非加入舊的計算
+            for key in [k for k in self._inflight if pattern in k]:
+                self._drop_flight(key)
 
             if keys_to_remove:
                 logger.info(f"按模式清除快取 '{pattern}': {len(keys_to_remove)} 個")
             return len(keys_to_remove)
 
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        使帶有任一指定標籤的快取條目失效。
+
+        透過反向索引直接定位受影響的鍵，成本與受影響的條目數量成正比，
+        也不會像子字串比對那樣誤清 `point_10` 之類相似的鍵。
+
+        Args:
+            tags: 要失效的標籤。
+
+        Returns:
+            被清除的快取條目數量。
+        """
+        count = self._invalidate_tags_local(tags)
+        if self._bus is not None:
+            self._bus.publish(self._namespace, OP_TAGS, list(tags), source=self)
+        return count
+
+    def _invalidate_tags_local(self, tags: Iterable[str]) -> int:
+        """僅在本實例內依標籤失效，不發布事件。"""
+        tags = tuple(tags)
+        with self._cache_lock:
+            keys_to_remove: set[str] = set()
+            for tag in tags:
+                keys_to_remove.update(self._tag_index.get(tag, ()))
+            for key in keys_to_remove:
+                self._remove_entry(key)
+
+            tag_set = set(tags)
+            for key in [k for k, t in self._inflight_tags.items() if tag_set.intersection(t)]:
+                self._drop_flight(key)
+
+            if keys_to_remove:
+                logger.debug(f"按標籤清除快取 {list(tags)}: {len(keys_to_remove)} 個")
+            return len(keys_to_remove)
+
+    def apply_remote_invalidation(self, op: str, args: list[str]) -> int:
+        """
+        套用由失效匯流排送來的事件（來自其他實例或其他程序），不會再次發布。
+
+        Args:
+            op: 操作類型，見 `core.cache_bus`。
+            args: 操作參數。
+
+        Returns:
+            被清除的快取條目數量。
+        """
+        if op == OP_ALL:
+            return self._invalidate_pattern_local(None)
+        if op == OP_PATTERN:
+            return sum(self._invalidate_pattern_local(pattern) for pattern in args)
+        if op == OP_TAGS:
+            return self._invalidate_tags_local(args)
+        logger.warning(f"忽略未知的快取失效操作: {op}")
+        return 0
+
+    def _drop_flight(self, key: str) -> None:
+        """讓後續請求不再加入此鍵進行中的計算（呼叫端需持有鎖）。"""
+        self._inflight.pop(key, None)
+        self._inflight_tags.pop(key, None)
+
     def get_or_compute(
         self,
         key: str,
@@ -168,38 +555,114 @@ class UnifiedCacheManager:
         compute_func: Callable[[], Any],
         ttl: Optional[int] = None,
         force_refresh: bool = False,
+        stale_ttl: int = 0,
+        tags: Iterable[str] = (),
     ) -> Any:
         """
         獲取快取值，如果不存在則計算並存儲（異步版本）。
 
+        同一鍵的並發未命中只會執行一次計算，其餘請求等待同一個結果（single-flight）。
+        設定 `stale_ttl` 時，過期後的條目在該期限內仍會立即回傳，
+        同時在背景觸發唯一一次重新計算（stale-while-revalidate）。
+
         Args:
             key: 快取鍵。
             compute_func: 一個同步或異步的無參數函數，用於計算新值。
             ttl: 存活時間。
             force_refresh: 是否強制重新計算。
+            stale_ttl: 過期後仍可回傳舊值的秒數，0 表示停用。
+            tags: 計算結果依賴的資料標籤，見 `invalidate_tags`。
 
         Returns:
             快取或新計算的值。
         """
+        tags = tuple(tags)
         if not force_refresh:
             cached = self.get(key)
             if cached is not None:
                 return cached
 
+            stale = self._get_stale(key)
+            if stale is not None:
+                with self._cache_lock:
+                    self._stats["stale_hits"] += 1
+                self._start_flight(key, compute_func, ttl, stale_ttl, tags)
+                return stale.value
+
+            flight = self._current_flight(key)
+            if flight is not None:
+                with self._cache_lock:
+                    self._stats["coalesced"] += 1
+                return await asyncio.shield(flight)
+
+        return await asyncio.shield(self._start_flight(key, compute_func, ttl, stale_ttl, tags))
+
+    def _current_flight(self, key: str) -> Optional[asyncio.Future]:
+        """返回屬於目前事件循環、仍在進行中的計算。"""
+        with self._cache_lock:
+            flight = self._inflight.get(key)
+        if flight is None or flight.done() or flight.get_loop() is not asyncio.get_running_loop():
+            return None
+        return flight
+
+    def _start_flight(
+        self,
+        key: str,
+        compute_func: Callable[[], Any],
+        ttl: Optional[int],
+        stale_ttl: int,
+        tags: tuple[str, ...] = (),
+    ) -> asyncio.Future:
+        """啟動（或加入已存在的）背景計算，返回代表計算結果的 Future。"""
+        flight = self._current_flight(key)
+        if flight is not None:
+            return flight
+
+        task = asyncio.get_running_loop().create_task(
+            self._compute_and_store(key, compute_func, ttl, stale_ttl, tags)
+        )
+        with self._cache_lock:
+            self._inflight[key] = task
+            self._inflight_tags[key] = tags
+        task.add_done_callback(lambda t: self._finish_flight(key, t))
+        return task
+
+    def _finish_flight(self, key: str, task: asyncio.Future) -> None:
+        """計算完成後移除進行中的記錄，並取出例外避免未處理警告。"""
+        with self._cache_lock:
+            if self._inflight.get(key) is task:
+                self._drop_flight(key)
+        if not task.cancelled():
+            task.exception()
+
+    async def _compute_and_store(
+        self,
+        key: str,
+        compute_func: Callable[[], Any],
+        ttl: Optional[int],
+        stale_ttl: int,
+        tags: tuple[str, ...],
+    ) -> Any:
+        """執行計算並寫入快取；計算期間此鍵若被失效（計算已不是目前的 flight）則不寫入。"""
         try:
             if asyncio.iscoroutinefunction(compute_func):
                 value = await compute_func()
             else:
                 value = compute_func()
-
-            self.set(key, value, ttl)
-            self._stats["refreshes"] += 1
-            logger.debug(f"異步快取計算並儲存: {key}")
-            return value
         except Exception as e:
             logger.error(f"異步快取計算失敗 {key}: {e}")
             raise
 
+        with self._cache_lock:
+            # 失效路徑會以 _drop_flight 移除受影響的鍵，其他鍵的失效不影響本次寫入
+            if self._inflight.get(key) is asyncio.current_task():
+                self.set(key, value, ttl, stale_ttl, tags)
+                self._stats["refreshes"] += 1
+                logger.debug(f"異步快取計算並儲存: {key}")
+            else:
+                logger.debug(f"計算期間快取已失效，略過寫入: {key}")
+        return value
+
     def get_stats(self) -> dict[str, Any]:
         """
         獲取快取統計數據。
@@ -214,25 +677,36 @@ class UnifiedCacheManager:
             return {
                 **self._stats,
                 "cache_size": len(self._cache),
+                "max_entries": self._max_entries,
+                "total_bytes": self._total_bytes,
+                "max_bytes": self._max_bytes,
+                "eviction_policy": self._eviction_policy,
+                "namespace": self._namespace,
+                "sweep_interval": self._sweep_interval,
+                "inflight": len(self._inflight),
+                "tags": len(self._tag_index),
                 "hit_rate": round(hit_rate, 4),
                 "total_requests": total_requests,
             }
 
     def cleanup_expired(self) -> int:
         """
-        手動清理所有過期的快取條目。
+        清理所有過期（且已超過 stale 期限）的快取條目。
+
+        背景清理線程會定期呼叫此方法，也可手動呼叫。
 
         Returns:
             被清理的快取條目數量。
         """
         with self._cache_lock:
-            expired_keys = [key for key, entry in self._cache.items() if entry.is_expired]
+            now = time.monotonic()
+            expired_keys = [key for key, entry in self._cache.items() if now >= entry.dead_at]
             for key in expired_keys:
-                del self._cache[key]
+                self._remove_entry(key)
 
             if expired_keys:
                 self._stats["evictions"] += len(expired_keys)
-                logger.info(f"手動清理過期快取: {len(expired_keys)} 個")
+                logger.debug(f"清理過期快取: {len(expired_keys)} 個")
 
             return len(expired_keys)
 
@@ -247,6 +721,29 @@ class CacheCategories:
     USER_PREFERENCES = "preferences"
 
 
+class CacheTags:
+    """定義快取依賴標籤，寫入時依標籤精確失效相關快取。"""
+
+    STATISTICS = "stats"
+    POINT_LISTS = "kp:lists"  # 任何包含多個知識點的查詢結果（列表、搜尋、分類、複習候選）
+    REVIEW = "review"
+
+    @staticmethod
+    def point(point_id: int) -> str:
+        """單一知識點的標籤。"""
+        return f"kp:{point_id}"
+
+    @staticmethod
+    def user_settings(user_id: str) -> str:
+        """使用者設定的標籤。"""
+        return f"settings:{user_id}"
+
+    @staticmethod
+    def daily_stats(user_id: str) -> str:
+        """使用者每日統計的標籤。"""
+        return f"daily:{user_id}"
+
+
 class LayeredCacheManager(UnifiedCacheManager):
     """
     分層快取管理器。
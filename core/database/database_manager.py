@@ -14,18 +14,20 @@
 """
 
 import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
-from core.cache_manager import UnifiedCacheManager
+from core.cache_manager import CacheTags, UnifiedCacheManager
 from core.database.connection import get_database_connection
 from core.database.exceptions import DatabaseError
-from core.database.repositories.know_repo import KnowledgePointRepository
+from core.database.repositories.know_repo import KnowledgePointRepository, PageCursor
 from core.error_handler import ErrorHandler
 from core.error_types import ErrorCategory
+from core.knowledge_import import ImportReport, KnowledgeImporter, SourceRecord
 from core.log_config import get_module_logger
-from core.models import KnowledgePoint, OriginalError, ReviewExample
+from core.models import KnowledgePoint, KnowledgePointSummary, OriginalError, ReviewExample
 
 
 class DatabaseKnowledgeManager:
@@ -39,7 +41,8 @@ class DatabaseKnowledgeManager:
         """初始化管理器，設定日誌、錯誤處理、快取和資料庫連線。"""
         self.logger = get_module_logger(__name__)
         self._error_handler = ErrorHandler(mode="database")
-        self._cache_manager = UnifiedCacheManager(default_ttl=300)
+        # 多 worker 部署時，寫入後透過失效匯流排同步其他程序的快取
+        self._cache_manager = UnifiedCacheManager(default_ttl=300, namespace="knowledge_db")
         self._db_connection = get_database_connection()
         self._repository: Optional[KnowledgePointRepository] = None
         self._initialized = False
@@ -62,6 +65,22 @@ class DatabaseKnowledgeManager:
                         self.logger.error(f"資料庫初始化失敗: {e}")
                         raise DatabaseError(f"資料庫初始化失敗: {e}") from e
 
+    def _invalidate_point_caches(self, point_id: Optional[int] = None) -> None:
+        """知識點變更後，依標籤失效單點、所有列表型查詢與統計快取。"""
+        tags = [CacheTags.POINT_LISTS, CacheTags.STATISTICS]
+        if point_id is not None:
+            tags.append(CacheTags.point(point_id))
+        self._cache_manager.invalidate_tags(*tags)
+
+    def _invalidate_many_point_caches(self, point_ids: list[int]) -> None:
+        """批次變更後，一次失效所有受影響的單點、列表與統計快取。"""
+        if point_ids:
+            self._cache_manager.invalidate_tags(
+                CacheTags.POINT_LISTS,
+                CacheTags.STATISTICS,
+                *(CacheTags.point(point_id) for point_id in point_ids),
+            )
+
     @asynccontextmanager
     async def _db_operation(self, operation_name: str):
         """
@@ -103,40 +122,98 @@ class DatabaseKnowledgeManager:
 
         async def _add():
             async with self._db_operation("添加知識點") as repo:
-                original_error = OriginalError(
-                    chinese_sentence=chinese_sentence,
-                    user_answer=user_answer,
-                    correct_answer=correct_answer,
-                    timestamp=datetime.now().isoformat(),
-                )
-                knowledge_point = KnowledgePoint(
-                    id=0,  # ID 將由資料庫自動分配
-                    key_point=error_info.get("error_pattern", ""),
-                    category=ErrorCategory.from_string(error_info.get("category", "other")),
-                    subtype=error_info.get("subtype", ""),
-                    explanation=analysis.get("explanation", ""),
-                    original_phrase=error_info.get("error_phrase", ""),
-                    correction=error_info.get("correction", ""),
-                    original_error=original_error,
-                    review_examples=[],
-                    mastery_level=0.0,
-                    mistake_count=1,
-                    correct_count=0,
-                    created_at=datetime.now().isoformat(),
-                    last_seen=datetime.now().isoformat(),
-                    next_review="",
+                knowledge_point = self._build_knowledge_point(
+                    error_info, analysis, chinese_sentence, user_answer, correct_answer
                 )
-                knowledge_point.next_review = knowledge_point._calculate_next_review()
                 result = await repo.create(knowledge_point)
                 if result:
-                    self._cache_manager.invalidate("all_points")
-                    self._cache_manager.invalidate("statistics")
+                    self._invalidate_point_caches()
                 return result
 
         # 使用快取避免短時間內重複添加相同的知識點
         cache_key = f"add_{error_info.get('error_pattern', '')}_{chinese_sentence}"
         return await self._cache_manager.get_or_compute_async(cache_key, _add, ttl=60)
 
+    async def add_knowledge_points_bulk(self, items: list[dict[str, Any]]) -> list[KnowledgePoint]:
+        """
+        批次添加多個知識點，整批只需固定次數的資料庫往返。
+
+        Args:
+            items: 每項包含 `error_info`、`analysis`、`chinese_sentence`、
+                `user_answer`、`correct_answer`，意義同 `add_knowledge_point`。
+
+        Returns:
+            成功創建的 KnowledgePoint 列表（順序與輸入相同）。
+        """
+        if not items:
+            return []
+
+        # 與 add_knowledge_point 共用去重快取，避免短時間內重複提交產生重複知識點
+        results: list[Optional[KnowledgePoint]] = []
+        pending: dict[str, KnowledgePoint] = {}
+        for item in items:
+            error_info = item.get("error_info", {})
+            chinese_sentence = item.get("chinese_sentence", "")
+            cache_key = f"add_{error_info.get('error_pattern', '')}_{chinese_sentence}"
+            cached = self._cache_manager.get(cache_key)
+            if cached is None:
+                cached = pending.get(cache_key)
+            if cached is not None:
+                results.append(cached)
+                continue
+            point = self._build_knowledge_point(
+                error_info,
+                item.get("analysis", {}),
+                chinese_sentence,
+                item.get("user_answer", ""),
+                item.get("correct_answer", ""),
+            )
+            pending[cache_key] = point
+            results.append(point)
+
+        if pending:
+            async with self._db_operation("批次添加知識點") as repo:
+                await repo.create_many(list(pending.values()))
+            for cache_key, point in pending.items():
+                self._cache_manager.set(cache_key, point, ttl=60)
+            self._invalidate_point_caches()
+        return results
+
+    @staticmethod
+    def _build_knowledge_point(
+        error_info: dict,
+        analysis: dict,
+        chinese_sentence: str,
+        user_answer: str,
+        correct_answer: str,
+    ) -> KnowledgePoint:
+        """由錯誤分析結果建立尚未寫入資料庫的 KnowledgePoint。"""
+        now = datetime.now().isoformat()
+        knowledge_point = KnowledgePoint(
+            id=0,  # ID 將由資料庫自動分配
+            key_point=error_info.get("error_pattern", ""),
+            category=ErrorCategory.from_string(error_info.get("category", "other")),
+            subtype=error_info.get("subtype", ""),
+            explanation=analysis.get("explanation", ""),
+            original_phrase=error_info.get("error_phrase", ""),
+            correction=error_info.get("correction", ""),
+            original_error=OriginalError(
+                chinese_sentence=chinese_sentence,
+                user_answer=user_answer,
+                correct_answer=correct_answer,
+                timestamp=now,
+            ),
+            review_examples=[],
+            mastery_level=0.0,
+            mistake_count=1,
+            correct_count=0,
+            created_at=now,
+            last_seen=now,
+            next_review="",
+        )
+        knowledge_point.next_review = knowledge_point._calculate_next_review()
+        return knowledge_point
+
     async def get_knowledge_point(self, point_id: int) -> Optional[KnowledgePoint]:
         """根據 ID 獲取單個知識點。"""
         cache_key = f"point_{point_id}"
@@ -145,7 +222,9 @@ class DatabaseKnowledgeManager:
             async with self._db_operation("獲取知識點") as repo:
                 return await repo.find_by_id(point_id)
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _get, ttl=300)
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get, ttl=300, tags=[CacheTags.point(point_id)]
+        )
 
     async def get_all_knowledge_points(self, include_deleted: bool = False) -> list[KnowledgePoint]:
         """獲取所有知識點，可選擇是否包含已刪除的項目。"""
@@ -156,16 +235,94 @@ class DatabaseKnowledgeManager:
                 filters = {"include_deleted": True} if include_deleted else {"is_deleted": False}
                 return await repo.find_all(**filters)
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _get_all, ttl=60)
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get_all, ttl=60, stale_ttl=30, tags=[CacheTags.POINT_LISTS]
+        )
+
+    async def get_knowledge_point_summaries(
+        self, include_deleted: bool = False
+    ) -> list[KnowledgePointSummary]:
+        """獲取所有知識點的輕量摘要，只讀取列表與統計需要的欄位。"""
+        cache_key = f"all_summaries_{include_deleted}"
+
+        async def _get_summaries():
+            async with self._db_operation("獲取知識點摘要") as repo:
+                filters = {"include_deleted": True} if include_deleted else {"is_deleted": False}
+                return await repo.find_all(view=repo.VIEW_SUMMARY, **filters)
+
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get_summaries, ttl=60, stale_ttl=30, tags=[CacheTags.POINT_LISTS]
+        )
+
+    async def get_knowledge_points_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[PageCursor] = None,
+        view: str = KnowledgePointRepository.VIEW_FULL,
+        include_deleted: bool = False,
+        category: Optional[str] = None,
+        mastery: Optional[str] = None,
+    ) -> tuple[Union[list[KnowledgePoint], list[KnowledgePointSummary]], Optional[PageCursor]]:
+        """以 keyset 分頁獲取知識點，返回 (結果, 下一頁游標)。"""
+        cache_key = f"points_page_{view}_{include_deleted}_{category}_{mastery}_{limit}_{cursor}"
+
+        async def _get_page():
+            async with self._db_operation("分頁獲取知識點") as repo:
+                filters = {"include_deleted": True} if include_deleted else {"is_deleted": False}
+                if category:
+                    filters["category"] = category
+                if mastery:
+                    filters["mastery"] = mastery
+                return await repo.find_page(limit, cursor, view=view, **filters)
+
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get_page, ttl=60, tags=[CacheTags.POINT_LISTS]
+        )
+
+    async def iter_knowledge_points(
+        self,
+        batch_size: int = 500,
+        view: str = KnowledgePointRepository.VIEW_FULL,
+        include_deleted: bool = False,
+    ) -> AsyncIterator[Union[KnowledgePoint, KnowledgePointSummary]]:
+        """
+        逐筆串流所有知識點，記憶體中最多只保留一批。
+
+        串流結果不經過快取，適合匯出或背景處理等一次性讀取全部資料的場景。
+        """
+        await self._ensure_initialized()
+        filters = {"include_deleted": True} if include_deleted else {"is_deleted": False}
+        async for batch in self._repository.iter_all(batch_size, view=view, **filters):
+            for point in batch:
+                yield point
+
+    async def iter_knowledge_point_details(
+        self, batch_size: int = 500, include_deleted: bool = False
+    ) -> AsyncIterator[KnowledgePoint]:
+        """逐筆串流含關聯資料的完整知識點，不經過快取，供匯出使用。"""
+        await self._ensure_initialized()
+        filters = {"include_deleted": True} if include_deleted else {"is_deleted": False}
+        async for batch in self._repository.iter_all_details(batch_size, **filters):
+            for point in batch:
+                yield point
+
+    async def iter_knowledge_points_by_ids(
+        self, point_ids: list[int], batch_size: int = 500
+    ) -> AsyncIterator[KnowledgePoint]:
+        """依 ID 分批串流完整知識點（順序與 point_ids 相同），不經過快取，供匯出使用。"""
+        await self._ensure_initialized()
+        for start in range(0, len(point_ids), batch_size):
+            for point in await self._repository.find_many_by_ids(
+                point_ids[start : start + batch_size]
+            ):
+                yield point
 
     async def update_knowledge_point(self, point: KnowledgePoint) -> bool:
         """更新一個已有的知識點。"""
         try:
             async with self._db_operation("更新知識點") as repo:
                 await repo.update(point)
-                self._cache_manager.invalidate(f"point_{point.id}")
-                self._cache_manager.invalidate("all_points")
-                self._cache_manager.invalidate("statistics")
+                self._invalidate_point_caches(point.id)
                 return True
         except Exception as e:
             self.logger.error(f"更新知識點 {point.id} 失敗: {e}")
@@ -177,9 +334,7 @@ class DatabaseKnowledgeManager:
             async with self._db_operation("刪除知識點") as repo:
                 result = await repo.delete(point_id, reason)
                 if result:
-                    self._cache_manager.invalidate(f"point_{point_id}")
-                    self._cache_manager.invalidate("all_points")
-                    self._cache_manager.invalidate("statistics")
+                    self._invalidate_point_caches(point_id)
                 return result
         except Exception as e:
             self.logger.error(f"刪除知識點 {point_id} 失敗: {e}")
@@ -191,14 +346,85 @@ class DatabaseKnowledgeManager:
             async with self._db_operation("恢復知識點") as repo:
                 result = await repo.restore(point_id)
                 if result:
-                    self._cache_manager.invalidate(f"point_{point_id}")
-                    self._cache_manager.invalidate("all_points")
-                    self._cache_manager.invalidate("statistics")
+                    self._invalidate_point_caches(point_id)
                 return result
         except Exception as e:
             self.logger.error(f"恢復知識點 {point_id} 失敗: {e}")
             return False
 
+    # ========== 批次操作 ==========
+
+    async def get_knowledge_points_by_ids(self, point_ids: list[int]) -> list[KnowledgePoint]:
+        """以單一查詢獲取多個完整知識點，不存在的 ID 會被略過。"""
+        async with self._db_operation("批次獲取知識點") as repo:
+            return await repo.find_many_by_ids(point_ids)
+
+    async def get_existing_point_ids(self, point_ids: list[int]) -> list[int]:
+        """返回實際存在的知識點 ID，不載入知識點內容。"""
+        async with self._db_operation("檢查知識點是否存在") as repo:
+            return await repo.find_existing_ids(point_ids)
+
+    async def delete_points(self, point_ids: list[int], reason: str = "") -> list[int]:
+        """批次軟刪除知識點，返回實際被刪除的 ID；失敗時返回空列表。"""
+        try:
+            async with self._db_operation("批次刪除知識點") as repo:
+                deleted_ids = await repo.delete_many(point_ids, reason)
+        except Exception as e:
+            self.logger.error(f"批次刪除知識點失敗: {e}")
+            return []
+        self._invalidate_many_point_caches(deleted_ids)
+        return deleted_ids
+
+    async def restore_points(self, point_ids: list[int]) -> list[int]:
+        """批次恢復被軟刪除的知識點，返回實際被恢復的 ID；失敗時返回空列表。"""
+        try:
+            async with self._db_operation("批次恢復知識點") as repo:
+                restored_ids = await repo.restore_many(point_ids)
+        except Exception as e:
+            self.logger.error(f"批次恢復知識點失敗: {e}")
+            return []
+        self._invalidate_many_point_caches(restored_ids)
+        return restored_ids
+
+    async def update_points(self, point_ids: list[int], updates: dict[str, Any]) -> list[int]:
+        """將相同的變更套用到多個知識點，返回實際被更新的 ID；失敗時返回空列表。"""
+        try:
+            async with self._db_operation("批次更新知識點") as repo:
+                updated_ids = await repo.update_many(point_ids, updates)
+        except Exception as e:
+            self.logger.error(f"批次更新知識點失敗: {e}")
+            return []
+        self._invalidate_many_point_caches(updated_ids)
+        return updated_ids
+
+    async def add_tags_to_points(self, point_ids: list[int], tags: list[str]) -> list[int]:
+        """為多個知識點加上標籤，返回實際處理的 ID；失敗時返回空列表。"""
+        try:
+            async with self._db_operation("批次添加標籤") as repo:
+                tagged_ids = await repo.add_tags_many(point_ids, tags)
+        except Exception as e:
+            self.logger.error(f"批次添加標籤失敗: {e}")
+            return []
+        self._invalidate_many_point_caches(tagged_ids)
+        return tagged_ids
+
+    async def import_knowledge_points(
+        self,
+        records: Union[Iterable[SourceRecord], AsyncIterable[SourceRecord]],
+        chunk_size: int = 1000,
+        skip_existing: bool = True,
+        dry_run: bool = False,
+    ) -> ImportReport:
+        """以 COPY 暫存表分塊匯入知識點，完成後失效列表與統計快取。"""
+        await self._ensure_initialized()
+        importer = KnowledgeImporter(
+            self._repository, chunk_size=chunk_size, skip_existing=skip_existing, dry_run=dry_run
+        )
+        report = await importer.run(records)
+        if report.imported:
+            self._invalidate_point_caches()
+        return report
+
     # ========== 查詢操作 ==========
 
     async def search_knowledge_points(self, keyword: str, limit: int = 50) -> list[KnowledgePoint]:
@@ -209,7 +435,23 @@ class DatabaseKnowledgeManager:
             async with self._db_operation("搜尋知識點") as repo:
                 return await repo.search(keyword, limit)
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _search, ttl=180)
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _search, ttl=180, tags=[CacheTags.POINT_LISTS]
+        )
+
+    async def search_knowledge_points_page(
+        self, keyword: str, limit: int = 50, cursor: Optional[tuple[float, int]] = None
+    ) -> tuple[list[KnowledgePoint], Optional[tuple[float, int]]]:
+        """以相關性排序分頁搜尋知識點，返回 (結果, 下一頁游標)。"""
+        cache_key = f"search_page_{keyword}_{limit}_{cursor}"
+
+        async def _search_page():
+            async with self._db_operation("分頁搜尋知識點") as repo:
+                return await repo.search_page(keyword, limit, cursor)
+
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _search_page, ttl=180, tags=[CacheTags.POINT_LISTS]
+        )
 
     async def get_review_candidates(self, limit: int = 20) -> list[KnowledgePoint]:
         """獲取需要複習的知識點列表。"""
@@ -219,7 +461,34 @@ class DatabaseKnowledgeManager:
             async with self._db_operation("獲取複習候選") as repo:
                 return await repo.find_due_for_review(limit)
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _get_candidates, ttl=120)
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get_candidates, ttl=120, tags=[CacheTags.POINT_LISTS, CacheTags.REVIEW]
+        )
+
+    async def get_due_points(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> list[KnowledgePoint]:
+        """獲取所有已到期的知識點（不限類別），由資料庫過濾與分頁。"""
+        cache_key = f"due_points_{limit}_{offset}"
+
+        async def _get_due():
+            async with self._db_operation("獲取到期知識點") as repo:
+                return await repo.find_due(limit=limit, offset=offset)
+
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get_due, ttl=120, tags=[CacheTags.POINT_LISTS, CacheTags.REVIEW]
+        )
+
+    async def count_due_points(self) -> int:
+        """計算已到期的知識點數量。"""
+
+        async def _count_due():
+            async with self._db_operation("計算到期知識點") as repo:
+                return await repo.count_due()
+
+        return await self._cache_manager.get_or_compute_async(
+            "due_count", _count_due, ttl=120, tags=[CacheTags.POINT_LISTS, CacheTags.REVIEW]
+        )
 
     async def get_knowledge_by_category(
         self, category: str, subtype: Optional[str] = None
@@ -231,7 +500,9 @@ class DatabaseKnowledgeManager:
             async with self._db_operation("按類別獲取") as repo:
                 return await repo.find_by_category(category, subtype)
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _get_by_category, ttl=300)
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get_by_category, ttl=300, tags=[CacheTags.POINT_LISTS]
+        )
 
     # ========== 統計操作 ==========
 
@@ -243,21 +514,33 @@ class DatabaseKnowledgeManager:
             async with self._db_operation("獲取統計") as repo:
                 return await repo.get_statistics()
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _get_stats, ttl=60)
+        # 統計允許短暫回傳舊值，過期時只由一個背景任務重新聚合
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get_stats, ttl=60, stale_ttl=30, tags=[CacheTags.STATISTICS]
+        )
 
     # ========== 學習記錄操作 ==========
 
     async def update_mastery(self, point_id: int, is_correct: bool) -> bool:
         """根據練習結果更新知識點的掌握度。"""
+        return bool(await self.update_mastery_batch([point_id], is_correct))
+
+    async def update_mastery_batch(self, point_ids: list[int], is_correct: bool) -> list[int]:
+        """
+        以單一原子語句更新多個知識點的掌握度與下次複習時間。
+
+        Returns:
+            實際被更新的知識點 ID 列表；失敗時返回空列表。
+        """
         try:
-            point = await self.get_knowledge_point(point_id)
-            if not point:
-                return False
-            point.update_mastery(is_correct)
-            return await self.update_knowledge_point(point)
+            async with self._db_operation("批次更新掌握度") as repo:
+                updated_ids = await repo.update_mastery_many(point_ids, is_correct)
         except Exception as e:
-            self.logger.error(f"更新掌握度失敗 for point {point_id}: {e}")
-            return False
+            self.logger.error(f"更新掌握度失敗 for points {point_ids}: {e}")
+            return []
+
+        self._invalidate_many_point_caches(updated_ids)
+        return updated_ids
 
     async def add_review_example(
         self,
@@ -279,9 +562,7 @@ class DatabaseKnowledgeManager:
                 )
                 result = await repo.add_review_example(point_id, example)
                 if result:
-                    self._cache_manager.invalidate(f"point_{point_id}")
-                    self._cache_manager.invalidate("all_points")
-                    self._cache_manager.invalidate("statistics")
+                    self._invalidate_point_caches(point_id)
                 return result
         except Exception as e:
             self.logger.error(f"添加複習例句失敗 for point {point_id}: {e}")
@@ -353,7 +634,9 @@ class DatabaseKnowledgeManager:
                 self.logger.error(f"獲取使用者 {user_id} 設定失敗: {e}")
                 return {"user_id": user_id, "daily_knowledge_limit": DEFAULT_DAILY_LIMIT, "limit_enabled": False}
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _get_settings, ttl=1800)
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get_settings, ttl=1800, tags=[CacheTags.user_settings(user_id)]
+        )
 
     async def update_user_settings(
         self,
@@ -380,8 +663,7 @@ class DatabaseKnowledgeManager:
                     daily_limit,
                     limit_enabled,
                 )
-                self._cache_manager.invalidate(f"user_settings:{user_id}")
-                self._cache_manager.invalidate(f"limit_status:{user_id}")
+                self._cache_manager.invalidate_tags(CacheTags.user_settings(user_id))
                 return True
         except Exception as e:
             self.logger.error(f"更新使用者 {user_id} 設定失敗: {e}")
@@ -431,7 +713,9 @@ class DatabaseKnowledgeManager:
                     "total_count": 0,
                 }
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _get_stats, ttl=300)
+        return await self._cache_manager.get_or_compute_async(
+            cache_key, _get_stats, ttl=300, tags=[CacheTags.daily_stats(user_id)]
+        )
 
     async def increment_daily_stats(
         self, user_id: str = "default_user", error_type: str = "isolated"
@@ -457,8 +741,7 @@ class DatabaseKnowledgeManager:
                     isolated_inc,
                     enhancement_inc,
                 )
-                self._cache_manager.invalidate(f"daily_stats:{user_id}:{target_date.isoformat()}")
-                self._cache_manager.invalidate(f"limit_status:{user_id}:{target_date.isoformat()}")
+                self._cache_manager.invalidate_tags(CacheTags.daily_stats(user_id))
                 return True
         except Exception as e:
             self.logger.error(f"更新每日統計失敗 for {user_id}: {e}")
@@ -492,7 +775,13 @@ class DatabaseKnowledgeManager:
                 self.logger.error(f"檢查每日限額失敗 for {user_id}: {e}")
                 return {"can_add": True, "reason": "error_fallback"}
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _check, ttl=60)
+        # 限額狀態同時依賴使用者設定與當日統計
+        return await self._cache_manager.get_or_compute_async(
+            cache_key,
+            _check,
+            ttl=60,
+            tags=[CacheTags.user_settings(user_id), CacheTags.daily_stats(user_id)],
+        )
 
     async def get_daily_stats_history(self, user_id: str = "default_user", days: int = 7) -> dict:
         """獲取最近幾天的每日統計歷史數據。"""
@@ -523,7 +812,12 @@ class DatabaseKnowledgeManager:
                 self.logger.error(f"獲取統計歷史失敗 for {user_id}: {e}")
                 return {"stats": [], "summary": {}}
 
-        return await self._cache_manager.get_or_compute_async(cache_key, _get_history, ttl=300)
+        return await self._cache_manager.get_or_compute_async(
+            cache_key,
+            _get_history,
+            ttl=300,
+            tags=[CacheTags.user_settings(user_id), CacheTags.daily_stats(user_id)],
+        )
 
     async def save_with_limit(
         self,
@@ -11,14 +11,84 @@
 - 將資料庫記錄（row）與應用程式的資料模型（dataclass）進行轉換。
 """
 
+import base64
+from collections.abc import AsyncIterator
 from datetime import datetime
-from typing import Any, Optional
+from decimal import Decimal
+from typing import Any, Optional, Union
 
 import asyncpg
 
 from core.database.base import BaseRepository
 from core.error_types import ErrorCategory
-from core.models import KnowledgePoint, OriginalError, ReviewExample
+from core.models import KnowledgePoint, KnowledgePointSummary, OriginalError, ReviewExample
+from scripts.settings import settings
+
+# 列表分頁游標：上一頁最後一筆的 (last_seen, id)
+PageCursor = tuple[datetime, int]
+
+# 掌握度篩選區間 [下限, 上限)，None 表示不限
+MASTERY_BANDS: dict[str, tuple[Optional[float], Optional[float]]] = {
+    "low": (None, 0.3),
+    "medium": (0.3, 0.7),
+    "high": (0.7, None),
+}
+
+
+def encode_page_cursor(cursor: Optional[PageCursor]) -> Optional[str]:
+    """將分頁游標編碼為可放在 URL 中的字串。"""
+    if cursor is None:
+        return None
+    last_seen, point_id = cursor
+    raw = f"{last_seen.isoformat()}|{point_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_page_cursor(token: Optional[str]) -> Optional[PageCursor]:
+    """
+    解碼 `encode_page_cursor` 產生的游標字串。
+
+    Raises:
+        ValueError: 游標格式錯誤。
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        last_seen, _, point_id = raw.rpartition("|")
+        return datetime.fromisoformat(last_seen), int(point_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"無效的分頁游標: {token}") from e
+
+
+# 搜尋分頁游標：上一頁最後一筆的 (相關性, id)
+SearchCursor = tuple[float, int]
+
+
+def encode_search_cursor(cursor: Optional[SearchCursor]) -> Optional[str]:
+    """將搜尋游標編碼為可放在 URL 中的字串（相關性以 repr 保存，解碼後與資料庫值完全相等）。"""
+    if cursor is None:
+        return None
+    rank, point_id = cursor
+    raw = f"{float(rank)!r}|{point_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(token: Optional[str]) -> Optional[SearchCursor]:
+    """
+    解碼 `encode_search_cursor` 產生的游標字串。
+
+    Raises:
+        ValueError: 游標格式錯誤。
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        rank, _, point_id = raw.rpartition("|")
+        return float(rank), int(point_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"無效的搜尋游標: {token}") from e
 
 
 class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
@@ -78,19 +148,23 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
             last_modified=(row.get("last_modified") or row.get("created_at")).isoformat(),
         )
 
-    async def find_by_id(self, id: int) -> Optional[KnowledgePoint]:
-        """
-        根據 ID 查詢單個知識點，並連接查詢其所有關聯資料。
+    # 各檢視讀取的欄位；不使用 SELECT *，避免傳輸 metadata 與自動產生的搜尋欄位
+    _FULL_COLUMNS = (
+        "id, key_point, category, subtype, explanation, original_phrase, correction, "
+        "mastery_level, mistake_count, correct_count, created_at, last_seen, next_review, "
+        "last_modified, is_deleted, deleted_at, deleted_reason, custom_notes"
+    )
+    _SUMMARY_COLUMNS = (
+        "id, key_point, category, subtype, original_phrase, correction, "
+        "mastery_level, mistake_count, correct_count, last_seen, next_review, is_deleted"
+    )
 
-        Args:
-            id: 知識點的 ID。
-
-        Returns:
-            一個完整的 `KnowledgePoint` 物件，如果找不到則返回 None。
-        """
-        query = """
+    # 含原始錯誤、複習例句與標籤的完整查詢，{where} 由呼叫端填入
+    # kp.id 為主鍵，其餘 kp 欄位在 GROUP BY kp.id 下函數相依，無需逐一列出
+    _DETAIL_COLUMNS = ", ".join(f"kp.{column.strip()}" for column in _FULL_COLUMNS.split(","))
+    _DETAIL_QUERY = f"""
             SELECT
-                kp.*,
+                {_DETAIL_COLUMNS},
                 oe.chinese_sentence as oe_chinese,
                 oe.user_answer as oe_user_answer,
                 oe.correct_answer as oe_correct_answer,
@@ -110,9 +184,21 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
             LEFT JOIN review_examples re ON kp.id = re.knowledge_point_id
             LEFT JOIN knowledge_point_tags kpt ON kp.id = kpt.knowledge_point_id
             LEFT JOIN tags t ON kpt.tag_id = t.id
-            WHERE kp.id = $1
+            WHERE {{where}}
             GROUP BY kp.id, oe.id
+            """
+
+    async def find_by_id(self, id: int) -> Optional[KnowledgePoint]:
         """
+        根據 ID 查詢單個知識點，並連接查詢其所有關聯資料。
+
+        Args:
+            id: 知識點的 ID。
+
+        Returns:
+            一個完整的 `KnowledgePoint` 物件，如果找不到則返回 None。
+        """
+        query = self._DETAIL_QUERY.format(where="kp.id = $1")
         async with self.connection() as conn:
             try:
                 row = await conn.fetchrow(query, id)
@@ -121,33 +207,219 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
                 self._handle_database_error(e, f"find_by_id({id})")
                 raise
 
-    async def find_all(self, **filters) -> list[KnowledgePoint]:
+    VIEW_FULL = "full"
+    VIEW_SUMMARY = "summary"
+
+    @staticmethod
+    def _row_to_summary(row: asyncpg.Record) -> KnowledgePointSummary:
+        """將摘要檢視的資料庫記錄轉換為 `KnowledgePointSummary`。"""
+        return KnowledgePointSummary(
+            id=row["id"],
+            key_point=row["key_point"],
+            category=ErrorCategory.from_string(row["category"]),
+            subtype=row["subtype"] or "",
+            original_phrase=row["original_phrase"],
+            correction=row["correction"],
+            mastery_level=float(row["mastery_level"]),
+            mistake_count=row["mistake_count"],
+            correct_count=row["correct_count"],
+            last_seen=row["last_seen"].isoformat() if row["last_seen"] else "",
+            next_review=row["next_review"].isoformat() if row["next_review"] else "",
+            is_deleted=row["is_deleted"],
+        )
+
+    def _resolve_view(self, view: str):
+        """返回檢視對應的 (欄位清單, 轉換函數)。"""
+        if view == self.VIEW_SUMMARY:
+            return self._SUMMARY_COLUMNS, self._row_to_summary
+        if view == self.VIEW_FULL:
+            return self._FULL_COLUMNS, self._row_to_knowledge_point
+        raise ValueError(f"未知的知識點檢視: {view}")
+
+    async def find_all(self, **filters) -> Union[list[KnowledgePoint], list[KnowledgePointSummary]]:
         """
-        查詢所有知識點，支援多種過濾條件。
+        查詢所有知識點，支援多種過濾條件與欄位檢視。
         為了效能，此查詢不包含詳細的關聯資料（如複習例句）。
 
         Args:
             **filters: 過濾條件字典，例如 `is_deleted=False`。
+                另可傳入 `view`：`"full"`（預設）返回 `KnowledgePoint`；
+                `"summary"` 只讀取摘要欄位並返回 `KnowledgePointSummary`。
 
         Returns:
             符合條件的知識點列表。
         """
+        columns, convert = self._resolve_view(filters.pop("view", self.VIEW_FULL))
+
         include_deleted = filters.pop("include_deleted", False)
         if not include_deleted and "is_deleted" not in filters:
             filters["is_deleted"] = False
 
-        base_query = "SELECT * FROM knowledge_points"
+        base_query = f"SELECT {columns} FROM knowledge_points"
         where_clause, parameters = self._build_where_clause(filters)
         query = f"{base_query} {where_clause} ORDER BY last_seen DESC"
 
         async with self.connection() as conn:
             try:
                 rows = await conn.fetch(query, *parameters)
-                return [self._row_to_knowledge_point(row) for row in rows]
+                return [convert(row) for row in rows]
             except Exception as e:
                 self._handle_database_error(e, f"find_all({filters})")
                 raise
 
+    async def find_page(
+        self, limit: int = 100, cursor: Optional[PageCursor] = None, **filters
+    ) -> tuple[Union[list[KnowledgePoint], list[KnowledgePointSummary]], Optional[PageCursor]]:
+        """
+        以 (last_seen, id) keyset 分頁查詢知識點，排序與 `find_all` 相同。
+
+        每頁只掃描索引上游標之後的 limit 筆，不論資料量或頁數，單頁成本都保持穩定。
+
+        Args:
+            limit: 每頁數量。
+            cursor: 上一頁返回的游標，None 表示第一頁。
+            **filters: 與 `find_all` 相同的過濾條件與 `view`；`mastery` 為
+                `MASTERY_BANDS` 的區間名稱（low / medium / high）。
+
+        Returns:
+            (知識點列表, 下一頁游標)；沒有下一頁時游標為 None。
+        """
+        columns, convert = self._resolve_view(filters.pop("view", self.VIEW_FULL))
+        low, high = MASTERY_BANDS.get(filters.pop("mastery", None), (None, None))
+
+        include_deleted = filters.pop("include_deleted", False)
+        if not include_deleted and "is_deleted" not in filters:
+            filters["is_deleted"] = False
+
+        where_clause, parameters = self._build_where_clause(filters)
+        for bound, operator in ((low, ">="), (high, "<")):
+            if bound is not None:
+                parameters.append(bound)
+                condition = f"mastery_level {operator} ${len(parameters)}"
+                where_clause = (
+                    f"{where_clause} AND {condition}" if where_clause else f"WHERE {condition}"
+                )
+        if cursor:
+            keyset = f"(last_seen, id) < (${len(parameters) + 1}, ${len(parameters) + 2})"
+            where_clause = f"{where_clause} AND {keyset}" if where_clause else f"WHERE {keyset}"
+            parameters.extend(cursor)
+        parameters.append(limit)
+        query = (
+            f"SELECT {columns} FROM knowledge_points {where_clause} "
+            f"ORDER BY last_seen DESC, id DESC LIMIT ${len(parameters)}"
+        )
+
+        async with self.connection() as conn:
+            try:
+                rows = await conn.fetch(query, *parameters)
+            except Exception as e:
+                self._handle_database_error(e, f"find_page({filters}, {cursor})")
+                raise
+
+        next_cursor = (rows[-1]["last_seen"], rows[-1]["id"]) if len(rows) == limit else None
+        return [convert(row) for row in rows], next_cursor
+
+    async def _find_id_page(
+        self, columns: str, limit: int, after_id: Optional[int], filters: dict[str, Any]
+    ) -> list[asyncpg.Record]:
+        """以不可變的 id 作為 keyset 讀取一頁（id 遞增），供全量串流使用。"""
+        where_clause, parameters = self._build_where_clause(filters)
+        if after_id is not None:
+            keyset = f"id > ${len(parameters) + 1}"
+            where_clause = f"{where_clause} AND {keyset}" if where_clause else f"WHERE {keyset}"
+            parameters.append(after_id)
+        parameters.append(limit)
+        query = (
+            f"SELECT {columns} FROM knowledge_points {where_clause} "
+            f"ORDER BY id LIMIT ${len(parameters)}"
+        )
+        async with self.connection() as conn:
+            try:
+                return await conn.fetch(query, *parameters)
+            except Exception as e:
+                self._handle_database_error(e, f"_find_id_page({filters}, {after_id})")
+                raise
+
+    async def iter_all(
+        self, batch_size: int = 500, **filters
+    ) -> AsyncIterator[Union[list[KnowledgePoint], list[KnowledgePointSummary]]]:
+        """
+        逐批串流所有符合條件的知識點（依 id 遞增）。
+
+        以 id 作為 keyset，而非 `find_page` 的 (last_seen, id)：複習會更新 last_seen，
+        串流期間被複習的知識點若以 last_seen 分頁會跳到游標之前而被漏掉。
+        每批各自借用一次連線，不會在批次之間佔用連線或交易。
+
+        Args:
+            batch_size: 每批數量。
+            **filters: 與 `find_all` 相同的過濾條件與 `view`。
+
+        Yields:
+            每批的知識點列表。
+        """
+        columns, convert = self._resolve_view(filters.pop("view", self.VIEW_FULL))
+        include_deleted = filters.pop("include_deleted", False)
+        if not include_deleted and "is_deleted" not in filters:
+            filters["is_deleted"] = False
+
+        after_id = None
+        while True:
+            rows = await self._find_id_page(columns, batch_size, after_id, filters)
+            if rows:
+                yield [convert(row) for row in rows]
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1]["id"]
+
+    async def iter_all_details(
+        self, batch_size: int = 500, **filters
+    ) -> AsyncIterator[list[KnowledgePoint]]:
+        """
+        逐批串流完整知識點（含原始錯誤、複習例句與標籤）。
+
+        先以 id keyset 分頁取得每批 ID，再以一次關聯查詢載入該批的完整資料，
+        每批兩個查詢，記憶體中最多只保留一批。
+
+        Args:
+            batch_size: 每批數量。
+            **filters: 與 `find_all` 相同的過濾條件（`view` 會被忽略）。
+
+        Yields:
+            每批的完整知識點列表，依 id 遞增。
+        """
+        filters.pop("view", None)
+        include_deleted = filters.pop("include_deleted", False)
+        if not include_deleted and "is_deleted" not in filters:
+            filters["is_deleted"] = False
+
+        after_id = None
+        while True:
+            rows = await self._find_id_page("id", batch_size, after_id, filters)
+            if rows:
+                yield await self.find_many_by_ids([row["id"] for row in rows])
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1]["id"]
+
+    # knowledge_points 批次寫入時使用的欄位順序
+    _KP_COPY_COLUMNS = (
+        "id",
+        "key_point",
+        "category",
+        "subtype",
+        "explanation",
+        "original_phrase",
+        "correction",
+        "mastery_level",
+        "mistake_count",
+        "correct_count",
+        "created_at",
+        "last_seen",
+        "next_review",
+        "custom_notes",
+        "last_modified",
+    )
+
     async def create(self, entity: KnowledgePoint) -> KnowledgePoint:
         """
         在資料庫中創建一個新的知識點及其所有關聯資料（在一個事務中完成）。
@@ -158,90 +430,410 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
         Returns:
             創建後並帶有新 ID 的 `KnowledgePoint` 物件。
         """
+        created = await self.create_many([entity])
+        self.logger.info(f"成功創建知識點 {entity.id}: {entity.key_point}")
+        return created[0]
+
+    async def create_many(self, entities: list[KnowledgePoint]) -> list[KnowledgePoint]:
+        """
+        批次創建知識點及其原始錯誤、複習例句與標籤（在一個事務中完成）。
+
+        無論批次大小，往返次數都是固定的：預先配置 ID、以 COPY 寫入三張資料表，
+        再以兩個集合式語句完成標籤 upsert 與關聯。
+
+        Args:
+            entities: 要創建的 `KnowledgePoint` 物件列表。
+
+        Returns:
+            帶有新 ID 的同一批 `KnowledgePoint` 物件（順序不變）。
+        """
+        if not entities:
+            return []
+
         async with self.transaction() as conn:
             try:
-                kp_query = """
-                    INSERT INTO knowledge_points (key_point, category, subtype, explanation, original_phrase, correction, mastery_level, mistake_count, correct_count, created_at, last_seen, next_review, custom_notes, last_modified)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14) RETURNING id, created_at, last_modified
-                """
-                created_at = (
-                    datetime.fromisoformat(entity.created_at)
-                    if entity.created_at
-                    else datetime.now()
-                )
-                last_seen = (
-                    datetime.fromisoformat(entity.last_seen) if entity.last_seen else datetime.now()
-                )
-                next_review = (
-                    datetime.fromisoformat(entity.next_review) if entity.next_review else None
+                # 1. 一次取得整批的 ID，讓後續子表可以直接引用
+                ids = await conn.fetch(
+                    "SELECT nextval(pg_get_serial_sequence('knowledge_points', 'id')) AS id "
+                    "FROM generate_series(1, $1)",
+                    len(entities),
                 )
-                last_modified = (
-                    datetime.fromisoformat(entity.last_modified)
-                    if entity.last_modified
-                    else created_at
+
+                kp_records = []
+                oe_records = []
+                re_records = []
+                tag_kp_ids: list[int] = []
+                tag_names: list[str] = []
+
+                for entity, id_row in zip(entities, ids):
+                    entity.id = id_row["id"]
+                    created_at = (
+                        datetime.fromisoformat(entity.created_at)
+                        if entity.created_at
+                        else datetime.now()
+                    )
+                    last_seen = (
+                        datetime.fromisoformat(entity.last_seen)
+                        if entity.last_seen
+                        else datetime.now()
+                    )
+                    next_review = (
+                        datetime.fromisoformat(entity.next_review) if entity.next_review else None
+                    )
+                    last_modified = (
+                        datetime.fromisoformat(entity.last_modified)
+                        if entity.last_modified
+                        else created_at
+                    )
+                    entity.created_at = created_at.isoformat()
+                    entity.last_modified = last_modified.isoformat()
+
+                    kp_records.append(
+                        (
+                            entity.id,
+                            entity.key_point,
+                            entity.category.value,
+                            entity.subtype,
+                            entity.explanation,
+                            entity.original_phrase,
+                            entity.correction,
+                            Decimal(str(entity.mastery_level)),
+                            entity.mistake_count,
+                            entity.correct_count,
+                            created_at,
+                            last_seen,
+                            next_review,
+                            entity.custom_notes,
+                            last_modified,
+                        )
+                    )
+
+                    if entity.original_error:
+                        oe_records.append(
+                            (
+                                entity.id,
+                                entity.original_error.chinese_sentence,
+                                entity.original_error.user_answer,
+                                entity.original_error.correct_answer,
+                                datetime.fromisoformat(entity.original_error.timestamp),
+                            )
+                        )
+
+                    for example in entity.review_examples or []:
+                        re_records.append(
+                            (
+                                entity.id,
+                                example.chinese_sentence,
+                                example.user_answer,
+                                example.correct_answer,
+                                example.is_correct,
+                                datetime.fromisoformat(example.timestamp),
+                            )
+                        )
+
+                    for tag_name in dict.fromkeys(entity.tags or []):
+                        tag_kp_ids.append(entity.id)
+                        tag_names.append(tag_name)
+
+                # 2. 以 COPY 寫入主表與子表
+                await conn.copy_records_to_table(
+                    "knowledge_points", records=kp_records, columns=self._KP_COPY_COLUMNS
                 )
+                if oe_records:
+                    await conn.copy_records_to_table(
+                        "original_errors",
+                        records=oe_records,
+                        columns=(
+                            "knowledge_point_id",
+                            "chinese_sentence",
+                            "user_answer",
+                            "correct_answer",
+                            "timestamp",
+                        ),
+                    )
+                if re_records:
+                    await conn.copy_records_to_table(
+                        "review_examples",
+                        records=re_records,
+                        columns=(
+                            "knowledge_point_id",
+                            "chinese_sentence",
+                            "user_answer",
+                            "correct_answer",
+                            "is_correct",
+                            "timestamp",
+                        ),
+                    )
+
+                # 3. 集合式標籤 upsert 與關聯
+                if tag_names:
+                    await conn.execute(
+                        "INSERT INTO tags (name) SELECT DISTINCT unnest($1::text[]) "
+                        "ON CONFLICT (name) DO NOTHING",
+                        tag_names,
+                    )
+                    await conn.execute(
+                        """
+                        INSERT INTO knowledge_point_tags (knowledge_point_id, tag_id)
+                        SELECT pairs.kp_id, t.id
+                        FROM unnest($1::int[], $2::text[]) AS pairs(kp_id, tag_name)
+                        JOIN tags t ON t.name = pairs.tag_name
+                        ON CONFLICT DO NOTHING
+                        """,
+                        tag_kp_ids,
+                        tag_names,
+                    )
+
+                self.logger.debug(f"批次創建 {len(entities)} 個知識點")
+                return entities
+            except Exception as e:
+                self._handle_database_error(e, f"create_many({len(entities)})")
+                raise
+
+    # 匯入暫存表；每個交易各自建立，提交時自動刪除
+    _IMPORT_STAGING_DDL = """
+        CREATE TEMP TABLE import_kp (
+            stage_id INTEGER PRIMARY KEY,
+            key_point TEXT NOT NULL,
+            category TEXT NOT NULL,
+            subtype TEXT NOT NULL,
+            explanation TEXT NOT NULL,
+            original_phrase TEXT NOT NULL,
+            correction TEXT NOT NULL,
+            mastery_level NUMERIC(3,2) NOT NULL,
+            mistake_count INTEGER NOT NULL,
+            correct_count INTEGER NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL,
+            last_seen TIMESTAMPTZ NOT NULL,
+            next_review TIMESTAMPTZ,
+            is_deleted BOOLEAN NOT NULL,
+            deleted_at TIMESTAMPTZ,
+            deleted_reason TEXT,
+            custom_notes TEXT,
+            last_modified TIMESTAMPTZ NOT NULL,
+            new_id INTEGER
+        ) ON COMMIT DROP;
+        CREATE TEMP TABLE import_oe (
+            stage_id INTEGER NOT NULL,
+            chinese_sentence TEXT NOT NULL,
+            user_answer TEXT NOT NULL,
+            correct_answer TEXT NOT NULL,
+            timestamp TIMESTAMPTZ NOT NULL
+        ) ON COMMIT DROP;
+        CREATE TEMP TABLE import_re (
+            stage_id INTEGER NOT NULL,
+            chinese_sentence TEXT NOT NULL,
+            user_answer TEXT NOT NULL,
+            correct_answer TEXT NOT NULL,
+            is_correct BOOLEAN NOT NULL,
+            timestamp TIMESTAMPTZ NOT NULL
+        ) ON COMMIT DROP;
+        CREATE TEMP TABLE import_tags (
+            stage_id INTEGER NOT NULL,
+            name TEXT NOT NULL
+        ) ON COMMIT DROP;
+    """
 
-                kp_row = await conn.fetchrow(
-                    kp_query,
+    # import_kp 以 COPY 寫入的欄位順序（new_id 由合併步驟配置）
+    _IMPORT_KP_COLUMNS = (
+        "stage_id",
+        "key_point",
+        "category",
+        "subtype",
+        "explanation",
+        "original_phrase",
+        "correction",
+        "mastery_level",
+        "mistake_count",
+        "correct_count",
+        "created_at",
+        "last_seen",
+        "next_review",
+        "is_deleted",
+        "deleted_at",
+        "deleted_reason",
+        "custom_notes",
+        "last_modified",
+    )
+
+    # 為需要寫入的暫存列配置 ID：同一批內 key_point 重複時只保留第一筆，
+    # $1 為 TRUE 時略過資料庫中已存在（未刪除）的 key_point
+    _IMPORT_ASSIGN_IDS = """
+        UPDATE import_kp s
+        SET new_id = nextval(pg_get_serial_sequence('knowledge_points', 'id'))
+        FROM (
+            SELECT DISTINCT ON (key_point) stage_id FROM import_kp ORDER BY key_point, stage_id
+        ) first_rows
+        WHERE s.stage_id = first_rows.stage_id
+          AND NOT ($1::boolean AND EXISTS (
+              SELECT 1 FROM knowledge_points kp
+              WHERE kp.key_point = s.key_point AND kp.is_deleted = FALSE
+          ))
+    """
+
+    _IMPORT_MERGE_STATEMENTS = (
+        """
+        INSERT INTO knowledge_points (
+            id, key_point, category, subtype, explanation, original_phrase, correction,
+            mastery_level, mistake_count, correct_count, created_at, last_seen, next_review,
+            is_deleted, deleted_at, deleted_reason, custom_notes, last_modified
+        )
+        SELECT
+            new_id, key_point, category, subtype, explanation, original_phrase, correction,
+            mastery_level, mistake_count, correct_count, created_at, last_seen, next_review,
+            is_deleted, deleted_at, deleted_reason, custom_notes, last_modified
+        FROM import_kp WHERE new_id IS NOT NULL
+        """,
+        """
+        INSERT INTO original_errors
+            (knowledge_point_id, chinese_sentence, user_answer, correct_answer, timestamp)
+        SELECT DISTINCT ON (k.new_id)
+            k.new_id, o.chinese_sentence, o.user_answer, o.correct_answer, o.timestamp
+        FROM import_oe o JOIN import_kp k USING (stage_id)
+        WHERE k.new_id IS NOT NULL
+        """,
+        """
+        INSERT INTO review_examples
+            (knowledge_point_id, chinese_sentence, user_answer, correct_answer, is_correct, timestamp)
+        SELECT k.new_id, r.chinese_sentence, r.user_answer, r.correct_answer, r.is_correct, r.timestamp
+        FROM import_re r JOIN import_kp k USING (stage_id)
+        WHERE k.new_id IS NOT NULL
+        """,
+        """
+        INSERT INTO tags (name)
+        SELECT DISTINCT t.name FROM import_tags t JOIN import_kp k USING (stage_id)
+        WHERE k.new_id IS NOT NULL
+        ON CONFLICT (name) DO NOTHING
+        """,
+        """
+        INSERT INTO knowledge_point_tags (knowledge_point_id, tag_id)
+        SELECT k.new_id, tg.id
+        FROM import_tags t
+        JOIN import_kp k USING (stage_id)
+        JOIN tags tg ON tg.name = t.name
+        WHERE k.new_id IS NOT NULL
+        ON CONFLICT DO NOTHING
+        """,
+    )
+
+    async def import_many(
+        self, entities: list[KnowledgePoint], skip_existing: bool = True
+    ) -> tuple[int, int]:
+        """
+        以 COPY 寫入暫存表，再以集合式語句合併到正式資料表（在一個事務中完成）。
+
+        與 `create_many` 不同，匯入會在資料庫端去重：同一批內重複的 key_point 只保留第一筆，
+        並可略過資料庫中已存在的 key_point。匯入的知識點一律配置新的 ID。
+
+        Args:
+            entities: 已驗證的 `KnowledgePoint` 物件列表。
+            skip_existing: 是否略過資料庫中已存在（未刪除）的 key_point。
+
+        Returns:
+            (寫入數量, 略過數量)。
+        """
+        if not entities:
+            return 0, 0
+
+        kp_records = []
+        oe_records = []
+        re_records = []
+        tag_records = []
+        for stage_id, entity in enumerate(entities):
+            created_at = datetime.fromisoformat(entity.created_at)
+            kp_records.append(
+                (
+                    stage_id,
                     entity.key_point,
                     entity.category.value,
                     entity.subtype,
                     entity.explanation,
                     entity.original_phrase,
                     entity.correction,
-                    entity.mastery_level,
+                    Decimal(str(entity.mastery_level)),
                     entity.mistake_count,
                     entity.correct_count,
                     created_at,
-                    last_seen,
-                    next_review,
-                    entity.custom_notes,
-                    last_modified,
+                    datetime.fromisoformat(entity.last_seen),
+                    datetime.fromisoformat(entity.next_review) if entity.next_review else None,
+                    entity.is_deleted,
+                    datetime.fromisoformat(entity.deleted_at) if entity.deleted_at else None,
+                    entity.deleted_reason or "",
+                    entity.custom_notes or "",
+                    datetime.fromisoformat(entity.last_modified)
+                    if entity.last_modified
+                    else created_at,
                 )
-                entity.id = kp_row["id"]
-                entity.created_at = kp_row["created_at"].isoformat()
-                entity.last_modified = kp_row["last_modified"].isoformat()
-
-                if entity.original_error:
-                    await conn.execute(
-                        "INSERT INTO original_errors (knowledge_point_id, chinese_sentence, user_answer, correct_answer, timestamp) VALUES ($1, $2, $3, $4, $5)",
-                        entity.id,
+            )
+            if entity.original_error:
+                oe_records.append(
+                    (
+                        stage_id,
                         entity.original_error.chinese_sentence,
                         entity.original_error.user_answer,
                         entity.original_error.correct_answer,
                         datetime.fromisoformat(entity.original_error.timestamp),
                     )
+                )
+            for example in entity.review_examples or []:
+                re_records.append(
+                    (
+                        stage_id,
+                        example.chinese_sentence,
+                        example.user_answer,
+                        example.correct_answer,
+                        example.is_correct,
+                        datetime.fromisoformat(example.timestamp),
+                    )
+                )
+            for tag_name in dict.fromkeys(entity.tags or []):
+                tag_records.append((stage_id, tag_name))
 
-                if entity.review_examples:
-                    for example in entity.review_examples:
-                        await conn.execute(
-                            "INSERT INTO review_examples (knowledge_point_id, chinese_sentence, user_answer, correct_answer, is_correct, timestamp) VALUES ($1, $2, $3, $4, $5, $6)",
-                            entity.id,
-                            example.chinese_sentence,
-                            example.user_answer,
-                            example.correct_answer,
-                            example.is_correct,
-                            datetime.fromisoformat(example.timestamp),
-                        )
+        async with self.transaction() as conn:
+            try:
+                await conn.execute(self._IMPORT_STAGING_DDL)
+                await conn.copy_records_to_table(
+                    "import_kp", records=kp_records, columns=self._IMPORT_KP_COLUMNS
+                )
+                if oe_records:
+                    await conn.copy_records_to_table("import_oe", records=oe_records)
+                if re_records:
+                    await conn.copy_records_to_table("import_re", records=re_records)
+                if tag_records:
+                    await conn.copy_records_to_table("import_tags", records=tag_records)
 
-                if entity.tags:
-                    for tag_name in entity.tags:
-                        tag_id = await conn.fetchval(
-                            "INSERT INTO tags (name) VALUES ($1) ON CONFLICT (name) DO UPDATE SET name = $1 RETURNING id",
-                            tag_name,
-                        )
-                        await conn.execute(
-                            "INSERT INTO knowledge_point_tags (knowledge_point_id, tag_id) VALUES ($1, $2) ON CONFLICT DO NOTHING",
-                            entity.id,
-                            tag_id,
-                        )
+                status = await conn.execute(self._IMPORT_ASSIGN_IDS, skip_existing)
+                imported = int(status.split()[-1])
+                if imported:
+                    for statement in self._IMPORT_MERGE_STATEMENTS:
+                        await conn.execute(statement)
 
-                self.logger.info(f"成功創建知識點 {entity.id}: {entity.key_point}")
-                return entity
+                self.logger.debug(f"匯入 {imported}/{len(entities)} 個知識點")
+                return imported, len(entities) - imported
             except Exception as e:
-                self._handle_database_error(e, f"create({entity.key_point})")
+                self._handle_database_error(e, f"import_many({len(entities)})")
                 raise
 
+    async def find_existing_key_points(self, key_points: list[str]) -> set[str]:
+        """
+        查詢哪些 key_point 已存在（未刪除），用於批次匯入前去重。
+
+        Args:
+            key_points: 要檢查的 key_point 列表。
+
+        Returns:
+            已存在的 key_point 集合。
+        """
+        if not key_points:
+            return set()
+        async with self.connection() as conn:
+            rows = await conn.fetch(
+                "SELECT DISTINCT key_point FROM knowledge_points "
+                "WHERE key_point = ANY($1::text[]) AND is_deleted = FALSE",
+                key_points,
+            )
+            return {row["key_point"] for row in rows}
+
     async def update(self, entity: KnowledgePoint) -> KnowledgePoint:
         """
         更新一個已有的知識點。
@@ -284,6 +876,95 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
                 self._handle_database_error(e, f"update({entity.id})")
                 raise
 
+    # 原子化的掌握度更新：新掌握度直接由當前列的值計算，並發複習不會互相覆蓋。
+    # $3-$6 為各類別的規則（類別、增量、減量、複習間隔乘數），$7 為掌握度閾值，$8 為對應的複習天數；
+    # 規則與 KnowledgePoint.update_mastery / _calculate_next_review 相同
+    _NEW_MASTERY = (
+        "LEAST(1.0, GREATEST(0.0, kp.mastery_level::float8 "
+        "+ CASE WHEN $2 THEN r.increment ELSE -r.decrement END))"
+    )
+    _UPDATE_MASTERY_QUERY = f"""
+        UPDATE knowledge_points AS kp SET
+            mastery_level = {_NEW_MASTERY},
+            correct_count = kp.correct_count + CASE WHEN $2 THEN 1 ELSE 0 END,
+            mistake_count = kp.mistake_count + CASE WHEN $2 THEN 0 ELSE 1 END,
+            last_seen = CURRENT_TIMESTAMP,
+            next_review = CURRENT_TIMESTAMP + make_interval(days => GREATEST(1, floor(
+                ($8::int[])[1 + (SELECT COUNT(*)::int FROM unnest($7::float8[]) AS t
+                                 WHERE {_NEW_MASTERY} >= t)]
+                * r.multiplier)::int))
+        FROM unnest($3::text[], $4::float8[], $5::float8[], $6::float8[])
+            AS r(category, increment, decrement, multiplier)
+        WHERE kp.id = ANY($1::int[])
+          AND kp.is_deleted = FALSE
+          AND r.category = CASE WHEN lower(kp.category) = ANY($3::text[])
+                                THEN lower(kp.category) ELSE 'other' END
+        RETURNING kp.id
+    """
+
+    @staticmethod
+    def _mastery_rule_params() -> tuple[list, list, list, list, list, list]:
+        """依學習設定產生 `_UPDATE_MASTERY_QUERY` 的規則參數。"""
+        learning = settings.learning
+        categories = list(ErrorCategory)
+        thresholds = learning.MASTERY_THRESHOLDS
+        intervals = learning.REVIEW_INTERVALS
+        return (
+            [category.value for category in categories],
+            [
+                learning.MASTERY_INCREMENTS.get(c.value, learning.MASTERY_INCREMENTS["other"])
+                for c in categories
+            ],
+            [
+                learning.MASTERY_DECREMENTS.get(c.value, learning.MASTERY_DECREMENTS["other"])
+                for c in categories
+            ],
+            [category.get_review_multiplier() for category in categories],
+            [
+                thresholds["beginner"],
+                thresholds["intermediate"],
+                thresholds["advanced"],
+                thresholds["expert"],
+            ],
+            [
+                intervals["immediate"],
+                intervals["short"],
+                intervals["medium"],
+                intervals["long"],
+                intervals["mastered"],
+            ],
+        )
+
+    async def update_mastery_many(self, ids: list[int], is_correct: bool) -> list[int]:
+        """
+        以單一 UPDATE 語句批次更新多個知識點的掌握度、計數與下次複習時間。
+
+        不需要先讀取知識點；新值由資料庫根據當前列計算，避免讀取-修改-寫入之間的更新遺失。
+
+        Args:
+            ids: 知識點 ID 列表（重複的 ID 只會更新一次）。
+            is_correct: 本次練習是否答對。
+
+        Returns:
+            實際被更新的知識點 ID（不存在或已刪除的 ID 會被略過）。
+        """
+        unique_ids = list(dict.fromkeys(int(point_id) for point_id in ids))
+        if not unique_ids:
+            return []
+
+        async with self.connection() as conn:
+            try:
+                rows = await conn.fetch(
+                    self._UPDATE_MASTERY_QUERY,
+                    unique_ids,
+                    is_correct,
+                    *self._mastery_rule_params(),
+                )
+                return [row["id"] for row in rows]
+            except Exception as e:
+                self._handle_database_error(e, f"update_mastery_many({unique_ids}, {is_correct})")
+                raise
+
     async def delete(self, id: int, reason: str = "") -> bool:
         """
         軟刪除一個知識點（將 `is_deleted` 標記為 True）。
@@ -330,6 +1011,169 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
                 self._handle_database_error(e, f"restore({id})")
                 raise
 
+    # ========== 批次操作 ==========
+
+    # 批次更新允許修改的欄位（其餘欄位由專用方法維護）
+    _BULK_UPDATE_COLUMNS = (
+        "key_point",
+        "explanation",
+        "original_phrase",
+        "correction",
+        "category",
+        "subtype",
+        "custom_notes",
+    )
+
+    async def find_many_by_ids(self, ids: list[int]) -> list[KnowledgePoint]:
+        """
+        以單一查詢取得多個完整知識點（含原始錯誤、複習例句與標籤）。
+
+        Args:
+            ids: 知識點 ID 列表。
+
+        Returns:
+            找到的知識點，順序與 ids 相同；不存在的 ID 會被略過。
+        """
+        if not ids:
+            return []
+        query = self._DETAIL_QUERY.format(where="kp.id = ANY($1::int[])")
+        async with self.connection() as conn:
+            try:
+                rows = await conn.fetch(query, ids)
+            except Exception as e:
+                self._handle_database_error(e, f"find_many_by_ids({len(ids)})")
+                raise
+        points = {row["id"]: self._row_to_knowledge_point(row) for row in rows}
+        return [points[point_id] for point_id in dict.fromkeys(ids) if point_id in points]
+
+    async def find_existing_ids(self, ids: list[int]) -> list[int]:
+        """返回 ids 中實際存在的知識點 ID（含已軟刪除），不載入知識點內容。"""
+        if not ids:
+            return []
+        async with self.connection() as conn:
+            try:
+                rows = await conn.fetch(
+                    "SELECT id FROM knowledge_points WHERE id = ANY($1::int[])", ids
+                )
+            except Exception as e:
+                self._handle_database_error(e, f"find_existing_ids({len(ids)})")
+                raise
+        return [row["id"] for row in rows]
+
+    async def delete_many(self, ids: list[int], reason: str = "") -> list[int]:
+        """以單一語句軟刪除多個知識點，返回實際被刪除的 ID。"""
+        query = """
+            UPDATE knowledge_points SET is_deleted = TRUE, deleted_at = CURRENT_TIMESTAMP, deleted_reason = $2
+            WHERE id = ANY($1::int[]) AND is_deleted = FALSE RETURNING id
+        """
+        async with self.connection() as conn:
+            try:
+                rows = await conn.fetch(query, ids, reason)
+                return [row["id"] for row in rows]
+            except Exception as e:
+                self._handle_database_error(e, f"delete_many({len(ids)})")
+                raise
+
+    async def restore_many(self, ids: list[int]) -> list[int]:
+        """以單一語句恢復多個被軟刪除的知識點，返回實際被恢復的 ID。"""
+        query = """
+            UPDATE knowledge_points SET is_deleted = FALSE, deleted_at = NULL, deleted_reason = ''
+            WHERE id = ANY($1::int[]) AND is_deleted = TRUE RETURNING id
+        """
+        async with self.connection() as conn:
+            try:
+                rows = await conn.fetch(query, ids)
+                return [row["id"] for row in rows]
+            except Exception as e:
+                self._handle_database_error(e, f"restore_many({len(ids)})")
+                raise
+
+    async def update_many(self, ids: list[int], updates: dict[str, Any]) -> list[int]:
+        """
+        將相同的欄位變更套用到多個知識點。
+
+        欄位更新以單一 `UPDATE ... WHERE id = ANY($1)` 完成；若包含 `tags`，
+        會在同一交易內以集合式語句替換這些知識點的標籤。
+
+        Args:
+            ids: 知識點 ID 列表。
+            updates: 欄位與新值；只處理 `_BULK_UPDATE_COLUMNS` 與 `tags`，其餘欄位會被忽略。
+
+        Returns:
+            實際被更新的知識點 ID（不存在或已刪除的 ID 會被略過）。
+        """
+        assignments = []
+        parameters: list[Any] = [ids]
+        for column in self._BULK_UPDATE_COLUMNS:
+            if column not in updates:
+                continue
+            value = updates[column]
+            if column == "category":
+                value = ErrorCategory.from_string(value).value
+            parameters.append(value)
+            assignments.append(f"{column} = ${len(parameters)}")
+
+        # 沒有欄位變更時仍更新 last_modified，以便取得存在且未刪除的 ID
+        set_clause = ", ".join(assignments) if assignments else "last_modified = CURRENT_TIMESTAMP"
+        query = (
+            f"UPDATE knowledge_points SET {set_clause} "
+            f"WHERE id = ANY($1::int[]) AND is_deleted = FALSE RETURNING id"
+        )
+
+        async with self.transaction() as conn:
+            try:
+                rows = await conn.fetch(query, *parameters)
+                updated_ids = [row["id"] for row in rows]
+                if "tags" in updates and updated_ids:
+                    await conn.execute(
+                        "DELETE FROM knowledge_point_tags WHERE knowledge_point_id = ANY($1::int[])",
+                        updated_ids,
+                    )
+                    await self._link_tags(conn, updated_ids, updates["tags"] or [])
+                return updated_ids
+            except Exception as e:
+                self._handle_database_error(e, f"update_many({len(ids)})")
+                raise
+
+    async def add_tags_many(self, ids: list[int], tags: list[str]) -> list[int]:
+        """為多個未刪除的知識點加上標籤（保留既有標籤），返回實際處理的 ID。"""
+        async with self.transaction() as conn:
+            try:
+                rows = await conn.fetch(
+                    "SELECT id FROM knowledge_points WHERE id = ANY($1::int[]) AND is_deleted = FALSE",
+                    ids,
+                )
+                existing_ids = [row["id"] for row in rows]
+                if existing_ids:
+                    await self._link_tags(conn, existing_ids, tags)
+                return existing_ids
+            except Exception as e:
+                self._handle_database_error(e, f"add_tags_many({len(ids)})")
+                raise
+
+    @staticmethod
+    async def _link_tags(conn: asyncpg.Connection, ids: list[int], tags: list[str]) -> None:
+        """以集合式語句 upsert 標籤，並建立所有 (知識點, 標籤) 關聯。"""
+        tag_names = list(dict.fromkeys(tag for tag in tags if tag))
+        if not tag_names:
+            return
+        await conn.execute(
+            "INSERT INTO tags (name) SELECT unnest($1::text[]) ON CONFLICT (name) DO NOTHING",
+            tag_names,
+        )
+        await conn.execute(
+            """
+            INSERT INTO knowledge_point_tags (knowledge_point_id, tag_id)
+            SELECT kp_id, t.id
+            FROM unnest($1::int[]) AS kp_id
+            CROSS JOIN tags t
+            WHERE t.name = ANY($2::text[])
+            ON CONFLICT DO NOTHING
+            """,
+            ids,
+            tag_names,
+        )
+
     async def find_due_for_review(self, limit: int = 20) -> list[KnowledgePoint]:
         """
         查詢到期需要複習的知識點。
@@ -346,8 +1190,8 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
         Returns:
             需要複習的知識點列表，按複習時間和掌握度排序。
         """
-        query = """
-            SELECT * FROM knowledge_points
+        query = f"""
+            SELECT {self._FULL_COLUMNS} FROM knowledge_points
             WHERE next_review <= $1 AND is_deleted = FALSE AND mastery_level < 0.9 AND category IN ('isolated', 'enhancement')
             ORDER BY next_review ASC, mastery_level ASC LIMIT $2
         """
@@ -359,6 +1203,49 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
                 self._handle_database_error(e, f"find_due_for_review({limit})")
                 raise
 
+    # 以 next_review 排序的到期查詢，走部分索引 idx_kp_next_review（WHERE is_deleted = FALSE）
+    _DUE_CONDITION = "is_deleted = FALSE AND next_review <= CURRENT_TIMESTAMP"
+
+    async def find_due(
+        self, limit: Optional[int] = None, offset: int = 0, view: str = VIEW_FULL
+    ) -> Union[list[KnowledgePoint], list[KnowledgePointSummary]]:
+        """
+        查詢所有已到期（`next_review` 已到）的知識點，由資料庫完成過濾與排序。
+
+        與 `find_due_for_review` 不同，這裡不限制類別與掌握度。
+
+        Args:
+            limit: 返回的最大數量，None 表示不限制。
+            offset: 略過的筆數。
+            view: 欄位檢視（`"full"` 或 `"summary"`）。
+
+        Returns:
+            到期的知識點列表，最早到期的在前。
+        """
+        columns, convert = self._resolve_view(view)
+        query = (
+            f"SELECT {columns} FROM knowledge_points WHERE {self._DUE_CONDITION} "
+            f"ORDER BY next_review ASC, id ASC LIMIT $1 OFFSET $2"
+        )
+        async with self.connection() as conn:
+            try:
+                # LIMIT NULL 等同於不限制
+                rows = await conn.fetch(query, limit, offset)
+                return [convert(row) for row in rows]
+            except Exception as e:
+                self._handle_database_error(e, f"find_due({limit}, {offset})")
+                raise
+
+    async def count_due(self) -> int:
+        """計算已到期的知識點數量，不傳輸任何資料列。"""
+        query = f"SELECT COUNT(*) FROM knowledge_points WHERE {self._DUE_CONDITION}"
+        async with self.connection() as conn:
+            try:
+                return await conn.fetchval(query)
+            except Exception as e:
+                self._handle_database_error(e, "count_due")
+                raise
+
     async def find_by_category(
         self, category: str, subtype: Optional[str] = None
     ) -> list[KnowledgePoint]:
@@ -374,10 +1261,10 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
         """
         params = [category]
         if subtype:
-            query = "SELECT * FROM knowledge_points WHERE category = $1 AND subtype = $2 AND is_deleted = FALSE ORDER BY created_at DESC"
+            query = f"SELECT {self._FULL_COLUMNS} FROM knowledge_points WHERE category = $1 AND subtype = $2 AND is_deleted = FALSE ORDER BY created_at DESC"
             params.append(subtype)
         else:
-            query = "SELECT * FROM knowledge_points WHERE category = $1 AND is_deleted = FALSE ORDER BY created_at DESC"
+            query = f"SELECT {self._FULL_COLUMNS} FROM knowledge_points WHERE category = $1 AND is_deleted = FALSE ORDER BY created_at DESC"
 
         async with self.connection() as conn:
             try:
@@ -387,6 +1274,40 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
                 self._handle_database_error(e, f"find_by_category({category}, {subtype})")
                 raise
 
+    # 搜尋：tsvector 全文匹配 + trigram 子字串匹配（中文無法被 'simple' 斷詞，由 trigram 負責），
+    # 依 ts_rank + word_similarity 排序，並以 (search_rank, id) 作為 keyset 分頁游標
+    _SEARCH_QUERY = f"""
+        WITH matches AS (
+            SELECT {_FULL_COLUMNS},
+                (ts_rank(kp.search_vector, websearch_to_tsquery('simple', $1))
+                 + word_similarity($1, kp.search_text)
+                 + CASE WHEN kp.key_point ILIKE $2 THEN 1 ELSE 0 END)::float8 AS search_rank
+            FROM knowledge_points kp
+            WHERE kp.is_deleted = FALSE
+              AND (kp.search_vector @@ websearch_to_tsquery('simple', $1) OR kp.search_text ILIKE $2)
+        )
+        SELECT * FROM matches
+        WHERE $3::float8 IS NULL OR (search_rank, id) < ($3::float8, $4::int)
+        ORDER BY search_rank DESC, id DESC
+        LIMIT $5
+    """
+
+    # 尚未執行 scripts/add_search_index.sql 的資料庫使用的舊查詢
+    _LEGACY_SEARCH_QUERY = f"""
+        SELECT {_FULL_COLUMNS} FROM knowledge_points
+        WHERE (key_point ILIKE $1 OR explanation ILIKE $1 OR original_phrase ILIKE $1 OR correction ILIKE $1) AND is_deleted = FALSE
+        ORDER BY CASE WHEN key_point ILIKE $1 THEN 1 WHEN original_phrase ILIKE $1 THEN 2 WHEN correction ILIKE $1 THEN 3 ELSE 4 END, created_at DESC
+        LIMIT $2
+    """
+
+    _search_index_available = True
+
+    @staticmethod
+    def _like_pattern(keyword: str) -> str:
+        """將關鍵字轉為 ILIKE 子字串模式，跳脫其中的 `%`、`_` 與 `\\`。"""
+        escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
+
     async def search(self, keyword: str, limit: int = 50) -> list[KnowledgePoint]:
         """
         對知識點進行全文搜索。
@@ -400,17 +1321,57 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
         Returns:
             匹配的知識點列表，按相關性排序。
         """
-        query = """
-            SELECT * FROM knowledge_points
-            WHERE (key_point ILIKE $1 OR explanation ILIKE $1 OR original_phrase ILIKE $1 OR correction ILIKE $1) AND is_deleted = FALSE
-            ORDER BY CASE WHEN key_point ILIKE $1 THEN 1 WHEN original_phrase ILIKE $1 THEN 2 WHEN correction ILIKE $1 THEN 3 ELSE 4 END, created_at DESC
-            LIMIT $2
+        points, _ = await self.search_page(keyword, limit)
+        return points
+
+    async def search_page(
+        self,
+        keyword: str,
+        limit: int = 50,
+        cursor: Optional[tuple[float, int]] = None,
+    ) -> tuple[list[KnowledgePoint], Optional[tuple[float, int]]]:
         """
-        pattern = f"%{keyword}%"
+        以相關性排序分頁搜尋知識點。
+
+        使用 keyset 分頁：下一頁以上一頁最後一筆的 (相關性, id) 作為游標，
+        不論翻到第幾頁，查詢成本都不會隨 OFFSET 增加。
+
+        Args:
+            keyword: 搜索關鍵字。
+            limit: 每頁數量。
+            cursor: 上一頁返回的游標，None 表示第一頁。
+
+        Returns:
+            (知識點列表, 下一頁游標)；沒有下一頁時游標為 None。
+        """
+        pattern = self._like_pattern(keyword)
         async with self.connection() as conn:
             try:
-                rows = await conn.fetch(query, pattern, limit)
-                return [self._row_to_knowledge_point(row) for row in rows]
+                if KnowledgePointRepository._search_index_available:
+                    try:
+                        cursor_rank, cursor_id = cursor if cursor else (None, None)
+                        rows = await conn.fetch(
+                            self._SEARCH_QUERY, keyword, pattern, cursor_rank, cursor_id, limit
+                        )
+                        points = [self._row_to_knowledge_point(row) for row in rows]
+                        next_cursor = (
+                            (rows[-1]["search_rank"], rows[-1]["id"])
+                            if len(rows) == limit
+                            else None
+                        )
+                        return points, next_cursor
+                    except asyncpg.UndefinedColumnError:
+                        KnowledgePointRepository._search_index_available = False
+                        self.logger.warning(
+                            "knowledge_points 缺少搜尋索引欄位，改用 ILIKE 搜尋；"
+                            "請執行 scripts/add_search_index.sql"
+                        )
+
+                # 舊查詢不支援游標分頁，只返回第一頁
+                if cursor:
+                    return [], None
+                rows = await conn.fetch(self._LEGACY_SEARCH_QUERY, pattern, limit)
+                return [self._row_to_knowledge_point(row) for row in rows], None
             except Exception as e:
                 self._handle_database_error(e, f"search({keyword})")
                 raise
@@ -443,54 +1404,132 @@ class KnowledgePointRepository(BaseRepository[KnowledgePoint]):
                 self._handle_database_error(e, f"add_review_example({knowledge_point_id})")
                 raise
 
+    _stats_snapshot_available = True
+
+    @staticmethod
+    def _build_statistics(counters: list[asyncpg.Record], due_reviews: int) -> dict[str, Any]:
+        """
+        將 (dimension, key, value) 計數器轉換為統計字典。
+
+        快照表與 `stats_aggregate()` 輸出相同形狀，兩條路徑共用此轉換，確保結果一致。
+        """
+        values: dict[str, dict[str, float]] = {}
+        for row in counters:
+            values.setdefault(row["dimension"], {})[row["key"]] = float(row["value"])
+
+        totals = values.get("total", {})
+        practice = values.get("practice", {})
+        knowledge_points = int(totals.get("knowledge_points", 0))
+        total_practices = int(practice.get("total_practices", 0))
+        correct_count = int(practice.get("correct_count", 0))
+
+        # 分類分布：中文名稱，依固定順序排列（與 UnifiedStatistics 相同）
+        category_counts: dict[ErrorCategory, int] = {}
+        for key, value in values.get("category", {}).items():
+            if value > 0:
+                category = ErrorCategory.from_string(key)
+                category_counts[category] = category_counts.get(category, 0) + int(value)
+        category_distribution = {
+            category.to_chinese(): category_counts[category]
+            for category in ErrorCategory
+            if category in category_counts
+        }
+        subtype_distribution = {
+            key: int(value) for key, value in values.get("subtype", {}).items() if value > 0
+        }
+
+        return {
+            "knowledge_points": knowledge_points,
+            "total_practices": total_practices,
+            "correct_count": correct_count,
+            "mistake_count": total_practices - correct_count,
+            "accuracy": correct_count / total_practices if total_practices else 0.0,
+            "due_reviews": due_reviews,
+            "mastered": int(totals.get("mastered", 0)),
+            "struggling": int(totals.get("struggling", 0)),
+            "avg_mastery": round(totals.get("mastery_sum", 0) / knowledge_points, 2)
+            if knowledge_points
+            else 0.0,
+            "categories_count": len(category_counts),
+            "category_distribution": category_distribution,
+            "subtype_distribution": subtype_distribution,
+        }
+
     async def get_statistics(self) -> dict[str, Any]:
         """
         獲取全系統的統計資料。
 
-        此方法執行多個匯總查詢來計算知識點和練習記錄的統計數據。
+        優先讀取由觸發器增量維護的 `stats_snapshot`（讀取成本與知識點數量無關）；
+        尚未執行 scripts/add_stats_snapshot.sql 的資料庫改為單次聚合查詢。
+        到期數量與當前時間有關，無法預先維護，由 `idx_kp_next_review` 索引計算。
 
         Returns:
             一個包含多項統計指標的字典，欄位名已對應前端期望。
         """
-        knowledge_query = """
-            SELECT
-                COUNT(*) FILTER (WHERE is_deleted = FALSE) as knowledge_points,
-                COUNT(*) FILTER (WHERE mastery_level >= 0.8 AND is_deleted = FALSE) as mastered,
-                COUNT(*) FILTER (WHERE mastery_level < 0.3 AND is_deleted = FALSE) as struggling,
-                COUNT(*) FILTER (WHERE next_review <= NOW() AND is_deleted = FALSE) as due_reviews,
-                CAST(AVG(mastery_level) FILTER (WHERE is_deleted = FALSE) AS FLOAT) as avg_mastery,
-                COUNT(DISTINCT category) FILTER (WHERE is_deleted = FALSE) as categories_count
+        async with self.connection() as conn:
+            try:
+                counters = None
+                if KnowledgePointRepository._stats_snapshot_available:
+                    try:
+                        # 計數器分散在多個分片列，讀取時加總
+                        counters = await conn.fetch(
+                            "SELECT dimension, key, SUM(value) AS value "
+                            "FROM stats_snapshot GROUP BY dimension, key"
+                        )
+                    except (asyncpg.UndefinedTableError, asyncpg.UndefinedFunctionError):
+                        KnowledgePointRepository._stats_snapshot_available = False
+                        self.logger.warning(
+                            "缺少 stats_snapshot，統計改用即時聚合；請執行 scripts/add_stats_snapshot.sql"
+                        )
+
+                if not counters:
+                    counters = await conn.fetch(self._AGGREGATE_STATS_QUERY)
+
+                due_reviews = await conn.fetchval(
+                    f"SELECT COUNT(*) FROM knowledge_points WHERE {self._DUE_CONDITION}"
+                )
+                return self._build_statistics(counters, due_reviews)
+            except Exception as e:
+                self._handle_database_error(e, "get_statistics")
+                raise
+
+    # 與資料庫函數 stats_aggregate() 相同的聚合，供尚未遷移的資料庫使用
+    _AGGREGATE_STATS_QUERY = """
+        WITH kp AS (
+            SELECT category, subtype,
+                COUNT(*)::numeric AS n,
+                COUNT(*) FILTER (WHERE mastery_level >= 0.8)::numeric AS mastered,
+                COUNT(*) FILTER (WHERE mastery_level < 0.3)::numeric AS struggling,
+                COALESCE(SUM(mastery_level), 0) AS mastery_sum,
+                GROUPING(category, subtype) AS g
             FROM knowledge_points
-        """
-        practice_query = "SELECT COUNT(*) as total_practices, COUNT(*) FILTER (WHERE is_correct = TRUE) as correct_count FROM review_examples"
+            WHERE is_deleted = FALSE
+            GROUP BY GROUPING SETS ((), (category), (subtype))
+        ),
+        practice AS (
+            SELECT COUNT(*)::numeric AS total,
+                (COUNT(*) FILTER (WHERE is_correct))::numeric AS correct
+            FROM review_examples
+        )
+        SELECT v.dimension, v.key, v.value
+        FROM kp, LATERAL (VALUES
+            ('total', 'knowledge_points', kp.n),
+            ('total', 'mastered', kp.mastered),
+            ('total', 'struggling', kp.struggling),
+            ('total', 'mastery_sum', kp.mastery_sum)
+        ) AS v(dimension, key, value)
+        WHERE kp.g = 3
+        UNION ALL SELECT 'category', kp.category, kp.n FROM kp WHERE kp.g = 1
+        UNION ALL SELECT 'subtype', kp.subtype, kp.n FROM kp WHERE kp.g = 2
+        UNION ALL SELECT 'practice', 'total_practices', practice.total FROM practice
+        UNION ALL SELECT 'practice', 'correct_count', practice.correct FROM practice
+    """
 
+    async def rebuild_stats_snapshot(self) -> None:
+        """以完整聚合重建統計快照，用於修復 TRUNCATE 等不觸發觸發器的操作造成的偏差。"""
         async with self.connection() as conn:
             try:
-                knowledge_row = await conn.fetchrow(knowledge_query)
-                knowledge_stats = dict(knowledge_row) if knowledge_row else {}
-
-                try:
-                    practice_row = await conn.fetchrow(practice_query)
-                    practice_stats = (
-                        dict(practice_row)
-                        if practice_row
-                        else {"total_practices": 0, "correct_count": 0}
-                    )
-                except asyncpg.UndefinedTableError:
-                    self.logger.warning("'review_examples' 表不存在，練習統計將為 0。")
-                    practice_stats = {"total_practices": 0, "correct_count": 0}
-
-                stats = {
-                    "knowledge_points": knowledge_stats.get("knowledge_points", 0),
-                    "total_practices": practice_stats.get("total_practices", 0),
-                    "correct_count": practice_stats.get("correct_count", 0),
-                    "due_reviews": knowledge_stats.get("due_reviews", 0),
-                    "mastered": knowledge_stats.get("mastered", 0),
-                    "struggling": knowledge_stats.get("struggling", 0),
-                    "avg_mastery": round(knowledge_stats.get("avg_mastery") or 0.0, 2),
-                    "categories_count": knowledge_stats.get("categories_count", 0),
-                }
-                return stats
+                await conn.execute("SELECT stats_snapshot_rebuild()")
             except Exception as e:
-                self._handle_database_error(e, "get_statistics")
+                self._handle_database_error(e, "rebuild_stats_snapshot")
                 raise
@@ -0,0 +1,355 @@
+"""
+批改結果快取模組
+
+為 `AIService.grade_translation` 提供基於內容雜湊的結果快取，
+讓重複提交、重試或全班相同的答案不必再次調用 Gemini Pro。
+
+主要功能：
+- **內容定址**：以正規化後的中文原句、學生翻譯、提示、批改模型名稱與提示詞版本
+  計算 SHA-256 作為快取鍵；任一項改變都會自動產生新的鍵。
+- **記憶體層**：LRU + TTL 淘汰的程序內快取，命中時以毫秒級回應。
+- **資料庫層（可選）**：以 `grading_cache` 資料表作為持久化的第二層，
+  跨重啟、跨 worker 共用批改結果。資料表不存在時停用此層；其他資料庫錯誤
+  只暫停一段時間（`PERSIST_RETRY_INTERVAL`）後重試。
+  過期的資料列由背景任務定期刪除（`start` / `stop`）。
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Optional
+
+from core.log_config import get_module_logger
+
+logger = get_module_logger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _is_missing_table(error: Exception) -> bool:
+    """錯誤是否為 `grading_cache` 資料表不存在（尚未執行遷移腳本）。"""
+    try:
+        import asyncpg
+    except ImportError:
+        return False
+    return isinstance(error, asyncpg.UndefinedTableError)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    正規化使用者輸入，讓語意相同的提交得到相同的快取鍵。
+
+    使用 NFKC 統一全形/半形字元，並壓縮空白；不改變大小寫，
+    因為大小寫錯誤本身可能是批改的一部分。
+    """
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def build_grading_cache_key(
+    chinese: str,
+    english: str,
+    model_name: str,
+    prompt_version: str,
+    hint: Optional[str] = None,
+) -> str:
+    """
+    計算批改結果的內容雜湊鍵。
+
+    Args:
+        chinese: 中文原句。
+        english: 學生的英文翻譯。
+        model_name: 批改模型名稱。
+        prompt_version: 批改提示詞版本。
+        hint: 翻譯提示。
+
+    Returns:
+        64 字元的十六進位 SHA-256 字串。
+    """
+    payload = json.dumps(
+        [
+            normalize_text(chinese),
+            normalize_text(english),
+            normalize_text(hint),
+            model_name,
+            prompt_version,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GradingResultCache:
+    """
+    兩層式批改結果快取。
+
+    記憶體層在同步與異步路徑都可使用；資料庫層僅在異步路徑中查詢與寫入。
+    """
+
+    # 資料庫層發生暫時性錯誤後，暫停查詢與寫入的秒數
+    PERSIST_RETRY_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl: int = 7 * 24 * 3600,
+        persist: bool = False,
+        purge_interval: int = 3600,
+    ):
+        """
+        初始化批改快取。
+
+        Args:
+            max_entries: 記憶體層最多保存的條目數量，超過時淘汰最久未使用的條目。
+            ttl: 條目的存活時間（秒），同時套用於記憶體層與資料庫層。
+            persist: 是否啟用 Postgres 持久層。
+            purge_interval: 刪除資料庫層過期條目的間隔（秒），0 表示停用。
+        """
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.RLock()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persist = persist
+        self._persist_retry_at = 0.0
+        self.purge_interval = purge_interval
+        self._purge_task: Optional[asyncio.Task] = None
+        self._stats = {
+            "hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "stores": 0,
+            "db_errors": 0,
+            "purged": 0,
+        }
+
+    # ========== 記憶體層 ==========
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """從記憶體層讀取批改結果，過期或不存在時返回 None。"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+
+            expires_at, result = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats["evictions"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            # 返回副本，避免呼叫端修改結果時污染快取
+            return copy.deepcopy(result)
+
+    def set(self, key: str, result: dict[str, Any]) -> None:
+        """將批改結果寫入記憶體層，必要時淘汰最久未使用的條目。"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> int:
+        """清除記憶體層，返回被清除的條目數量。"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    # ========== 資料庫層 ==========
+
+    def _persist_available(self) -> bool:
+        """持久層是否啟用，且不在錯誤後的暫停期間。"""
+        return self.persist and time.monotonic() >= self._persist_retry_at
+
+    def _persist_failed(self, action: str, error: Exception) -> None:
+        """
+        處理資料庫層錯誤。
+
+        資料表不存在時停用持久層；其他錯誤（連線中斷、逾時等）只暫停
+        `PERSIST_RETRY_INTERVAL` 秒，之後的請求會再次嘗試。
+        """
+        with self._lock:
+            self._stats["db_errors"] += 1
+        if _is_missing_table(error):
+            logger.error(
+                f"批改快取資料表不存在，停用持久層（請執行 scripts/add_grading_cache_table.sql）: {error}"
+            )
+            self.persist = False
+            return
+        self._persist_retry_at = time.monotonic() + self.PERSIST_RETRY_INTERVAL
+        logger.warning(
+            f"{action}失敗，持久層暫停 {self.PERSIST_RETRY_INTERVAL:.0f} 秒後重試: {error}"
+        )
+
+    async def _get_pool(self):
+        """獲取資料庫連線池；無法連線時暫停持久層並返回 None。"""
+        try:
+            from core.database.connection import get_database_connection
+
+            return await get_database_connection().connect()
+        except Exception as e:
+            self._persist_failed("批改快取連線資料庫", e)
+            return None
+
+    async def get_async(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        依序查詢記憶體層與資料庫層。
+
+        資料庫命中時會回填記憶體層，讓後續請求直接命中。
+        """
+        result = self.get(key)
+        if result is not None or not self._persist_available():
+            return result
+
+        pool = await self._get_pool()
+        if pool is None:
+            return None
+
+        try:
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """UPDATE grading_cache SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP
+                       WHERE cache_key = $1 AND created_at > CURRENT_TIMESTAMP - make_interval(secs => $2)
+                       RETURNING result""",
+                    key,
+                    float(self.ttl),
+                )
+        except Exception as e:
+            self._persist_failed("讀取批改快取資料表", e)
+            return None
+
+        if row is None:
+            return None
+
+        result = json.loads(row["result"]) if isinstance(row["result"], str) else row["result"]
+        with self._lock:
+            self._stats["db_hits"] += 1
+            # 資料庫命中不算記憶體層 miss
+            self._stats["misses"] -= 1
+        self.set(key, result)
+        return result
+
+    async def set_async(
+        self, key: str, result: dict[str, Any], model_name: str, prompt_version: str
+    ) -> None:
+        """寫入記憶體層，並在啟用時 upsert 至資料庫層。"""
+        self.set(key, result)
+        if not self._persist_available():
+            return
+
+        pool = await self._get_pool()
+        if pool is None:
+            return
+
+        try:
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    """INSERT INTO grading_cache (cache_key, model_name, prompt_version, result)
+                       VALUES ($1, $2, $3, $4::jsonb)
+                       ON CONFLICT (cache_key) DO UPDATE SET
+                           result = EXCLUDED.result,
+                           created_at = CURRENT_TIMESTAMP""",
+                    key,
+                    model_name,
+                    prompt_version,
+                    json.dumps(result, ensure_ascii=False),
+                )
+        except Exception as e:
+            self._persist_failed("寫入批改快取資料表", e)
+
+    async def purge_expired_async(self) -> int:
+        """刪除資料庫層中已過期的條目，返回刪除數量。"""
+        if not self._persist_available():
+            return 0
+
+        pool = await self._get_pool()
+        if pool is None:
+            return 0
+
+        try:
+            async with pool.acquire() as conn:
+                result = await conn.execute(
+                    "DELETE FROM grading_cache WHERE created_at <= CURRENT_TIMESTAMP - make_interval(secs => $1)",
+                    float(self.ttl),
+                )
+        except Exception as e:
+            self._persist_failed("清理批改快取資料表", e)
+            return 0
+
+        removed = int(result.split()[-1])
+        with self._lock:
+            self._stats["purged"] += removed
+        return removed
+
+    async def start(self) -> None:
+        """啟動定期清理資料庫層過期條目的背景任務；未啟用持久層時不啟動。"""
+        if not self.persist or self.purge_interval <= 0 or self._purge_task is not None:
+            return
+        self._purge_task = asyncio.get_running_loop().create_task(self._purge_loop())
+
+    async def stop(self) -> None:
+        """停止背景清理任務。"""
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            await asyncio.gather(self._purge_task, return_exceptions=True)
+            self._purge_task = None
+
+    async def _purge_loop(self) -> None:
+        while self.persist:
+            removed = await self.purge_expired_async()
+            if removed:
+                logger.info(f"已清理 {removed} 筆過期的批改快取")
+            await asyncio.sleep(self.purge_interval)
+
+    def get_stats(self) -> dict[str, Any]:
+        """獲取快取統計數據。"""
+        with self._lock:
+            total = self._stats["hits"] + self._stats["db_hits"] + self._stats["misses"]
+            hit_rate = (self._stats["hits"] + self._stats["db_hits"]) / total if total else 0
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "persist": self.persist,
+                "hit_rate": round(hit_rate, 4),
+            }
+
+
+def create_grading_cache_from_env() -> Optional[GradingResultCache]:
+    """
+    根據環境變數建立批改快取。
+
+    - `GRADING_CACHE_ENABLED`：是否啟用（預設 true）。
+    - `GRADING_CACHE_MAX_ENTRIES`：記憶體層容量（預設 2048）。
+    - `GRADING_CACHE_TTL`：存活時間秒數（預設 7 天）。
+    - `GRADING_CACHE_PERSIST`：是否啟用 Postgres 持久層（預設 false）。
+    - `GRADING_CACHE_PURGE_INTERVAL`：清理資料庫層過期條目的間隔秒數（預設 3600）。
+
+    Returns:
+        `GradingResultCache` 實例，停用時返回 None。
+    """
+    if os.getenv("GRADING_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    return GradingResultCache(
+        max_entries=int(os.getenv("GRADING_CACHE_MAX_ENTRIES", "2048")),
+        ttl=int(os.getenv("GRADING_CACHE_TTL", str(7 * 24 * 3600))),
+        persist=os.getenv("GRADING_CACHE_PERSIST", "false").lower() == "true",
+        purge_interval=int(os.getenv("GRADING_CACHE_PURGE_INTERVAL", "3600")),
+    )
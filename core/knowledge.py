@@ -14,6 +14,7 @@
 
 import os
 import sys
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any, Optional
 
@@ -22,7 +23,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.cache_manager import CacheCategories, UnifiedCacheManager
 from core.database.connection import get_database_connection
-from core.database.repositories.know_repo import KnowledgePointRepository
+from core.database.repositories.know_repo import KnowledgePointRepository, PageCursor
 from core.error_handler import ErrorHandler, with_error_handling
 from core.error_types import ErrorCategory, ErrorTypeSystem
 from core.exceptions import DatabaseError
@@ -39,7 +40,9 @@ class KnowledgeManager:
         self.logger = get_module_logger(__name__)
         self.settings = settings
         self._error_handler = ErrorHandler(mode="database")
-        self._cache_manager = UnifiedCacheManager(default_ttl=300)  # 5分鐘預設 TTL
+        self._cache_manager = UnifiedCacheManager(
+            default_ttl=300, namespace="knowledge"
+        )  # 5分鐘預設 TTL，失效時同步其他 worker
         self._db_connection = None
         self._repository: Optional[KnowledgePointRepository] = None
         self.type_system = ErrorTypeSystem()
@@ -70,6 +73,20 @@ class KnowledgeManager:
         repo = await self._ensure_repository()
         return await repo.find_all(is_deleted=False)
 
+    async def get_knowledge_points_page(
+        self, limit: int = 100, cursor: Optional[PageCursor] = None
+    ) -> tuple[list[KnowledgePoint], Optional[PageCursor]]:
+        """異步分頁獲取未被刪除的知識點，返回 (結果, 下一頁游標)。"""
+        repo = await self._ensure_repository()
+        return await repo.find_page(limit, cursor, is_deleted=False)
+
+    async def iter_knowledge_points(self, batch_size: int = 500) -> AsyncIterator[KnowledgePoint]:
+        """異步逐筆串流所有未被刪除的知識點。"""
+        repo = await self._ensure_repository()
+        async for batch in repo.iter_all(batch_size, is_deleted=False):
+            for point in batch:
+                yield point
+
     async def get_knowledge_point(self, point_id: str) -> Optional[KnowledgePoint]:
         """根據 ID 異步獲取單個知識點。"""
         try:
@@ -84,21 +101,17 @@ class KnowledgeManager:
         repo = await self._ensure_repository()
         return await repo.find_all(is_deleted=False)
 
-    async def get_due_points(self) -> list[KnowledgePoint]:
-        """異步獲取所有已到期需要複習的知識點。"""
+    async def get_due_points(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> list[KnowledgePoint]:
+        """異步獲取已到期需要複習的知識點（最早到期的在前），過濾與分頁由資料庫完成。"""
         repo = await self._ensure_repository()
-        all_points = await repo.find_all(is_deleted=False)
-        now = datetime.now()
-        due_points = []
-        for p in all_points:
-            if p.next_review:
-                try:
-                    review_date = datetime.fromisoformat(p.next_review).replace(tzinfo=None)
-                    if review_date <= now:
-                        due_points.append(p)
-                except (ValueError, TypeError):
-                    continue
-        return due_points
+        return await repo.find_due(limit=limit, offset=offset)
+
+    async def count_due_points(self) -> int:
+        """異步計算已到期需要複習的知識點數量。"""
+        repo = await self._ensure_repository()
+        return await repo.count_due()
 
     async def add_knowledge_point_from_error(
         self, chinese_sentence: str, user_answer: str, error: dict, correct_answer: str
@@ -220,20 +233,9 @@ class KnowledgeManager:
             return self._get_safe_default_for_operation("get_statistics")
 
     async def _compute_statistics(self) -> dict[str, Any]:
-        """內部方法，從資料庫計算統計資料。"""
-        from core.statistics_utils import UnifiedStatistics
-
+        """內部方法，由資料庫的統計快照（或單次聚合查詢）取得統計資料。"""
         repo = await self._ensure_repository()
-        knowledge_points = await repo.find_all(is_deleted=False)
-        # TODO: 未來應從資料庫獲取獨立的練習記錄
-        practice_records = []
-        stats = UnifiedStatistics.calculate_practice_statistics(
-            knowledge_points=knowledge_points,
-            practice_records=practice_records,
-            include_original_errors=True,
-        )
-        self.logger.debug(f"資料庫統計計算完成: {len(knowledge_points)} 個知識點")
-        return stats
+        return await repo.get_statistics()
 
     def _invalidate_caches(self) -> None:
         """在資料變更後，清除所有相關的快取。"""
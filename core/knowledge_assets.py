@@ -18,10 +18,16 @@
 from __future__ import annotations
 
 import json
+import os
+import random
+import threading
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from core.asset_snapshot import load_example_bank, load_json_asset
+
 # 定義專案和資源目錄的絕對路徑
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 ASSETS_DIR = PROJECT_ROOT / "assets"
@@ -62,7 +68,7 @@ class GrammarRepository:
         if not self.grammar_patterns_file.exists():
             return []
         try:
-            data = json.loads(self.grammar_patterns_file.read_text(encoding="utf-8"))
+            data = load_json_asset(self.grammar_patterns_file)
             return [GrammarPattern(**item) for item in data if isinstance(item, dict)]
         except (json.JSONDecodeError, TypeError) as e:
             # 在實際應用中，應使用 logger 記錄錯誤
@@ -70,16 +76,129 @@ class GrammarRepository:
             return []
 
 
+class ExampleSampler:
+    """預先建立索引的例句取樣器。
+
+    建立時將例句庫展開為 `(長度, 難度) → 例句列表` 的索引，之後每次取樣只需 O(k)。
+    同一分區內採不放回取樣，用完一輪才會重複，讓連續出題時的 few-shot 例句有所變化：
+
+    - `shuffle`：每輪重新洗牌，跨輪時剛取過的例句排在新一輪的最後。
+    - `round_robin`：依例句庫順序輪流取用。
+    """
+
+    STRATEGIES = ("shuffle", "round_robin")
+
+    def __init__(self, bank: dict[str, Any], strategy: str = "shuffle", seed: int | None = None):
+        """
+        初始化取樣器。
+
+        Args:
+            bank: `EXAMPLE_SENTENCE_BANK` 格式的例句庫（長度 → 難度字串 → 例句列表）。
+            strategy: 取樣策略，`shuffle` 或 `round_robin`。
+            seed: 隨機種子（測試或重現用）。
+
+        Raises:
+            ValueError: 不支援的取樣策略。
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"不支援的例句取樣策略: {strategy}")
+        self.strategy = strategy
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self._index: dict[tuple[str, int], list[str]] = {}
+        for length, levels in bank.items():
+            if not isinstance(levels, dict):
+                continue
+            for difficulty, sentences in levels.items():
+                try:
+                    key = (length, int(difficulty))
+                except (TypeError, ValueError):
+                    continue
+                self._index[key] = [s for s in sentences if isinstance(s, str) and s]
+
+        # 每個分區的取樣狀態：[例句索引的排列, 下一個取用位置]
+        self._state: dict[tuple[str, int], list[Any]] = {}
+
+    def examples(self, length: str, difficulty: int) -> list[str]:
+        """返回分區的全部例句（共用列表，呼叫端不應修改）。"""
+        return self._index.get((length, int(difficulty)), [])
+
+    def sample(self, length: str, difficulty: int, k: int = 5) -> list[str]:
+        """
+        從指定分區取出 k 個不重複的例句。
+
+        Args:
+            length: 句子長度 ("short", "medium", "long")。
+            difficulty: 難度等級 (1-5)。
+            k: 取樣數量；不小於分區大小時返回整個分區。
+
+        Returns:
+            例句列表，分區不存在時為空列表。
+        """
+        key = (length, int(difficulty))
+        items = self._index.get(key)
+        if not items or k <= 0:
+            return []
+        size = len(items)
+        k = min(k, size)
+
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                state = self._state[key] = [self._new_order(size, ()), 0]
+            order, cursor = state
+
+            if cursor + k <= size:
+                picked = order[cursor : cursor + k]
+                state[1] = cursor + k
+            else:
+                # 本輪剩餘的先取出，不足的部分從新一輪補上（新一輪把剛取出的排在最後）
+                picked = order[cursor:]
+                order = self._new_order(size, picked)
+                needed = k - len(picked)
+                picked = picked + order[:needed]
+                state[0], state[1] = order, needed
+
+        return [items[i] for i in picked]
+
+    def _new_order(self, size: int, recent: Sequence[int]) -> list[int]:
+        """產生新一輪的取用順序。"""
+        if self.strategy == "round_robin":
+            return list(range(size))
+        recent_set = set(recent)
+        head = [i for i in range(size) if i not in recent_set]
+        tail = list(recent)
+        self._random.shuffle(head)
+        self._random.shuffle(tail)
+        return head + tail
+
+
 class ExampleRepository:
     """分級例句庫的倉儲。
 
     負責從 `core/assets.py` 中的 `EXAMPLE_SENTENCE_BANK` 變數載入例句。
+    例句庫與取樣器在第一次使用時建立並快取。
     """
 
+    def __init__(self, strategy: str | None = None):
+        """
+        初始化倉儲。
+
+        Args:
+            strategy: 例句取樣策略，預設讀取 `EXAMPLE_SAMPLE_STRATEGY`（shuffle）。
+        """
+        self.strategy = strategy or os.getenv("EXAMPLE_SAMPLE_STRATEGY", "shuffle")
+        self._sampler: ExampleSampler | None = None
+        self._sampler_lock = threading.Lock()
+
     def load_bank_from_assets(self) -> dict[str, Any]:
         """動態載入 `EXAMPLE_SENTENCE_BANK`。
-        使用延遲匯入（lazy import）以避免不必要的啟動成本。
+        使用延遲匯入（lazy import）以避免不必要的啟動成本；已建置資源快照時直接從快照讀取。
         """
+        bank = load_example_bank()
+        if bank is not None:
+            return bank if isinstance(bank, dict) else {}
         try:
             from core.assets import EXAMPLE_SENTENCE_BANK
 
@@ -88,6 +207,16 @@ class ExampleRepository:
             print(f"Error importing example bank: {e}")
             return {}
 
+    @property
+    def sampler(self) -> ExampleSampler:
+        """例句取樣器（第一次存取時建立）。"""
+        if self._sampler is None:
+            with self._sampler_lock:
+                # 雙重檢查鎖定模式
+                if self._sampler is None:
+                    self._sampler = ExampleSampler(self.load_bank_from_assets(), self.strategy)
+        return self._sampler
+
     def sample_bank(self, length: str, difficulty: int) -> list[str]:
         """
         根據指定的長度和難度，從例句庫中取樣。
@@ -99,8 +228,11 @@ class ExampleRepository:
         Returns:
             一個包含符合條件的例句的列表。
         """
-        bank = self.load_bank_from_assets()
-        return bank.get(length, {}).get(str(difficulty), [])
+        return self.sampler.examples(length, difficulty)
+
+    def sample_examples(self, length: str, difficulty: int, k: int = 5) -> list[str]:
+        """從指定長度和難度的例句中不放回取樣 k 句，供 AI 出題的 few-shot 範例使用。"""
+        return self.sampler.sample(length, difficulty, k)
 
 
 class KnowledgeAssets:
@@ -147,11 +279,26 @@ class KnowledgeAssets:
         """
         return self.example_repo.sample_bank(length=length, difficulty=difficulty)
 
+    def sample_examples(self, length: str, difficulty: int, k: int = 5) -> list[str]:
+        """
+        取樣指定長度和難度的例句，連續呼叫時輪流使用分區內的不同例句。
+
+        Args:
+            length: 句子長度。
+            difficulty: 難度等級。
+            k: 取樣數量。
+
+        Returns:
+            最多 k 個不重複的例句。
+        """
+        return self.example_repo.sample_examples(length=length, difficulty=difficulty, k=k)
+
 
 # 導出主要的類別，方便其他模組使用
 __all__ = [
     "GrammarPattern",
     "GrammarRepository",
     "ExampleRepository",
+    "ExampleSampler",
     "KnowledgeAssets",
 ]
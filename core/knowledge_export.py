@@ -0,0 +1,121 @@
+"""
+知識點匯出模組
+
+將知識點序列化為 NDJSON 或 CSV，並以固定大小的位元組區塊逐步產出，
+讓匯出端點可以邊讀資料庫邊回應，記憶體用量與資料量無關。
+
+- NDJSON：每行一個完整知識點（含原始錯誤、複習例句與標籤），可直接作為匯入來源。
+- CSV：只包含純量欄位與以分號連接的標籤，方便以試算表開啟。
+"""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import asdict
+from typing import Any
+
+from core.models import KnowledgePoint
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+CSV_COLUMNS = (
+    "id",
+    "key_point",
+    "category",
+    "subtype",
+    "explanation",
+    "original_phrase",
+    "correction",
+    "mastery_level",
+    "mistake_count",
+    "correct_count",
+    "created_at",
+    "last_seen",
+    "next_review",
+    "is_deleted",
+    "tags",
+    "custom_notes",
+)
+
+# 累積到此大小才送出一個區塊，避免逐行寫入造成大量小封包
+CHUNK_BYTES = 64 * 1024
+
+
+def point_to_export_dict(point: KnowledgePoint) -> dict[str, Any]:
+    """將知識點轉換為可 JSON 序列化的字典（ErrorCategory 轉為字串值）。"""
+    item = asdict(point)
+    item["category"] = point.category.value
+    return item
+
+
+async def iter_ndjson(points: AsyncIterable[KnowledgePoint]) -> AsyncIterator[bytes]:
+    """將知識點串流編碼為 NDJSON 位元組區塊。"""
+    buffer = []
+    size = 0
+    async for point in points:
+        line = json.dumps(point_to_export_dict(point), ensure_ascii=False, default=str) + "\n"
+        encoded = line.encode("utf-8")
+        buffer.append(encoded)
+        size += len(encoded)
+        if size >= CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+async def iter_csv(points: AsyncIterable[KnowledgePoint]) -> AsyncIterator[bytes]:
+    """將知識點串流編碼為 CSV 位元組區塊（含 UTF-8 BOM，讓 Excel 正確辨識中文）。"""
+    text = io.StringIO()
+    writer = csv.writer(text)
+    text.write("\ufeff")
+    writer.writerow(CSV_COLUMNS)
+
+    async for point in points:
+        writer.writerow(
+            [
+                point.id,
+                point.key_point,
+                point.category.value,
+                point.subtype,
+                point.explanation,
+                point.original_phrase,
+                point.correction,
+                point.mastery_level,
+                point.mistake_count,
+                point.correct_count,
+                point.created_at,
+                point.last_seen,
+                point.next_review,
+                point.is_deleted,
+                ";".join(point.tags or []),
+                point.custom_notes or "",
+            ]
+        )
+        if text.tell() >= CHUNK_BYTES:
+            yield text.getvalue().encode("utf-8")
+            text.seek(0)
+            text.truncate()
+
+    if text.tell():
+        yield text.getvalue().encode("utf-8")
+
+
+def iter_export(points: AsyncIterable[KnowledgePoint], export_format: str) -> AsyncIterator[bytes]:
+    """
+    依格式選擇編碼器。
+
+    Raises:
+        ValueError: 不支援的匯出格式。
+    """
+    if export_format == "ndjson":
+        return iter_ndjson(points)
+    if export_format == "csv":
+        return iter_csv(points)
+    raise ValueError(f"不支援的匯出格式: {export_format}")
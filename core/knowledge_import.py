@@ -0,0 +1,386 @@
+"""
+知識點匯入模組
+
+將 NDJSON 或 JSON 文件中的知識點批次匯入資料庫，CLI（scripts/import_knowledge.py）
+與 API（POST /api/knowledge/import）共用同一套流程：
+
+1. **串流解析**：NDJSON 逐行讀取，不需要一次載入整個檔案；JSON 文件
+   （`{"data": [...]}` 或陣列）因標準庫沒有增量解析器，會整份載入。
+2. **分塊驗證**：每塊在 Python 端轉換並驗證，格式錯誤的記錄只會被記錄，不會中斷整批。
+3. **COPY + 集合式合併**：每塊在一個交易中以 COPY 寫入暫存表，
+   再以集合式語句合併到 knowledge_points / original_errors / review_examples / tags。
+4. **吞吐量報告**：回報處理、寫入、略過與無效的筆數以及每秒筆數。
+
+匯出模組（`core.knowledge_export`）產生的 NDJSON 可直接作為匯入來源。
+"""
+
+import json
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+
+from core.error_types import ErrorCategory
+from core.log_config import get_module_logger
+from core.models import KnowledgePoint, OriginalError, ReviewExample
+
+if TYPE_CHECKING:
+    from core.database.repositories.know_repo import KnowledgePointRepository
+
+logger = get_module_logger(__name__)
+
+# 報告中最多保留的錯誤明細數量
+MAX_REPORTED_ERRORS = 100
+
+# 與資料表欄位長度一致的限制
+_FIELD_LIMITS = {"key_point": 500, "original_phrase": 200, "correction": 200, "subtype": 50}
+_TAG_MAX_LENGTH = 50
+
+# 原始錯誤與複習例句共有的文字欄位
+_EXAMPLE_TEXT_FIELDS = ("chinese_sentence", "user_answer", "correct_answer")
+
+# 解析器輸出：(記錄位置, 已解析的字典或尚未解析的 JSON 文字)；
+# NDJSON 行以位元組輸出，在驗證階段才解碼，非法 UTF-8 只會讓該行被記為無效
+SourceRecord = tuple[int, Union[dict[str, Any], str, bytes]]
+
+
+@dataclass
+class ImportReport:
+    """匯入結果與吞吐量統計。"""
+
+    total: int = 0
+    imported: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def rate(self) -> float:
+        """每秒處理的記錄數。"""
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def add_error(self, position: int, message: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"record": position, "error": message})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.total,
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "invalid": self.invalid,
+            "chunks": self.chunks,
+            "elapsed": round(self.elapsed, 3),
+            "rate": round(self.rate, 1),
+            "errors": self.errors,
+        }
+
+
+# ========== 記錄轉換與驗證 ==========
+
+
+def _parse_timestamp(value: Any, field_name: str) -> Optional[datetime]:
+    """解析 ISO 8601 時間字串（接受結尾的 Z），沒有時區的時間視為本地時間；空值返回 None。"""
+    if value in (None, ""):
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{field_name} 必須是 ISO 8601 時間字串")
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"{field_name} 時間格式錯誤: {value}") from None
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def _require_text(
+    record: dict[str, Any], name: str, required: bool = True, label: Optional[str] = None
+) -> str:
+    label = label or name
+    value = record.get(name)
+    if value is None or value == "":
+        if required:
+            raise ValueError(f"缺少必要欄位 {label}")
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"{label} 必須是字串")
+    limit = _FIELD_LIMITS.get(name)
+    if limit and len(value) > limit:
+        raise ValueError(f"{label} 超過 {limit} 字元")
+    return value
+
+
+def _require_bool(record: dict[str, Any], name: str, label: Optional[str] = None) -> bool:
+    """讀取布林欄位；必須是 JSON 的 true / false（不接受 "false" 等字串），缺少時為 False。"""
+    value = record.get(name)
+    if value is None:
+        return False
+    if not isinstance(value, bool):
+        raise ValueError(f"{label or name} 必須是 true 或 false")
+    return value
+
+
+def record_to_knowledge_point(record: dict[str, Any]) -> KnowledgePoint:
+    """
+    將匯入記錄轉換為 `KnowledgePoint`，並套用資料表的約束條件。
+
+    記錄中的 `id` 會被忽略，寫入時一律配置新的 ID。
+    若 next_review 早於 last_seen，會依掌握度重新計算（1/3/7 天）。
+
+    Raises:
+        ValueError: 記錄缺少必要欄位或欄位值不合法。
+    """
+    if not isinstance(record, dict):
+        raise ValueError("記錄必須是 JSON 物件")
+
+    now = datetime.now().astimezone()
+    key_point = _require_text(record, "key_point")
+    original_phrase = _require_text(record, "original_phrase")
+    correction = _require_text(record, "correction")
+    subtype = _require_text(record, "subtype", required=False) or "general"
+    explanation = _require_text(record, "explanation", required=False)
+    custom_notes = _require_text(record, "custom_notes", required=False)
+    deleted_reason = _require_text(record, "deleted_reason", required=False)
+    is_deleted = _require_bool(record, "is_deleted")
+
+    try:
+        mastery_level = float(record.get("mastery_level") or 0.0)
+        mistake_count = int(record.get("mistake_count", 1))
+        correct_count = int(record.get("correct_count", 0))
+    except (TypeError, ValueError):
+        raise ValueError("mastery_level、mistake_count、correct_count 必須是數值") from None
+    if not 0.0 <= mastery_level <= 1.0:
+        raise ValueError("mastery_level 必須介於 0 與 1 之間")
+    if mistake_count < 0 or correct_count < 0:
+        raise ValueError("mistake_count 與 correct_count 不可為負數")
+    if mistake_count + correct_count == 0 and mastery_level != 0:
+        raise ValueError("沒有練習記錄的知識點 mastery_level 必須為 0")
+
+    created_at = _parse_timestamp(record.get("created_at"), "created_at") or now
+    last_seen = _parse_timestamp(record.get("last_seen"), "last_seen") or created_at
+    next_review = _parse_timestamp(record.get("next_review"), "next_review")
+    if next_review is not None and next_review < last_seen:
+        days = 1 if mastery_level < 0.3 else 3 if mastery_level < 0.7 else 7
+        next_review = last_seen + timedelta(days=days)
+    last_modified = _parse_timestamp(record.get("last_modified"), "last_modified") or created_at
+    deleted_at = _parse_timestamp(record.get("deleted_at"), "deleted_at")
+
+    error_data = record.get("original_error") or {}
+    if not isinstance(error_data, dict):
+        raise ValueError("original_error 必須是 JSON 物件")
+    error_time = _parse_timestamp(error_data.get("timestamp"), "original_error.timestamp")
+    original_error = OriginalError(
+        **{
+            name: _require_text(error_data, name, required=False, label=f"original_error.{name}")
+            for name in _EXAMPLE_TEXT_FIELDS
+        },
+        timestamp=(error_time or created_at).isoformat(),
+    )
+
+    review_examples = []
+    for example in record.get("review_examples") or []:
+        if not isinstance(example, dict):
+            raise ValueError("review_examples 的每一項都必須是 JSON 物件")
+        example_time = _parse_timestamp(example.get("timestamp"), "review_examples.timestamp")
+        review_examples.append(
+            ReviewExample(
+                **{
+                    name: _require_text(
+                        example, name, required=False, label=f"review_examples.{name}"
+                    )
+                    for name in _EXAMPLE_TEXT_FIELDS
+                },
+                timestamp=(example_time or last_seen).isoformat(),
+                is_correct=_require_bool(example, "is_correct", "review_examples.is_correct"),
+            )
+        )
+
+    tags = record.get("tags") or []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValueError("tags 必須是字串陣列")
+    tags = [tag.strip() for tag in tags if tag and tag.strip()]
+    if any(len(tag) > _TAG_MAX_LENGTH for tag in tags):
+        raise ValueError(f"標籤不可超過 {_TAG_MAX_LENGTH} 字元")
+
+    return KnowledgePoint(
+        id=0,
+        key_point=key_point,
+        category=ErrorCategory.from_string(str(record.get("category") or "")),
+        subtype=subtype,
+        explanation=explanation,
+        original_phrase=original_phrase,
+        correction=correction,
+        original_error=original_error,
+        review_examples=review_examples,
+        mastery_level=mastery_level,
+        mistake_count=mistake_count,
+        correct_count=correct_count,
+        created_at=created_at.isoformat(),
+        last_seen=last_seen.isoformat(),
+        next_review=next_review.isoformat() if next_review else "",
+        is_deleted=is_deleted,
+        deleted_at=deleted_at.isoformat() if deleted_at else "",
+        deleted_reason=deleted_reason,
+        tags=tags,
+        custom_notes=custom_notes,
+        last_modified=last_modified.isoformat(),
+    )
+
+
+# ========== 來源解析 ==========
+
+
+def iter_ndjson_lines(lines: Iterable[Union[str, bytes]]) -> Iterable[SourceRecord]:
+    """逐行讀取 NDJSON（同步來源，例如檔案），略過空行；行號從 1 開始。"""
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line:
+            yield line_number, line
+
+
+async def iter_ndjson_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[SourceRecord]:
+    """從任意切分的位元組區塊（例如 HTTP 請求本文）逐行讀取 NDJSON。"""
+    pending = b""
+    line_number = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            line = line.strip()
+            if line:
+                yield line_number, line
+    if pending.strip():
+        yield line_number + 1, pending.strip()
+
+
+def iter_json_document(document: Union[str, bytes]) -> Iterable[SourceRecord]:
+    """
+    讀取整份 JSON 文件：知識點陣列，或舊版 knowledge.json 的 `{"data": [...]}` 格式。
+
+    Raises:
+        ValueError: 文件不是合法的 JSON 或沒有知識點陣列。
+    """
+    try:
+        data = json.loads(document)
+    except ValueError as e:
+        raise ValueError(f"JSON 文件格式錯誤: {e}") from None
+    if isinstance(data, dict):
+        data = data.get("data")
+    if not isinstance(data, list):
+        raise ValueError("JSON 文件必須是知識點陣列或包含 data 陣列的物件")
+    yield from enumerate(data, start=1)
+
+
+# ========== 匯入流程 ==========
+
+
+class KnowledgeImporter:
+    """
+    分塊匯入知識點。
+
+    每塊獨立提交：單一塊寫入失敗時只影響該塊的記錄，報告中會記錄失敗原因。
+    """
+
+    def __init__(
+        self,
+        repository: "KnowledgePointRepository",
+        chunk_size: int = 1000,
+        skip_existing: bool = True,
+        dry_run: bool = False,
+        on_progress: Optional[Callable[[ImportReport], None]] = None,
+    ):
+        """
+        初始化匯入器。
+
+        Args:
+            repository: 知識點 Repository。
+            chunk_size: 每塊的記錄數量，即每個 COPY 交易的大小。
+            skip_existing: 是否略過資料庫中已存在（未刪除）的 key_point。
+            dry_run: 只驗證，不寫入資料庫。
+            on_progress: 每塊完成後調用，接收目前的報告。
+        """
+        self.repository = repository
+        self.chunk_size = max(1, chunk_size)
+        self.skip_existing = skip_existing
+        self.dry_run = dry_run
+        self.on_progress = on_progress
+
+    async def run(
+        self, records: Union[Iterable[SourceRecord], AsyncIterable[SourceRecord]]
+    ) -> ImportReport:
+        """
+        匯入所有記錄。
+
+        Args:
+            records: 解析器輸出的 (位置, 記錄) 序列，同步或異步皆可。
+
+        Returns:
+            匯入報告。
+        """
+        report = ImportReport()
+        started = time.perf_counter()
+        chunk: list[tuple[int, KnowledgePoint]] = []
+
+        async for position, payload in _aiter(records):
+            report.total += 1
+            try:
+                if isinstance(payload, bytes):
+                    payload = payload.decode("utf-8")
+                if isinstance(payload, str):
+                    payload = json.loads(payload)
+                chunk.append((position, record_to_knowledge_point(payload)))
+            except UnicodeDecodeError:
+                report.add_error(position, "不是合法的 UTF-8 文字")
+            except ValueError as e:
+                report.add_error(position, str(e))
+
+            if len(chunk) >= self.chunk_size:
+                await self._flush(chunk, report, started)
+                chunk = []
+
+        if chunk:
+            await self._flush(chunk, report, started)
+        report.elapsed = time.perf_counter() - started
+        logger.info(
+            f"知識點匯入完成: 共 {report.total} 筆，寫入 {report.imported}，"
+            f"略過 {report.skipped}，無效 {report.invalid}，{report.rate:.0f} 筆/秒"
+        )
+        return report
+
+    async def _flush(
+        self, chunk: list[tuple[int, KnowledgePoint]], report: ImportReport, started: float
+    ) -> None:
+        report.chunks += 1
+        if self.dry_run:
+            report.skipped += len(chunk)
+        else:
+            try:
+                imported, skipped = await self.repository.import_many(
+                    [point for _, point in chunk], skip_existing=self.skip_existing
+                )
+                report.imported += imported
+                report.skipped += skipped
+            except Exception as e:
+                logger.error(f"匯入第 {report.chunks} 塊失敗: {e}")
+                for position, _ in chunk:
+                    report.add_error(position, f"寫入失敗: {e}")
+
+        report.elapsed = time.perf_counter() - started
+        if self.on_progress:
+            self.on_progress(report)
+
+
+async def _aiter(
+    records: Union[Iterable[SourceRecord], AsyncIterable[SourceRecord]],
+) -> AsyncIterator[SourceRecord]:
+    """將同步或異步序列統一為異步迭代。"""
+    if hasattr(records, "__aiter__"):
+        async for item in records:
+            yield item
+    else:
+        for item in records:
+            yield item
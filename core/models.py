@@ -45,6 +45,29 @@ class ReviewExample:
             self.timestamp = datetime.now().isoformat()
 
 
+@dataclass
+class KnowledgePointSummary:
+    """
+    知識點的輕量摘要。
+
+    只包含列表、日曆與學習建議會用到的欄位，不載入 `explanation`、`custom_notes`
+    等長文字欄位與關聯資料，適合一次讀取大量知識點的場景。
+    """
+
+    id: int
+    key_point: str
+    category: ErrorCategory
+    subtype: str
+    original_phrase: str
+    correction: str
+    mastery_level: float = 0.0
+    mistake_count: int = 1
+    correct_count: int = 0
+    last_seen: str = ""
+    next_review: str = ""
+    is_deleted: bool = False
+
+
 @dataclass
 class KnowledgePoint:
     """
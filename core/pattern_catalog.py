@@ -0,0 +1,229 @@
+"""
+文法句型目錄模組
+
+`assets/patterns_enriched_complete.json`（約 500 KB）原本在每個句型相關請求中重新讀檔、
+`json.load`，再以線性掃描篩選。此模組在程序內只載入一次，並預先建立：
+
+- `id → 句型` 字典：詳情頁與指定句型出題直接查表。
+- 分類索引：分類篩選只走訪該分類的句型。
+- 小寫搜尋索引：每個句型的 pattern / formula / explanation / 例句預先合併為一個小寫字串。
+- API 摘要列表：`/api/patterns` 直接返回。
+
+檔案修改時間改變時會在下一次存取時重新載入；載入失敗時保留上一版資料。
+路由與 `TagManager` 共用同一份目錄。
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from core.asset_snapshot import load_json_asset
+from core.log_config import get_module_logger
+
+logger = get_module_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 依序嘗試的資料來源：擴充句型資料，其次為舊版句型資料
+DEFAULT_SOURCES = (
+    PROJECT_ROOT / "assets" / "patterns_enriched_complete.json",
+    PROJECT_ROOT / "data" / "grammar_patterns.json",
+)
+
+# 搜尋索引中欄位之間的分隔字元，避免查詢字串跨欄位匹配
+_FIELD_SEPARATOR = "\x00"
+
+
+class _CatalogSnapshot:
+    """某一版句型資料及其索引；建立後不再修改，讀取端不需要加鎖。"""
+
+    __slots__ = (
+        "source",
+        "mtime",
+        "patterns",
+        "by_id",
+        "by_category",
+        "categories",
+        "search_texts",
+        "summaries",
+    )
+
+    def __init__(self, source: Optional[Path], mtime: float, patterns: list[dict[str, Any]]):
+        self.source = source
+        self.mtime = mtime
+        self.patterns = patterns
+        self.by_id = {p["id"]: p for p in patterns if p.get("id")}
+
+        by_category: dict[str, list[int]] = {}
+        for index, pattern in enumerate(patterns):
+            category = pattern.get("category")
+            if category:
+                by_category.setdefault(category, []).append(index)
+        self.by_category = {category: tuple(indexes) for category, indexes in by_category.items()}
+        self.categories = sorted(by_category)
+
+        self.search_texts = [_search_text(pattern) for pattern in patterns]
+        self.summaries = [
+            {
+                "id": p.get("id"),
+                "pattern": p.get("pattern"),
+                "category": p.get("category", "未分類"),
+                "formula": p.get("formula", ""),
+                "core_concept": p.get("core_concept", ""),
+            }
+            for p in patterns
+            if p.get("id") and p.get("pattern")
+        ]
+
+
+def _search_text(pattern: dict[str, Any]) -> str:
+    """合併句型的可搜尋欄位為單一小寫字串。"""
+    parts = [pattern.get("pattern", ""), pattern.get("formula", ""), pattern.get("explanation", "")]
+    for example in pattern.get("examples", []):
+        parts.append(example.get("zh", ""))
+        parts.append(example.get("en", ""))
+    return _FIELD_SEPARATOR.join(part for part in parts if isinstance(part, str)).lower()
+
+
+def _read_patterns(path: Path) -> list[dict[str, Any]]:
+    """讀取句型檔案，支援 `{"patterns": [...]}`、`{"data": [...]}` 與純陣列格式。"""
+    data = load_json_asset(path)
+    if isinstance(data, dict):
+        data = data.get("patterns", data.get("data", []))
+    return [p for p in data if isinstance(p, dict)]
+
+
+class PatternCatalog:
+    """
+    程序內共用的文法句型目錄。
+
+    每次存取時以 `os.stat` 檢查來源檔案的修改時間，有變更才重新載入並重建索引。
+    """
+
+    def __init__(self, sources: tuple[Path, ...] = DEFAULT_SOURCES):
+        """
+        初始化句型目錄。
+
+        Args:
+            sources: 依序嘗試的句型檔案路徑，使用第一個存在的檔案。
+        """
+        self.sources = tuple(Path(source) for source in sources)
+        self._snapshot = _CatalogSnapshot(None, 0.0, [])
+        self._reload_lock = threading.Lock()
+        self._reloads = 0
+
+    def _current_source(self) -> tuple[Optional[Path], float]:
+        for source in self.sources:
+            try:
+                return source, os.stat(source).st_mtime
+            except OSError:
+                continue
+        return None, 0.0
+
+    def _fresh(self) -> _CatalogSnapshot:
+        """返回最新的快照，來源檔案變更時重新載入。"""
+        snapshot = self._snapshot
+        source, mtime = self._current_source()
+        if source == snapshot.source and mtime == snapshot.mtime:
+            return snapshot
+
+        with self._reload_lock:
+            # 雙重檢查：其他線程可能已完成重新載入
+            snapshot = self._snapshot
+            if source == snapshot.source and mtime == snapshot.mtime:
+                return snapshot
+            try:
+                patterns = _read_patterns(source) if source else []
+            except (OSError, ValueError) as e:
+                logger.error(f"載入文法句型失敗，沿用上一版資料: {source}: {e}")
+                return snapshot
+            self._snapshot = snapshot = _CatalogSnapshot(source, mtime, patterns)
+            self._reloads += 1
+            logger.info(f"已載入 {len(patterns)} 個文法句型: {source}")
+            return snapshot
+
+    # ========== 查詢 ==========
+
+    @property
+    def patterns(self) -> list[dict[str, Any]]:
+        """所有句型（依檔案順序）。"""
+        return self._fresh().patterns
+
+    @property
+    def by_id(self) -> dict[str, dict[str, Any]]:
+        """`id → 句型` 字典。"""
+        return self._fresh().by_id
+
+    @property
+    def categories(self) -> list[str]:
+        """排序後的分類列表。"""
+        return self._fresh().categories
+
+    def get(self, pattern_id: str) -> Optional[dict[str, Any]]:
+        """依 ID 查詢句型。"""
+        return self._fresh().by_id.get(pattern_id)
+
+    def summaries(self) -> list[dict[str, Any]]:
+        """供 API 使用的句型摘要列表。"""
+        return self._fresh().summaries
+
+    def versioned_summaries(self) -> tuple[tuple[Optional[str], float], list[dict[str, Any]]]:
+        """
+        返回句型摘要及其版本 `(來源檔案, 修改時間)`。
+
+        兩者取自同一份快照，供 HTTP 快取驗證使用，避免重新載入期間版本與內容不一致。
+        """
+        snapshot = self._fresh()
+        source = str(snapshot.source) if snapshot.source else None
+        return (source, snapshot.mtime), snapshot.summaries
+
+    def filter(
+        self, category: Optional[str] = None, q: Optional[str] = None
+    ) -> list[dict[str, Any]]:
+        """
+        依分類與關鍵字篩選句型。
+
+        Args:
+            category: 分類名稱，只走訪該分類的句型。
+            q: 關鍵字（不分大小寫），比對 pattern、formula、explanation 與例句。
+
+        Returns:
+            符合條件的句型，順序與檔案相同。
+        """
+        snapshot = self._fresh()
+        if category:
+            indexes = snapshot.by_category.get(category, ())
+        else:
+            indexes = range(len(snapshot.patterns))
+
+        query = q.strip().lower() if q else ""
+        if query:
+            texts = snapshot.search_texts
+            indexes = [i for i in indexes if query in texts[i]]
+        return [snapshot.patterns[i] for i in indexes]
+
+    def get_stats(self) -> dict[str, Any]:
+        """獲取目錄統計數據。"""
+        snapshot = self._snapshot
+        return {
+            "source": str(snapshot.source) if snapshot.source else None,
+            "patterns": len(snapshot.patterns),
+            "categories": len(snapshot.categories),
+            "reloads": self._reloads,
+        }
+
+
+_catalog: Optional[PatternCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_pattern_catalog() -> PatternCatalog:
+    """獲取全域文法句型目錄（線程安全）。"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            # 雙重檢查鎖定模式
+            if _catalog is None:
+                _catalog = PatternCatalog()
+    return _catalog
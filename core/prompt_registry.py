@@ -0,0 +1,223 @@
+"""
+提示詞範本註冊模組
+
+AI 服務的系統提示詞原本是每次呼叫時重新組出的大型 f-string。此模組將提示詞改為具名、
+有版本的範本，註冊時只編譯一次：
+
+- 去除原始碼縮排造成的行首空白，並將範本拆解為靜態片段與欄位，渲染時只需串接。
+- 以內容雜湊產生版本標記（`version_tag`），內容修改後依賴版本的快取（例如批改快取）自動失效。
+- 預估靜態片段的 token 數，並依範本累計每次呼叫的提示詞與回應大小、耗時與失敗次數，
+  作為縮減提示詞的依據。
+
+token 數為估算值：中日韓字元每字約 1 token，其他文字約 4 字元 1 token。
+"""
+
+import hashlib
+import math
+import re
+import textwrap
+import threading
+from string import Formatter
+from typing import Any, Optional
+
+_CJK_PATTERN = re.compile(r"[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+
+def estimate_tokens(text: str) -> int:
+    """估算文字的 token 數。"""
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+class PromptTemplate:
+    """
+    編譯後的提示詞範本（`str.format` 語法，JSON 範例中的大括號需寫成 `{{ }}`）。
+
+    建立後不再修改，可在多線程間共用。
+    """
+
+    __slots__ = ("name", "version", "text", "fields", "fingerprint", "static_tokens", "_parts")
+
+    def __init__(self, name: str, version: str, template: str):
+        """
+        編譯範本。
+
+        Args:
+            name: 範本名稱，亦作為統計的分組鍵。
+            version: 人工維護的版本號。
+            template: 範本內容，行首的共同縮排與前後空白會被移除。
+
+        Raises:
+            ValueError: 範本使用了位置欄位、格式規格或屬性存取等不支援的語法。
+        """
+        self.name = name
+        self.version = version
+        self.text = textwrap.dedent(template).strip()
+
+        parts: list[tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(self.text):
+            if field is not None and (not field.isidentifier() or spec or conversion):
+                raise ValueError(f"提示詞範本 {name} 的欄位語法不支援: {{{field}}}")
+            parts.append((literal, field))
+        self._parts = tuple(parts)
+        self.fields = frozenset(field for _, field in parts if field)
+
+        self.fingerprint = hashlib.sha256(self.text.encode("utf-8")).hexdigest()[:8]
+        self.static_tokens = estimate_tokens("".join(literal for literal, _ in parts))
+
+    @property
+    def version_tag(self) -> str:
+        """版本號加內容雜湊，內容改變時即使忘了遞增版本號也會不同。"""
+        return f"{self.version}.{self.fingerprint}"
+
+    def render(self, **values: Any) -> str:
+        """
+        以欄位值渲染範本。
+
+        Raises:
+            KeyError: 缺少範本需要的欄位。
+        """
+        return "".join(
+            literal + (str(values[field]) if field else "") for literal, field in self._parts
+        )
+
+
+class _PromptUsage:
+    """單一範本的累計使用量。"""
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "prompt_chars",
+        "prompt_tokens",
+        "response_chars",
+        "response_tokens",
+        "duration_ms",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.prompt_chars = 0
+        self.prompt_tokens = 0
+        self.response_chars = 0
+        self.response_tokens = 0
+        self.duration_ms = 0
+
+
+class PromptRegistry:
+    """提示詞範本註冊表與使用量統計（線程安全）。"""
+
+    def __init__(self):
+        self._templates: dict[str, PromptTemplate] = {}
+        self._usage: dict[str, _PromptUsage] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, version: str, template: str) -> PromptTemplate:
+        """註冊（或以新內容取代）範本，返回編譯後的範本。"""
+        compiled = PromptTemplate(name, version, template)
+        with self._lock:
+            self._templates[name] = compiled
+        return compiled
+
+    def get(self, name: str) -> PromptTemplate:
+        """
+        取得範本。
+
+        Raises:
+            KeyError: 範本未註冊。
+        """
+        return self._templates[name]
+
+    def render(self, name: str, **values: Any) -> str:
+        """渲染指定範本。"""
+        return self._templates[name].render(**values)
+
+    def record(
+        self,
+        name: str,
+        prompt: str,
+        response: Optional[str] = None,
+        duration_ms: int = 0,
+        error: bool = False,
+    ) -> None:
+        """
+        記錄一次模型呼叫的提示詞與回應大小。
+
+        Args:
+            name: 範本名稱。
+            prompt: 實際送出的完整提示詞（系統提示詞加使用者提示詞）。
+            response: 模型回應文字，失敗時為 None。
+            duration_ms: 呼叫耗時（毫秒）。
+            error: 呼叫是否失敗。
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        response_tokens = estimate_tokens(response or "")
+        with self._lock:
+            usage = self._usage.get(name)
+            if usage is None:
+                usage = self._usage[name] = _PromptUsage()
+            usage.calls += 1
+            usage.errors += int(error)
+            usage.prompt_chars += len(prompt)
+            usage.prompt_tokens += prompt_tokens
+            usage.response_chars += len(response or "")
+            usage.response_tokens += response_tokens
+            usage.duration_ms += duration_ms
+
+    def get_stats(self) -> dict[str, Any]:
+        """各範本的版本、靜態 token 數與平均提示詞 / 回應大小。"""
+        with self._lock:
+            templates = dict(self._templates)
+            usage = dict(self._usage)
+
+        stats = {}
+        for name in sorted(set(templates) | set(usage)):
+            template = templates.get(name)
+            item: dict[str, Any] = {
+                "version": template.version_tag if template else None,
+                "static_tokens": template.static_tokens if template else None,
+                "fields": sorted(template.fields) if template else [],
+            }
+            record = usage.get(name)
+            if record and record.calls:
+                item.update(
+                    {
+                        "calls": record.calls,
+                        "errors": record.errors,
+                        "avg_prompt_chars": round(record.prompt_chars / record.calls),
+                        "avg_prompt_tokens": round(record.prompt_tokens / record.calls),
+                        "avg_response_tokens": round(
+                            record.response_tokens / max(1, record.calls - record.errors)
+                        ),
+                        "total_prompt_tokens": record.prompt_tokens,
+                        "total_response_tokens": record.response_tokens,
+                        "avg_duration_ms": round(record.duration_ms / record.calls),
+                    }
+                )
+            else:
+                item["calls"] = 0
+            stats[name] = item
+        return stats
+
+    def reset_stats(self) -> None:
+        """清除使用量統計（範本保留）。"""
+        with self._lock:
+            self._usage.clear()
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """獲取全域提示詞註冊表（線程安全）。"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            # 雙重檢查鎖定模式
+            if _registry is None:
+                _registry = PromptRegistry()
+    return _registry
@@ -0,0 +1,236 @@
+"""
+題目池模組
+
+為 `/api/generate-question` 提供預先生成的題目，讓使用者不必等待 LLM 即時出題。
+
+- 每個 (mode, length, level) 組合擁有獨立的題目佇列。
+- 取題時直接從佇列彈出；佇列低於水位線時，由背景任務以既有的生成方法補充。
+- 記錄命中、未命中、補充與失敗次數，供監控使用。
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from core.log_config import get_module_logger
+
+logger = get_module_logger(__name__)
+
+PoolKey = tuple[str, str, int]
+QuestionProducer = Callable[[str, int], Awaitable[dict[str, Any]]]
+
+
+class QuestionPool:
+    """
+    以 (mode, length, level) 分區的預生成題目池。
+
+    題目生成邏輯由外部以 producer 注入，題目池本身只負責儲存、水位管理與背景補充。
+    """
+
+    def __init__(
+        self,
+        capacity: int = 5,
+        low_watermark: int = 2,
+        max_age: int = 3600,
+        refill_concurrency: int = 2,
+    ):
+        """
+        初始化題目池。
+
+        Args:
+            capacity: 每個分區最多保存的題目數量。
+            low_watermark: 分區題目數量低於此值時觸發背景補充。
+            max_age: 題目在池中的最長保存時間（秒），過期題目會被丟棄。
+            refill_concurrency: 每個分區補充時同時進行的生成調用數量。
+        """
+        self.capacity = capacity
+        self.low_watermark = min(low_watermark, capacity)
+        self.max_age = max_age
+        self.refill_concurrency = max(1, refill_concurrency)
+
+        self._producers: dict[str, QuestionProducer] = {}
+        self._queues: dict[PoolKey, deque[tuple[float, dict[str, Any]]]] = {}
+        self._refill_tasks: dict[PoolKey, asyncio.Task] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "refills": 0,
+            "generated": 0,
+            "failures": 0,
+            "expired": 0,
+        }
+
+    def register_producer(self, mode: str, producer: QuestionProducer) -> None:
+        """
+        註冊某個模式的題目生成函數。
+
+        Args:
+            mode: 出題模式（例如 "new"）。
+            producer: 接收 (length, level)、返回題目 payload 的異步函數。
+        """
+        self._producers[mode] = producer
+
+    def supports(self, mode: str) -> bool:
+        """檢查指定模式是否由題目池供題。"""
+        return mode in self._producers
+
+    # ========== 取題 ==========
+
+    def take(self, mode: str, length: str, level: int) -> Optional[dict[str, Any]]:
+        """
+        從題目池取出一道題目，並在需要時觸發背景補充。
+
+        Returns:
+            題目 payload；池中沒有可用題目時返回 None，由呼叫端即時生成。
+        """
+        key = (mode, length, level)
+        queue = self._queues.setdefault(key, deque())
+
+        payload = None
+        now = time.monotonic()
+        while queue:
+            created_at, item = queue.popleft()
+            if now - created_at <= self.max_age:
+                payload = item
+                break
+            self._stats["expired"] += 1
+
+        if payload is None:
+            self._stats["misses"] += 1
+        else:
+            self._stats["hits"] += 1
+
+        if len(queue) < self.low_watermark:
+            self.schedule_refill(mode, length, level)
+
+        return payload
+
+    # ========== 背景補充 ==========
+
+    def schedule_refill(self, mode: str, length: str, level: int) -> None:
+        """在背景補充指定分區；同一分區同時只會有一個補充任務。"""
+        if mode not in self._producers:
+            return
+
+        key = (mode, length, level)
+        task = self._refill_tasks.get(key)
+        if task is not None and not task.done():
+            return
+
+        try:
+            self._refill_tasks[key] = asyncio.get_running_loop().create_task(self._refill(key))
+        except RuntimeError:
+            # 沒有運行中的事件循環（例如同步腳本），略過背景補充
+            logger.debug(f"無事件循環，略過題目池補充: {key}")
+
+    async def _refill(self, key: PoolKey) -> None:
+        """將分區補充至容量上限。"""
+        mode, length, level = key
+        producer = self._producers[mode]
+        queue = self._queues.setdefault(key, deque())
+        self._stats["refills"] += 1
+
+        while len(queue) < self.capacity:
+            batch = min(self.refill_concurrency, self.capacity - len(queue))
+            results = await asyncio.gather(
+                *(producer(length, level) for _ in range(batch)), return_exceptions=True
+            )
+
+            produced = 0
+            for result in results:
+                if isinstance(result, Exception) or not isinstance(result, dict):
+                    self._stats["failures"] += 1
+                    logger.warning(f"題目池生成失敗 {key}: {result}")
+                    continue
+                if result.get("service_error"):
+                    # AI 服務不可用時不放入池中，避免把錯誤結果當成題目
+                    self._stats["failures"] += 1
+                    continue
+                queue.append((time.monotonic(), result))
+                produced += 1
+
+            self._stats["generated"] += produced
+            if produced == 0:
+                # 整批失敗時停止補充，等下一次取題再重試
+                logger.warning(f"題目池補充中止 {key}：本批次沒有成功生成的題目")
+                break
+
+        logger.debug(f"題目池補充完成 {key}: {len(queue)}/{self.capacity}")
+
+    def prewarm(self, keys: list[PoolKey]) -> None:
+        """為指定分區排程背景預熱。"""
+        for mode, length, level in keys:
+            self.schedule_refill(mode, length, level)
+
+    async def shutdown(self) -> None:
+        """取消所有仍在進行的補充任務。"""
+        tasks = [task for task in self._refill_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._refill_tasks.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """獲取題目池統計數據。"""
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / total, 4) if total else 0,
+            "capacity": self.capacity,
+            "low_watermark": self.low_watermark,
+            "pools": {
+                f"{mode}:{length}:{level}": len(queue)
+                for (mode, length, level), queue in self._queues.items()
+            },
+            "refilling": sorted(
+                f"{mode}:{length}:{level}"
+                for (mode, length, level), task in self._refill_tasks.items()
+                if not task.done()
+            ),
+        }
+
+
+def parse_prewarm_keys(spec: str, mode: str = "new") -> list[PoolKey]:
+    """
+    解析預熱設定字串。
+
+    Args:
+        spec: 以逗號分隔的 "length:level" 清單，例如 "short:1,medium:2"。
+        mode: 預熱使用的出題模式。
+
+    Returns:
+        題目池分區鍵列表；格式錯誤的項目會被略過。
+    """
+    keys: list[PoolKey] = []
+    for item in spec.split(","):
+        length, _, level = item.strip().partition(":")
+        if length and level.isdigit():
+            keys.append((mode, length, int(level)))
+        elif item.strip():
+            logger.warning(f"忽略無效的題目池預熱設定: {item}")
+    return keys
+
+
+def create_question_pool_from_env() -> Optional[QuestionPool]:
+    """
+    根據環境變數建立題目池。
+
+    - `QUESTION_POOL_ENABLED`：是否啟用（預設 true）。
+    - `QUESTION_POOL_CAPACITY`：每個分區的容量（預設 5）。
+    - `QUESTION_POOL_LOW_WATERMARK`：觸發補充的水位（預設 2）。
+    - `QUESTION_POOL_MAX_AGE`：題目最長保存秒數（預設 3600）。
+
+    Returns:
+        `QuestionPool` 實例，停用時返回 None。
+    """
+    if os.getenv("QUESTION_POOL_ENABLED", "true").lower() != "true":
+        return None
+    return QuestionPool(
+        capacity=int(os.getenv("QUESTION_POOL_CAPACITY", "5")),
+        low_watermark=int(os.getenv("QUESTION_POOL_LOW_WATERMARK", "2")),
+        max_age=int(os.getenv("QUESTION_POOL_MAX_AGE", "3600")),
+    )
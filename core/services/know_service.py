@@ -3,12 +3,16 @@
 替代 SimplifiedDatabaseAdapter，提供純異步 API
 """
 
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
+from core.batch_queue import ChunkOutcome
 from core.cache_manager import UnifiedCacheManager
 from core.database.database_manager import DatabaseKnowledgeManager, create_database_manager
-from core.models import KnowledgePoint
+from core.database.repositories.know_repo import PageCursor
+from core.knowledge_import import ImportReport, SourceRecord
+from core.models import KnowledgePoint, KnowledgePointSummary
 from core.services.base import BaseAsyncService
 
 
@@ -113,6 +117,80 @@ class KnowService(BaseAsyncService):
         await self.initialize()
         return await self._db_manager.restore_point(point_id)
 
+    # ========== 批次操作 ==========
+
+    async def get_points_by_ids_async(self, point_ids: list[int]) -> list[KnowledgePoint]:
+        """以單一查詢獲取多個知識點"""
+        await self.initialize()
+        return await self._db_manager.get_knowledge_points_by_ids(point_ids)
+
+    async def get_existing_ids_async(self, point_ids: list[int]) -> list[int]:
+        """返回實際存在的知識點 ID"""
+        await self.initialize()
+        return await self._db_manager.get_existing_point_ids(point_ids)
+
+    async def delete_points_async(self, point_ids: list[int], reason: str = "") -> list[int]:
+        """批次刪除知識點，返回實際刪除的 ID"""
+        await self.initialize()
+        return await self._db_manager.delete_points(point_ids, reason)
+
+    async def restore_points_async(self, point_ids: list[int]) -> list[int]:
+        """批次恢復知識點，返回實際恢復的 ID"""
+        await self.initialize()
+        return await self._db_manager.restore_points(point_ids)
+
+    async def update_points_async(self, point_ids: list[int], updates: dict[str, Any]) -> list[int]:
+        """批次更新知識點，返回實際更新的 ID"""
+        await self.initialize()
+        return await self._db_manager.update_points(point_ids, updates)
+
+    async def add_tags_async(self, point_ids: list[int], tags: list[str]) -> list[int]:
+        """批次為知識點添加標籤，返回實際處理的 ID"""
+        await self.initialize()
+        return await self._db_manager.add_tags_to_points(point_ids, tags)
+
+    async def import_points_async(
+        self,
+        records: Union[Iterable[SourceRecord], AsyncIterable[SourceRecord]],
+        chunk_size: int = 1000,
+        skip_existing: bool = True,
+        dry_run: bool = False,
+    ) -> ImportReport:
+        """分塊匯入知識點，返回匯入報告"""
+        await self.initialize()
+        return await self._db_manager.import_knowledge_points(
+            records, chunk_size=chunk_size, skip_existing=skip_existing, dry_run=dry_run
+        )
+
+    async def apply_batch_operation_async(
+        self, operation: str, point_ids: list[int], data: dict[str, Any]
+    ) -> ChunkOutcome:
+        """
+        以集合式語句對一批知識點執行批量操作，供批量任務佇列逐塊調用。
+
+        Args:
+            operation: delete、update、tag、restore 或 export。
+            point_ids: 本分塊的知識點 ID。
+            data: 操作相關數據。
+
+        Returns:
+            分塊結果。
+        """
+        if operation == "delete":
+            done = await self.delete_points_async(point_ids, data.get("reason", ""))
+            return ChunkOutcome(done, "刪除失敗")
+        if operation == "update":
+            return ChunkOutcome(await self.update_points_async(point_ids, data), "更新失敗")
+        if operation == "tag":
+            done = await self.add_tags_async(point_ids, data.get("tags", []))
+            return ChunkOutcome(done, "知識點不存在")
+        if operation == "restore":
+            return ChunkOutcome(await self.restore_points_async(point_ids), "復原失敗")
+        if operation == "export":
+            # 只確認知識點存在；內容由匯出端點依 ID 串流，不寫入任務結果
+            return ChunkOutcome(await self.get_existing_ids_async(point_ids), "知識點不存在")
+        raise ValueError(f"不支持的操作類型: {operation}")
+
     # ========== 查詢操作 ==========
 
     async def get_review_candidates_async(self, max_points: int = 5) -> list[KnowledgePoint]:
@@ -120,16 +198,82 @@ class KnowService(BaseAsyncService):
         await self.initialize()
         return await self._db_manager.get_review_candidates(limit=max_points)
 
+    async def get_due_points_async(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> list[KnowledgePoint]:
+        """獲取已到期的知識點（最早到期的在前）"""
+        await self.initialize()
+        return await self._db_manager.get_due_points(limit=limit, offset=offset)
+
+    async def count_due_points_async(self) -> int:
+        """計算已到期的知識點數量"""
+        await self.initialize()
+        return await self._db_manager.count_due_points()
+
     async def search_knowledge_points_async(self, keyword: str) -> list[KnowledgePoint]:
         """搜尋知識點"""
         await self.initialize()
         return await self._db_manager.search_knowledge_points(keyword)
 
+    async def search_knowledge_points_page_async(
+        self, keyword: str, limit: int = 50, cursor: Optional[tuple[float, int]] = None
+    ) -> tuple[list[KnowledgePoint], Optional[tuple[float, int]]]:
+        """分頁搜尋知識點，返回 (結果, 下一頁游標)"""
+        await self.initialize()
+        return await self._db_manager.search_knowledge_points_page(keyword, limit, cursor)
+
     async def get_active_points_async(self) -> list[KnowledgePoint]:
         """獲取活躍知識點"""
         await self.initialize()
         return await self._db_manager.get_all_knowledge_points(include_deleted=False)
 
+    async def get_point_summaries_async(
+        self, include_deleted: bool = False
+    ) -> list[KnowledgePointSummary]:
+        """獲取知識點摘要（不含說明、筆記等長文字欄位）"""
+        await self.initialize()
+        return await self._db_manager.get_knowledge_point_summaries(include_deleted=include_deleted)
+
+    async def get_points_page_async(
+        self,
+        limit: int = 100,
+        cursor: Optional[PageCursor] = None,
+        view: str = "full",
+        category: Optional[str] = None,
+        mastery: Optional[str] = None,
+    ) -> tuple[Union[list[KnowledgePoint], list[KnowledgePointSummary]], Optional[PageCursor]]:
+        """分頁獲取活躍知識點（依最後練習時間排序），返回 (結果, 下一頁游標)"""
+        await self.initialize()
+        return await self._db_manager.get_knowledge_points_page(
+            limit, cursor, view=view, category=category, mastery=mastery
+        )
+
+    async def iter_points_async(
+        self, batch_size: int = 500, view: str = "full"
+    ) -> AsyncIterator[Union[KnowledgePoint, KnowledgePointSummary]]:
+        """逐筆串流活躍知識點，不一次載入全部資料"""
+        await self.initialize()
+        async for point in self._db_manager.iter_knowledge_points(batch_size, view=view):
+            yield point
+
+    async def iter_point_details_async(
+        self, batch_size: int = 500, include_deleted: bool = False
+    ) -> AsyncIterator[KnowledgePoint]:
+        """逐筆串流含關聯資料的完整知識點，供匯出使用"""
+        await self.initialize()
+        async for point in self._db_manager.iter_knowledge_point_details(
+            batch_size, include_deleted=include_deleted
+        ):
+            yield point
+
+    async def iter_points_by_ids_async(
+        self, point_ids: list[int], batch_size: int = 500
+    ) -> AsyncIterator[KnowledgePoint]:
+        """依 ID 逐筆串流完整知識點，供匯出指定知識點使用"""
+        await self.initialize()
+        async for point in self._db_manager.iter_knowledge_points_by_ids(point_ids, batch_size):
+            yield point
+
     async def get_deleted_points_async(self) -> list[KnowledgePoint]:
         """獲取已刪除知識點"""
         await self.initialize()
@@ -228,6 +372,11 @@ class KnowService(BaseAsyncService):
         await self.initialize()
         return await self._db_manager.update_mastery(point_id, is_correct)
 
+    async def update_mastery_batch_async(self, point_ids: list[int], is_correct: bool) -> list[int]:
+        """以單一語句批次更新多個知識點的掌握度，返回實際更新的 ID"""
+        await self.initialize()
+        return await self._db_manager.update_mastery_batch(point_ids, is_correct)
+
     # ========== 統計操作 ==========
 
     async def get_statistics_async(self) -> dict[str, Any]:
@@ -241,8 +390,8 @@ class KnowService(BaseAsyncService):
 
         stats = await self._db_manager.get_statistics()
         review_candidates = await self._db_manager.get_review_candidates(limit=10)
-        all_points = await self._db_manager.get_all_knowledge_points()
-        struggling_points = [p for p in all_points if p.mastery_level < 0.3]
+        summaries = await self._db_manager.get_knowledge_point_summaries()
+        struggling_points = [p for p in summaries if p.mastery_level < 0.3]
 
         return {
             "statistics": stats,
@@ -341,6 +490,42 @@ class KnowService(BaseAsyncService):
 
         return result.id if result else 0
 
+    async def add_knowledge_points_from_errors(self, items: list[dict[str, Any]]) -> list[int]:
+        """批次從錯誤添加知識點
+
+        Args:
+            items: 每項包含 chinese_sentence、user_answer、error、correct_answer，
+                意義同 `add_knowledge_point_from_error`
+
+        Returns:
+            新知識點 ID 列表（順序與輸入相同）
+        """
+        await self.initialize()
+
+        bulk_items = []
+        for item in items:
+            error = item.get("error", {})
+            user_answer = item.get("user_answer", "")
+            correct_answer = item.get("correct_answer", "")
+            bulk_items.append(
+                {
+                    "error_info": {
+                        "error_pattern": error.get("key_point_summary", "未知錯誤"),
+                        "error_phrase": error.get("original_phrase", user_answer),
+                        "correction": error.get("correction", correct_answer),
+                        "category": error.get("category", "other"),
+                        "subtype": error.get("subtype", "general"),
+                    },
+                    "analysis": {"explanation": error.get("explanation", "")},
+                    "chinese_sentence": item.get("chinese_sentence", ""),
+                    "user_answer": user_answer,
+                    "correct_answer": correct_answer,
+                }
+            )
+
+        created = await self._db_manager.add_knowledge_points_bulk(bulk_items)
+        return [point.id for point in created]
+
     # ========== 複習候選（相容介面）==========
 
     async def get_review_candidates(self, max_points: int = 5) -> list[KnowledgePoint]:
@@ -353,7 +538,7 @@ class KnowService(BaseAsyncService):
         self,
         stats: dict,
         review_candidates: list[KnowledgePoint],
-        struggling_points: list[KnowledgePoint],
+        struggling_points: list[KnowledgePointSummary],
     ) -> str:
         """生成學習建議"""
         recommendations = []
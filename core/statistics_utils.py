@@ -5,13 +5,38 @@
 TASK-19D: 統一統計計算邏輯
 """
 
+import math
+import time
+from array import array
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
 from core.error_types import ErrorCategory
 from core.log_config import get_module_logger
 
+# NumPy 為可選依賴：可用時以 ndarray 做向量化計算，否則退回標準庫 array
+try:
+    import numpy as np
+
+    _numpy_available = True
+except ImportError:
+    np = None
+    _numpy_available = False
+
+# 分類分布的統一順序，亦作為欄式陣列中的分類代碼
+CATEGORY_ORDER = (
+    ErrorCategory.SYSTEMATIC,  # 系統性錯誤
+    ErrorCategory.ISOLATED,  # 單一性錯誤
+    ErrorCategory.ENHANCEMENT,  # 可以更好
+    ErrorCategory.OTHER,  # 其他錯誤
+)
+_CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORY_ORDER)}
+
+# 知識點數量達到此值時，`calculate_practice_statistics` 自動改用欄式計算
+COLUMNAR_MIN_POINTS = 1000
+
 
 @dataclass
 class PracticeRecord:
@@ -25,6 +50,101 @@ class PracticeRecord:
     record_type: str  # 'original_error', 'review_example', 'practice_history'
 
 
+class PointColumns:
+    """
+    知識點統計所需欄位的欄式表示。
+
+    只掃描一次知識點物件，把掌握度、分類代碼、子類型代碼與 next_review epoch
+    存入連續陣列；之後的平均、分布與到期計數都在陣列上完成。
+    提供 `is_due_for_review()` 的物件在建立時即判斷是否到期，結果存為 ±inf。
+    NumPy 可用時為 ndarray，否則為標準庫 `array`。
+    """
+
+    __slots__ = ("mastery", "category_codes", "subtype_codes", "subtypes", "next_review")
+
+    def __init__(self, mastery, category_codes, subtype_codes, subtypes: list[str], next_review):
+        self.mastery = mastery
+        self.category_codes = category_codes
+        self.subtype_codes = subtype_codes
+        self.subtypes = subtypes
+        self.next_review = next_review
+
+    def __len__(self) -> int:
+        return len(self.mastery)
+
+    @property
+    def uses_numpy(self) -> bool:
+        return _numpy_available and isinstance(self.mastery, np.ndarray)
+
+    @classmethod
+    def from_points(
+        cls, knowledge_points: list, use_numpy: Optional[bool] = None
+    ) -> "PointColumns":
+        """
+        從知識點物件建立欄式陣列，已軟刪除的知識點會被略過。
+
+        Args:
+            knowledge_points: 知識點列表（`KnowledgePoint` 或 `KnowledgePointSummary`）。
+            use_numpy: 是否轉為 NumPy 陣列，None 表示可用時使用。
+        """
+        mastery = array("d")
+        category_codes = array("b")
+        subtype_codes = array("l")
+        next_review = array("d")
+        subtype_index: dict[str, int] = {}
+
+        # 迴圈內綁定區域變數，減少每筆的屬性查找
+        add_mastery = mastery.append
+        add_category = category_codes.append
+        add_subtype = subtype_codes.append
+        add_review = next_review.append
+        category_code = _CATEGORY_CODES.get
+        parse = datetime.fromisoformat
+        other = ErrorCategory.OTHER
+        nan = math.nan
+        inf = math.inf
+
+        for point in knowledge_points:
+            if getattr(point, "is_deleted", False):
+                continue
+            add_mastery(float(getattr(point, "mastery_level", 0.0)))
+            add_category(category_code(getattr(point, "category", other), -1))
+            subtype = getattr(point, "subtype", "unknown")
+            code = subtype_index.get(subtype)
+            if code is None:
+                code = subtype_index[subtype] = len(subtype_index)
+            add_subtype(code)
+
+            # 與 `calculate_point_statistics` 相同：有 is_due_for_review() 時以其結果為準，
+            # 在建立陣列時求值並記為 -inf（到期）或 +inf（未到期）
+            is_due = getattr(point, "is_due_for_review", None)
+            if callable(is_due):
+                add_review(-inf if is_due() else inf)
+                continue
+
+            # naive 時間由 timestamp() 視為本地時間，等同迴圈版本與 datetime.now() 比較
+            value = getattr(point, "next_review", None)
+            try:
+                if isinstance(value, str):
+                    value = parse(value.replace("Z", "+00:00"))
+                add_review(value.timestamp())
+            except Exception:
+                add_review(nan)
+
+        if use_numpy is None:
+            use_numpy = _numpy_available
+        if use_numpy and _numpy_available:
+            # frombuffer 直接共用 array 的記憶體，不另外複製
+            mastery = np.frombuffer(mastery, dtype=np.float64)
+            category_codes = np.frombuffer(category_codes, dtype=np.int8)
+            subtype_codes = np.frombuffer(
+                subtype_codes, dtype=np.dtype(f"i{subtype_codes.itemsize}")
+            )
+            next_review = np.frombuffer(next_review, dtype=np.float64)
+
+        return cls(mastery, category_codes, subtype_codes, list(subtype_index), next_review)
+
+
 class UnifiedStatistics:
     """統一的統計計算邏輯
 
@@ -40,6 +160,7 @@ class UnifiedStatistics:
         knowledge_points: list,
         practice_records: list[PracticeRecord],
         include_original_errors: bool = True,
+        columnar: Optional[bool] = None,
     ) -> dict[str, Any]:
         """統一計算練習統計數據
 
@@ -50,9 +171,11 @@ class UnifiedStatistics:
         4. 平均掌握度 = 所有知識點掌握度的平均值
 
         Args:
-            knowledge_points: 知識點列表
+            knowledge_points: 知識點列表，或預先建立的 `PointColumns`
             practice_records: 統一格式的練習記錄列表
             include_original_errors: 是否包含原始錯誤在練習統計中
+            columnar: 是否使用欄式陣列計算知識點統計；None 表示知識點數量達到
+                `COLUMNAR_MIN_POINTS` 或傳入 `PointColumns` 時自動使用
 
         Returns:
             統計結果字典
@@ -65,6 +188,43 @@ class UnifiedStatistics:
         mistake_count = total_practices - correct_count
 
         # 知識點統計
+        if isinstance(knowledge_points, PointColumns):
+            columnar = True
+        elif columnar is None:
+            columnar = len(knowledge_points) >= COLUMNAR_MIN_POINTS
+        if columnar:
+            columns = (
+                knowledge_points
+                if isinstance(knowledge_points, PointColumns)
+                else PointColumns.from_points(knowledge_points)
+            )
+            point_stats = UnifiedStatistics.calculate_point_statistics_columnar(columns)
+        else:
+            point_stats = UnifiedStatistics.calculate_point_statistics(knowledge_points)
+
+        # 準確率計算
+        accuracy = correct_count / total_practices if total_practices > 0 else 0.0
+
+        logger.debug(
+            f"統計計算完成: 練習{total_practices}, 正確{correct_count}, "
+            f"知識點{point_stats['knowledge_points']}"
+        )
+
+        return {
+            "total_practices": total_practices,
+            "correct_count": correct_count,
+            "mistake_count": mistake_count,
+            "accuracy": accuracy,
+            "knowledge_points": point_stats["knowledge_points"],
+            "avg_mastery": point_stats["avg_mastery"],
+            "category_distribution": point_stats["category_distribution"],
+            "subtype_distribution": point_stats["subtype_distribution"],
+            "due_reviews": point_stats["due_reviews"],
+        }
+
+    @staticmethod
+    def calculate_point_statistics(knowledge_points: list) -> dict[str, Any]:
+        """逐一走訪知識點物件，計算數量、平均掌握度、分類/子類型分布與待複習數量。"""
         active_points = [
             point for point in knowledge_points if not getattr(point, "is_deleted", False)
         ]
@@ -78,12 +238,7 @@ class UnifiedStatistics:
             avg_mastery = 0.0
 
         # 分類分布統計（使用統一順序）
-        category_stats = {
-            ErrorCategory.SYSTEMATIC: 0,
-            ErrorCategory.ISOLATED: 0,
-            ErrorCategory.ENHANCEMENT: 0,
-            ErrorCategory.OTHER: 0,
-        }
+        category_stats = dict.fromkeys(CATEGORY_ORDER, 0)
 
         for point in active_points:
             category = getattr(point, "category", ErrorCategory.OTHER)
@@ -92,14 +247,7 @@ class UnifiedStatistics:
 
         # 轉換為中文並按統一順序排列
         category_distribution = {}
-        category_order = [
-            ErrorCategory.SYSTEMATIC,  # 系統性錯誤
-            ErrorCategory.ISOLATED,  # 單一性錯誤
-            ErrorCategory.ENHANCEMENT,  # 可以更好
-            ErrorCategory.OTHER,  # 其他錯誤
-        ]
-
-        for category in category_order:
+        for category in CATEGORY_ORDER:
             count = category_stats[category]
             if count > 0:
                 category_distribution[category.to_chinese()] = count
@@ -130,18 +278,7 @@ class UnifiedStatistics:
                 except Exception:
                     pass
 
-        # 準確率計算
-        accuracy = correct_count / total_practices if total_practices > 0 else 0.0
-
-        logger.debug(
-            f"統計計算完成: 練習{total_practices}, 正確{correct_count}, 知識點{total_knowledge_points}"
-        )
-
         return {
-            "total_practices": total_practices,
-            "correct_count": correct_count,
-            "mistake_count": mistake_count,
-            "accuracy": accuracy,
             "knowledge_points": total_knowledge_points,
             "avg_mastery": round(avg_mastery, 6),
             "category_distribution": category_distribution,
@@ -149,6 +286,49 @@ class UnifiedStatistics:
             "due_reviews": due_reviews,
         }
 
+    @staticmethod
+    def calculate_point_statistics_columnar(
+        columns: PointColumns, now: Optional[float] = None
+    ) -> dict[str, Any]:
+        """
+        在欄式陣列上計算與 `calculate_point_statistics` 相同的結果。
+
+        Args:
+            columns: `PointColumns.from_points` 建立的欄式陣列。
+            now: 判斷到期的 epoch 秒數，預設為當前時間。
+        """
+        now = time.time() if now is None else now
+        total = len(columns)
+        category_count = len(CATEGORY_ORDER)
+
+        if columns.uses_numpy:
+            avg_mastery = float(columns.mastery.mean()) if total else 0.0
+            codes = columns.category_codes
+            category_counts = np.bincount(codes[codes >= 0], minlength=category_count).tolist()
+            subtype_counts = np.bincount(
+                columns.subtype_codes, minlength=len(columns.subtypes)
+            ).tolist()
+            # NaN（無法解析的時間）與任何值比較皆為 False
+            due_reviews = int(np.count_nonzero(columns.next_review <= now))
+        else:
+            avg_mastery = math.fsum(columns.mastery) / total if total else 0.0
+            category_counts = [columns.category_codes.count(code) for code in range(category_count)]
+            counter = Counter(columns.subtype_codes)
+            subtype_counts = [counter[code] for code in range(len(columns.subtypes))]
+            due_reviews = sum(1 for epoch in columns.next_review if epoch <= now)
+
+        return {
+            "knowledge_points": total,
+            "avg_mastery": round(avg_mastery, 6),
+            "category_distribution": {
+                category.to_chinese(): count
+                for category, count in zip(CATEGORY_ORDER, category_counts)
+                if count > 0
+            },
+            "subtype_distribution": dict(zip(columns.subtypes, subtype_counts)),
+            "due_reviews": due_reviews,
+        }
+
     @staticmethod
     def extract_json_practice_records(knowledge_manager) -> list[PracticeRecord]:
         """從 JSON 模式的 KnowledgeManager 提取統一格式的練習記錄
@@ -3,7 +3,6 @@
 處理文法句型標籤的管理和題目生成
 """
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -11,6 +10,7 @@ from pathlib import Path
 from typing import Any, Optional
 
 from core.log_config import get_module_logger
+from core.pattern_catalog import get_pattern_catalog
 
 logger = get_module_logger(__name__)
 
@@ -128,13 +128,8 @@ class TagManager:
         self._initialize_grammar_tags()
 
     def _load_patterns_data(self) -> dict:
-        """載入文法句型資料"""
-        patterns_file = ASSETS_DIR / "patterns_enriched_complete.json"
-        if patterns_file.exists():
-            with open(patterns_file, encoding="utf-8") as f:
-                data = json.load(f)
-                return {p["id"]: p for p in data.get("patterns", [])}
-        return {}
+        """載入文法句型資料（與句型路由共用程序內的句型目錄）"""
+        return get_pattern_catalog().by_id
 
     def _initialize_grammar_tags(self):
         """初始化文法句型標籤"""
@@ -0,0 +1,42 @@
+-- 批量任務佇列 - 資料庫遷移腳本
+-- 創建 batch_jobs 表，讓知識點批量操作跨重啟、跨 worker 保存進度並支援取消
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    operation VARCHAR(20) NOT NULL,
+    ids INTEGER[] NOT NULL,
+    data JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processing', 'completed', 'failed', 'cancelled')),
+    total INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0, -- 檢查點：已處理的 ID 數量
+    progress INTEGER NOT NULL DEFAULT 0,
+    errors JSONB NOT NULL DEFAULT '[]'::jsonb,
+    result JSONB,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    worker_id VARCHAR(64), -- 持有租約的工作者
+    attempts INTEGER NOT NULL DEFAULT 0,
+    heartbeat_at TIMESTAMP WITH TIME ZONE, -- 最後一次檢查點時間，用於判斷租約逾期
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+-- 工作者依建立時間領取待處理與租約逾期的任務
+CREATE INDEX IF NOT EXISTS idx_batch_jobs_claim ON batch_jobs(created_at)
+    WHERE status IN ('pending', 'processing');
+-- 保留期限清理依 finished_at 掃描
+CREATE INDEX IF NOT EXISTS idx_batch_jobs_finished ON batch_jobs(finished_at)
+    WHERE finished_at IS NOT NULL;
+
+COMMENT ON TABLE batch_jobs IS '批量任務佇列：知識點批量操作的狀態、進度檢查點與取消請求';
+
+COMMIT;
+
+-- 驗證創建結果
+\echo '=== 批量任務佇列遷移完成 ==='
+SELECT table_name, table_type
+FROM information_schema.tables
+WHERE table_name = 'batch_jobs';
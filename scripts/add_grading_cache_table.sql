@@ -0,0 +1,27 @@
+-- 批改結果快取 - 資料庫遷移腳本
+-- 創建 grading_cache 表，供 GRADING_CACHE_PERSIST=true 時跨重啟、跨 worker 共用批改結果
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS grading_cache (
+    cache_key CHAR(64) PRIMARY KEY, -- SHA-256(正規化原句 + 翻譯 + 提示 + 模型 + 提示詞版本)
+    model_name VARCHAR(100) NOT NULL,
+    prompt_version VARCHAR(20) NOT NULL,
+    result JSONB NOT NULL,
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    last_hit_at TIMESTAMP WITH TIME ZONE
+);
+
+-- 過期清理依 created_at 掃描
+CREATE INDEX IF NOT EXISTS idx_grading_cache_created ON grading_cache(created_at);
+
+COMMENT ON TABLE grading_cache IS '批改結果快取：相同內容的提交重用先前的批改結果';
+
+COMMIT;
+
+-- 驗證創建結果
+\echo '=== 批改結果快取遷移完成 ==='
+SELECT table_name, table_type
+FROM information_schema.tables
+WHERE table_name = 'grading_cache';
@@ -0,0 +1,23 @@
+-- 知識點列表分頁索引 - 資料庫遷移腳本
+-- 供 KnowledgePointRepository.find_page / iter_all 以 (last_seen, id) keyset 分頁使用
+
+BEGIN;
+
+-- 1. keyset 游標不處理 NULL，補齊缺少 last_seen 的舊資料
+UPDATE knowledge_points SET last_seen = COALESCE(created_at, CURRENT_TIMESTAMP)
+WHERE last_seen IS NULL;
+
+ALTER TABLE knowledge_points ALTER COLUMN last_seen SET NOT NULL;
+
+-- 2. 與列表排序一致的複合索引，只索引未刪除的知識點
+CREATE INDEX IF NOT EXISTS idx_kp_last_seen_id
+    ON knowledge_points (last_seen DESC, id DESC) WHERE is_deleted = FALSE;
+
+COMMIT;
+
+ANALYZE knowledge_points;
+
+-- 驗證創建結果
+\echo '=== 知識點列表分頁索引遷移完成 ==='
+SELECT indexname FROM pg_indexes
+WHERE tablename = 'knowledge_points' AND indexname = 'idx_kp_last_seen_id';
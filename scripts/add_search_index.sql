@@ -0,0 +1,37 @@
+-- 知識點搜尋索引 - 資料庫遷移腳本
+-- 為 knowledge_points 新增自動產生的搜尋欄位與索引，
+-- 供 KnowledgePointRepository.search / search_page 使用 tsvector + trigram 排序搜尋
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+
+-- 1. 合併四個搜尋欄位的純文字（trigram 子字串匹配，支援中文）
+ALTER TABLE knowledge_points
+    ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS (
+        key_point || ' ' || original_phrase || ' ' || correction || ' ' || explanation
+    ) STORED;
+
+-- 2. 加權的全文檢索向量（key_point 權重最高）
+ALTER TABLE knowledge_points
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', key_point), 'A') ||
+        setweight(to_tsvector('simple', original_phrase), 'B') ||
+        setweight(to_tsvector('simple', correction), 'B') ||
+        setweight(to_tsvector('simple', explanation), 'C')
+    ) STORED;
+
+-- 3. 只索引未刪除的知識點
+CREATE INDEX IF NOT EXISTS idx_kp_search_vector
+    ON knowledge_points USING gin (search_vector) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_kp_search_text_trgm
+    ON knowledge_points USING gin (search_text gin_trgm_ops) WHERE is_deleted = FALSE;
+
+COMMIT;
+
+ANALYZE knowledge_points;
+
+-- 驗證創建結果
+\echo '=== 知識點搜尋索引遷移完成 ==='
+SELECT indexname FROM pg_indexes
+WHERE tablename = 'knowledge_points' AND indexname LIKE 'idx_kp_search%';
@@ -0,0 +1,208 @@
+-- 統計快照 - 資料庫遷移腳本
+-- 建立 stats_snapshot 計數器表、統一的聚合函數 stats_aggregate() 與增量維護的觸發器，
+-- 供 KnowledgePointRepository.get_statistics 以 O(1) 讀取儀表板統計
+
+BEGIN;
+
+-- 1. 快照表與函數
+-- 統計快照表：以 (維度, 鍵) 保存計數器，由觸發器隨寫入增量維護，讀取統計時不需掃描知識點。
+-- 每個計數器分散為最多 16 個分片列（依寫入連線的後端 PID），讀取時加總；
+-- 並發的複習寫入因此不會全部排隊等待同一個 total 列的鎖
+CREATE TABLE IF NOT EXISTS stats_snapshot (
+    dimension VARCHAR(20) NOT NULL, -- total / category / subtype / practice
+    key VARCHAR(100) NOT NULL,
+    shard SMALLINT NOT NULL DEFAULT 0,
+    value NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (dimension, key, shard)
+);
+
+-- 升級舊版（未分片）的快照表：既有的值保留在分片 0
+ALTER TABLE stats_snapshot ADD COLUMN IF NOT EXISTS shard SMALLINT NOT NULL DEFAULT 0;
+ALTER TABLE stats_snapshot DROP CONSTRAINT IF EXISTS stats_snapshot_pkey;
+ALTER TABLE stats_snapshot ADD PRIMARY KEY (dimension, key, shard);
+
+-- 統一的統計聚合：單次掃描 knowledge_points（GROUPING SETS）與 review_examples，
+-- 輸出與 stats_snapshot 相同形狀的 (dimension, key, value)
+CREATE OR REPLACE FUNCTION stats_aggregate()
+RETURNS TABLE (dimension VARCHAR, key VARCHAR, value NUMERIC) AS $$
+    WITH kp AS (
+        SELECT
+            category,
+            subtype,
+            COUNT(*)::numeric AS n,
+            COUNT(*) FILTER (WHERE mastery_level >= 0.8)::numeric AS mastered,
+            COUNT(*) FILTER (WHERE mastery_level < 0.3)::numeric AS struggling,
+            COALESCE(SUM(mastery_level), 0) AS mastery_sum,
+            GROUPING(category, subtype) AS g
+        FROM knowledge_points
+        WHERE is_deleted = FALSE
+        GROUP BY GROUPING SETS ((), (category), (subtype))
+    )
+    SELECT v.dimension::varchar, v.key::varchar, v.value
+    FROM kp, LATERAL (VALUES
+        ('total', 'knowledge_points', kp.n),
+        ('total', 'mastered', kp.mastered),
+        ('total', 'struggling', kp.struggling),
+        ('total', 'mastery_sum', kp.mastery_sum)
+    ) AS v(dimension, key, value)
+    WHERE kp.g = 3
+    UNION ALL
+    SELECT 'category', kp.category, kp.n FROM kp WHERE kp.g = 1
+    UNION ALL
+    SELECT 'subtype', kp.subtype, kp.n FROM kp WHERE kp.g = 2
+    UNION ALL
+    SELECT 'practice', 'total_practices', COUNT(*)::numeric FROM review_examples
+    UNION ALL
+    SELECT 'practice', 'correct_count', (COUNT(*) FILTER (WHERE is_correct))::numeric FROM review_examples
+$$ LANGUAGE sql STABLE;
+
+-- 以聚合結果重建快照（初始化、或 TRUNCATE 等不觸發觸發器的操作之後執行）
+CREATE OR REPLACE FUNCTION stats_snapshot_rebuild()
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE stats_snapshot IN EXCLUSIVE MODE;
+    DELETE FROM stats_snapshot;
+    INSERT INTO stats_snapshot (dimension, key, value)
+    SELECT a.dimension, a.key, a.value FROM stats_aggregate() a;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 觸發器寫入的分片：同一連線固定寫入同一組列，不同連線大多寫入不同的列
+CREATE OR REPLACE FUNCTION stats_snapshot_shard()
+RETURNS SMALLINT AS $$
+    SELECT (pg_backend_pid() % 16)::smallint
+$$ LANGUAGE sql STABLE;
+
+-- 單一知識點對各計數器的貢獻
+CREATE OR REPLACE FUNCTION stats_snapshot_contrib(
+    p_category VARCHAR, p_subtype VARCHAR, p_mastery NUMERIC, p_sign INTEGER
+)
+RETURNS TABLE (dimension VARCHAR, key VARCHAR, value NUMERIC) AS $$
+    SELECT v.dimension::varchar, v.key::varchar, v.value::numeric FROM (VALUES
+        ('total', 'knowledge_points', p_sign),
+        ('total', 'mastered', CASE WHEN p_mastery >= 0.8 THEN p_sign ELSE 0 END),
+        ('total', 'struggling', CASE WHEN p_mastery < 0.3 THEN p_sign ELSE 0 END),
+        ('total', 'mastery_sum', p_sign * p_mastery),
+        ('category', p_category, p_sign),
+        ('subtype', p_subtype, p_sign)
+    ) AS v(dimension, key, value)
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 語句層級觸發器：以轉換表彙總整批變更，COPY 大量匯入時每個語句只更新一次快照。
+-- 依 (dimension, key) 排序後寫入，並發的批次寫入以相同順序鎖定計數器列，避免死結
+CREATE OR REPLACE FUNCTION stats_snapshot_kp_sync()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO stats_snapshot AS s (dimension, key, shard, value)
+        SELECT c.dimension, c.key, stats_snapshot_shard(), SUM(c.value)
+        FROM new_rows r,
+             LATERAL stats_snapshot_contrib(r.category, r.subtype, r.mastery_level, 1) c
+        WHERE r.is_deleted = FALSE
+        GROUP BY c.dimension, c.key
+        ORDER BY c.dimension, c.key
+        ON CONFLICT (dimension, key, shard) DO UPDATE
+            SET value = s.value + EXCLUDED.value, updated_at = CURRENT_TIMESTAMP;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- 只更新 last_seen 等無關欄位時，正負貢獻相互抵消，不會寫入快照
+        INSERT INTO stats_snapshot AS s (dimension, key, shard, value)
+        SELECT c.dimension, c.key, stats_snapshot_shard(), SUM(c.value)
+        FROM (
+            SELECT category, subtype, mastery_level, 1 AS sign FROM new_rows WHERE is_deleted = FALSE
+            UNION ALL
+            SELECT category, subtype, mastery_level, -1 FROM old_rows WHERE is_deleted = FALSE
+        ) r,
+             LATERAL stats_snapshot_contrib(r.category, r.subtype, r.mastery_level, r.sign) c
+        GROUP BY c.dimension, c.key
+        HAVING SUM(c.value) <> 0
+        ORDER BY c.dimension, c.key
+        ON CONFLICT (dimension, key, shard) DO UPDATE
+            SET value = s.value + EXCLUDED.value, updated_at = CURRENT_TIMESTAMP;
+    ELSE
+        INSERT INTO stats_snapshot AS s (dimension, key, shard, value)
+        SELECT c.dimension, c.key, stats_snapshot_shard(), SUM(c.value)
+        FROM old_rows r,
+             LATERAL stats_snapshot_contrib(r.category, r.subtype, r.mastery_level, -1) c
+        WHERE r.is_deleted = FALSE
+        GROUP BY c.dimension, c.key
+        ORDER BY c.dimension, c.key
+        ON CONFLICT (dimension, key, shard) DO UPDATE
+            SET value = s.value + EXCLUDED.value, updated_at = CURRENT_TIMESTAMP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION stats_snapshot_re_sync()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO stats_snapshot AS s (dimension, key, shard, value)
+        SELECT 'practice', v.key, stats_snapshot_shard(), v.value
+        FROM (SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE is_correct) AS correct FROM new_rows) t,
+             LATERAL (VALUES ('total_practices', t.total), ('correct_count', t.correct)) AS v(key, value)
+        ORDER BY v.key
+        ON CONFLICT (dimension, key, shard) DO UPDATE
+            SET value = s.value + EXCLUDED.value, updated_at = CURRENT_TIMESTAMP;
+    ELSE
+        INSERT INTO stats_snapshot AS s (dimension, key, shard, value)
+        SELECT 'practice', v.key, stats_snapshot_shard(), -v.value
+        FROM (SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE is_correct) AS correct FROM old_rows) t,
+             LATERAL (VALUES ('total_practices', t.total), ('correct_count', t.correct)) AS v(key, value)
+        ORDER BY v.key
+        ON CONFLICT (dimension, key, shard) DO UPDATE
+            SET value = s.value + EXCLUDED.value, updated_at = CURRENT_TIMESTAMP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 2. 語句層級觸發器（可重複執行）
+DROP TRIGGER IF EXISTS stats_snapshot_kp_insert ON knowledge_points;
+DROP TRIGGER IF EXISTS stats_snapshot_kp_update ON knowledge_points;
+DROP TRIGGER IF EXISTS stats_snapshot_kp_delete ON knowledge_points;
+DROP TRIGGER IF EXISTS stats_snapshot_re_insert ON review_examples;
+DROP TRIGGER IF EXISTS stats_snapshot_re_delete ON review_examples;
+
+CREATE TRIGGER stats_snapshot_kp_insert
+AFTER INSERT ON knowledge_points
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION stats_snapshot_kp_sync();
+
+CREATE TRIGGER stats_snapshot_kp_update
+AFTER UPDATE ON knowledge_points
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION stats_snapshot_kp_sync();
+
+CREATE TRIGGER stats_snapshot_kp_delete
+AFTER DELETE ON knowledge_points
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION stats_snapshot_kp_sync();
+
+CREATE TRIGGER stats_snapshot_re_insert
+AFTER INSERT ON review_examples
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION stats_snapshot_re_sync();
+
+CREATE TRIGGER stats_snapshot_re_delete
+AFTER DELETE ON review_examples
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION stats_snapshot_re_sync();
+
+-- 3. 以現有資料初始化快照
+SELECT stats_snapshot_rebuild();
+
+COMMIT;
+
+-- 驗證創建結果
+\echo '=== 統計快照遷移完成 ==='
+SELECT dimension, key, SUM(value) AS value FROM stats_snapshot GROUP BY dimension, key ORDER BY dimension, key;
+SELECT * FROM stats_aggregate() a
+EXCEPT
+SELECT dimension, key, SUM(value) FROM stats_snapshot GROUP BY dimension, key;
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+資源載入啟動時間基準測試
+
+每個回合啟動一個全新的 Python 程序，載入句型目錄、文法句型與例句庫，
+比較讀取 JSON / 匯入 `core.assets` 與讀取資源快照的耗時，以及程序的最大常駐記憶體。
+
+用法：
+    python scripts/build_asset_snapshot.py
+    python scripts/bench_asset_startup.py [--rounds 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.asset_snapshot import DEFAULT_SNAPSHOT_PATH  # noqa: E402
+
+# 在子程序中執行：只計算資源載入本身，不含直譯器啟動
+_CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import core.asset_snapshot, core.log_config
+start = time.perf_counter()
+from core.pattern_catalog import get_pattern_catalog
+from core.knowledge_assets import ExampleRepository, GrammarRepository
+patterns = len(get_pattern_catalog().patterns)
+grammar = len(GrammarRepository().load_all_grammar())
+bank = len(ExampleRepository().load_bank_from_assets())
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "counts": [patterns, grammar, bank],
+}}))
+"""
+
+
+def run_child(use_snapshot: bool) -> dict:
+    env = dict(os.environ, ASSET_SNAPSHOT_ENABLED="true" if use_snapshot else "false")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(root=str(PROJECT_ROOT))],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="資源載入啟動時間基準測試")
+    parser.add_argument("--rounds", type=int, default=10, help="每種模式的程序數")
+    args = parser.parse_args()
+
+    if not DEFAULT_SNAPSHOT_PATH.exists():
+        sys.exit(f"找不到 {DEFAULT_SNAPSHOT_PATH}，請先執行 scripts/build_asset_snapshot.py")
+
+    results = {}
+    for label, use_snapshot in (("JSON / 匯入模組", False), ("資源快照", True)):
+        runs = [run_child(use_snapshot) for _ in range(args.rounds)]
+        counts = {tuple(run["counts"]) for run in runs}
+        results[label] = (
+            statistics.median(run["ms"] for run in runs),
+            min(run["ms"] for run in runs),
+            statistics.median(run["rss_kb"] for run in runs),
+            counts,
+        )
+
+    print(f"{'模式':<16} {'中位數 (ms)':>12} {'最佳 (ms)':>10} {'最大 RSS (KB)':>14}  載入數量")
+    for label, (median, best, rss, counts) in results.items():
+        print(f"{label:<16} {median:>12.2f} {best:>10.2f} {rss:>14,.0f}  {sorted(counts)}")
+
+    baseline, snapshot = results["JSON / 匯入模組"][0], results["資源快照"][0]
+    print(f"加速: {baseline / snapshot:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
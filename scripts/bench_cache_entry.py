@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+快取條目微基準測試
+
+比較舊版 dataclass + datetime 的 `CacheEntry` 與目前 `__slots__` + 單調時鐘版本：
+- 每次讀取的到期檢查成本
+- 每個條目的記憶體用量
+- `UnifiedCacheManager.get()` 的整體讀取成本
+
+用法：
+    python scripts/bench_cache_entry.py [--entries 100000] [--rounds 5]
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.cache_manager import CacheEntry, UnifiedCacheManager  # noqa: E402
+
+
+@dataclass
+class LegacyCacheEntry:
+    """舊版快取條目（僅供比較），欄位與目前版本相同。"""
+
+    value: Any
+    timestamp: datetime
+    ttl: int
+    hit_count: int = 0
+    stale_ttl: int = 0
+    size: int = 0
+    tags: tuple = ()
+
+    @property
+    def is_expired(self) -> bool:
+        return datetime.now() > self.timestamp + timedelta(seconds=self.ttl)
+
+
+def measure_memory(factory, count: int) -> float:
+    """建立 count 個條目，返回每個條目平均配置的位元組數。"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    entries = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return (after - before) / count
+
+
+def measure_lookup(entries: list, check, rounds: int) -> float:
+    """對所有條目執行到期檢查，返回每次檢查的平均奈秒數（取最佳回合）。"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for entry in entries:
+            check(entry)
+        best = min(best, (time.perf_counter_ns() - start) / len(entries))
+    return best
+
+
+def measure_manager_get(count: int, rounds: int) -> float:
+    """測量 `UnifiedCacheManager.get()` 命中時的平均奈秒數。"""
+    cache = UnifiedCacheManager(default_ttl=3600, max_entries=0, max_bytes=0, sweep_interval=0)
+    keys = [f"key_{i}" for i in range(count)]
+    for key in keys:
+        cache.set(key, 1)
+
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for key in keys:
+            cache.get(key)
+        best = min(best, (time.perf_counter_ns() - start) / count)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CacheEntry 微基準測試")
+    parser.add_argument("--entries", type=int, default=100_000, help="條目數量")
+    parser.add_argument("--rounds", type=int, default=5, help="重複回合數（取最佳值）")
+    args = parser.parse_args()
+
+    count = args.entries
+    # 值使用同一個物件，只量測條目本身（舊版每個條目各自持有一個 datetime）
+    value = object()
+
+    legacy_mem = measure_memory(
+        lambda i: LegacyCacheEntry(value=value, timestamp=datetime.now(), ttl=300), count
+    )
+    slots_mem = measure_memory(lambda i: CacheEntry(value=value, ttl=300), count)
+
+    legacy_entries = [
+        LegacyCacheEntry(value=value, timestamp=datetime.now(), ttl=300) for _ in range(count)
+    ]
+    slots_entries = [CacheEntry(value=value, ttl=300) for _ in range(count)]
+
+    legacy_ns = measure_lookup(legacy_entries, lambda e: e.is_expired, args.rounds)
+    monotonic = time.monotonic
+    slots_ns = measure_lookup(slots_entries, lambda e: monotonic() >= e.expires_at, args.rounds)
+
+    get_ns = measure_manager_get(count, args.rounds)
+
+    print("=" * 60)
+    print(f"CacheEntry 微基準測試（{count:,} 個條目，{args.rounds} 回合取最佳）")
+    print("=" * 60)
+    print(f"{'項目':<20}{'舊版 dataclass':>18}{'__slots__ 版':>18}")
+    print(f"{'每條目記憶體 (B)':<20}{legacy_mem:>18.1f}{slots_mem:>18.1f}")
+    print(f"{'到期檢查 (ns)':<20}{legacy_ns:>18.1f}{slots_ns:>18.1f}")
+    print("-" * 60)
+    print(f"記憶體減少: {(1 - slots_mem / legacy_mem) * 100:.1f}%")
+    print(f"到期檢查加速: {legacy_ns / slots_ns:.1f}x")
+    print(f"UnifiedCacheManager.get() 命中: {get_ns:.1f} ns/次")
+
+
+if __name__ == "__main__":
+    main()
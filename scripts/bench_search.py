@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+知識點搜尋基準測試
+
+在獨立的 schema 中建立與 `knowledge_points` 相同結構的資料表，填入大量合成資料，
+比較舊版四欄 ILIKE 搜尋與 tsvector + trigram 排序搜尋（含 keyset 分頁）的延遲。
+測試結束後會刪除該 schema，不影響正式資料。
+
+需要先對正式資料庫執行 scripts/add_search_index.sql，讓複製的表結構包含搜尋欄位與索引。
+
+用法：
+    python scripts/bench_search.py [--rows 100000] [--repeat 20] [--keep]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import asyncpg
+
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database.connection import DatabaseSettings  # noqa: E402
+from core.database.repositories.know_repo import KnowledgePointRepository  # noqa: E402
+
+BENCH_SCHEMA = "bench_search"
+
+KEYWORDS = ["時態", "preposition", "irrevertable", "主謂一致", "have has", "不存在的關鍵字"]
+
+SEED_SQL = f"""
+    INSERT INTO {BENCH_SCHEMA}.knowledge_points
+        (key_point, category, subtype, explanation, original_phrase, correction)
+    SELECT
+        (ARRAY['時態錯誤', '介系詞搭配', '單字拼寫錯誤', '主謂一致', '冠詞用法'])[1 + i % 5]
+            || ': ' || md5(i::text),
+        (ARRAY['systematic', 'isolated', 'enhancement', 'other'])[1 + i % 4],
+        'general',
+        '說明 ' || md5((i * 7)::text) || ' preposition tense article ' || (i % 1000),
+        (ARRAY['have', 'in', 'irrevertable', 'go', 'a'])[1 + i % 5] || ' ' || (i % 997),
+        (ARRAY['has', 'on', 'irreversible', 'went', 'an'])[1 + i % 5] || ' ' || (i % 991)
+    FROM generate_series(1, $1) AS i
+"""
+
+
+async def timed_fetch(conn: asyncpg.Connection, query: str, *args, repeat: int) -> list[float]:
+    """執行查詢 repeat 次，返回每次的毫秒數。"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await conn.fetch(query, *args)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def summarize(durations: list[float]) -> str:
+    durations = sorted(durations)
+    p95 = durations[max(0, int(len(durations) * 0.95) - 1)]
+    return f"p50 {statistics.median(durations):7.2f} ms  p95 {p95:7.2f} ms"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="知識點搜尋基準測試")
+    parser.add_argument("--rows", type=int, default=100_000, help="合成資料筆數")
+    parser.add_argument("--repeat", type=int, default=20, help="每個查詢重複次數")
+    parser.add_argument("--keep", action="store_true", help="保留測試 schema")
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(dsn=DatabaseSettings().DATABASE_URL)
+    try:
+        print(f"建立 {BENCH_SCHEMA} 並填入 {args.rows:,} 筆資料...")
+        await conn.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        await conn.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+        await conn.execute(
+            f"CREATE TABLE {BENCH_SCHEMA}.knowledge_points "
+            f"(LIKE public.knowledge_points INCLUDING ALL)"
+        )
+        await conn.execute(SEED_SQL, args.rows)
+        await conn.execute(f"ANALYZE {BENCH_SCHEMA}.knowledge_points")
+
+        # 讓 Repository 的 SQL 原樣作用在測試資料表上
+        await conn.execute(f"SET search_path = {BENCH_SCHEMA}, public")
+
+        repo = KnowledgePointRepository
+        print("=" * 72)
+        print(f"{'關鍵字':<16}{'舊版 ILIKE':>28}{'tsvector + trigram':>28}")
+        for keyword in KEYWORDS:
+            pattern = repo._like_pattern(keyword)
+            legacy = await timed_fetch(
+                conn, repo._LEGACY_SEARCH_QUERY, pattern, 50, repeat=args.repeat
+            )
+            ranked = await timed_fetch(
+                conn, repo._SEARCH_QUERY, keyword, pattern, None, None, 50, repeat=args.repeat
+            )
+            print(f"{keyword:<16}{summarize(legacy):>28}{summarize(ranked):>28}")
+
+        # keyset 分頁：連續翻 10 頁，每頁成本應保持穩定
+        print("-" * 72)
+        keyword = "preposition"
+        pattern = repo._like_pattern(keyword)
+        cursor_rank, cursor_id = None, None
+        for page in range(1, 11):
+            start = time.perf_counter()
+            rows = await conn.fetch(
+                repo._SEARCH_QUERY, keyword, pattern, cursor_rank, cursor_id, 50
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"keyset 第 {page:2d} 頁: {len(rows):3d} 筆  {elapsed:7.2f} ms")
+            if len(rows) < 50:
+                break
+            cursor_rank, cursor_id = rows[-1]["search_rank"], rows[-1]["id"]
+
+        plan = await conn.fetch(
+            "EXPLAIN (ANALYZE, BUFFERS) " + repo._SEARCH_QUERY, "時態", "%時態%", None, None, 50
+        )
+        print("-" * 72)
+        print("查詢計畫（時態）：")
+        for row in plan:
+            print("  " + row[0])
+    finally:
+        await conn.execute("RESET search_path")
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
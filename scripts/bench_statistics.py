@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+統計計算基準測試
+
+比較 `UnifiedStatistics` 逐物件迴圈與欄式陣列（NumPy 或 array 模組）兩種計算方式：
+- 迴圈：`calculate_point_statistics`
+- 欄式：`PointColumns.from_points` 建立陣列 + `calculate_point_statistics_columnar`
+
+同時驗證兩者結果一致（含提供 `is_due_for_review()` 的知識點），不一致時以非零狀態結束。
+
+用法：
+    python scripts/bench_statistics.py [--sizes 10000 100000] [--rounds 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.error_types import ErrorCategory  # noqa: E402
+from core.models import KnowledgePointSummary  # noqa: E402
+from core.statistics_utils import PointColumns, UnifiedStatistics, _numpy_available  # noqa: E402
+
+SUBTYPES = [
+    "tense",
+    "preposition",
+    "article",
+    "spelling",
+    "agreement",
+    "word_choice",
+    "collocation",
+]
+
+
+@dataclass
+class ScheduledPoint(KnowledgePointSummary):
+    """自行判斷到期的知識點，結果刻意與 next_review 相反，用來驗證欄式計算採用其結果。"""
+
+    def is_due_for_review(self) -> bool:
+        return datetime.fromisoformat(self.next_review) > datetime.now()
+
+
+def make_points(count: int, seed: int = 42) -> list[KnowledgePointSummary]:
+    """產生 count 個合成知識點摘要，約 5% 已刪除、一半已到期、10% 自行判斷到期。"""
+    rng = random.Random(seed)
+    categories = list(ErrorCategory)
+    now = datetime.now()
+    return [
+        (ScheduledPoint if rng.random() < 0.1 else KnowledgePointSummary)(
+            id=i,
+            key_point=f"point {i}",
+            category=rng.choice(categories),
+            subtype=rng.choice(SUBTYPES),
+            original_phrase="",
+            correction="",
+            mastery_level=round(rng.random(), 2),
+            next_review=(now + timedelta(hours=rng.randint(-240, 240))).isoformat(),
+            is_deleted=rng.random() < 0.05,
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(rounds: int, func, *args) -> float:
+    """以 args 執行 func rounds 次，返回最佳的毫秒數。"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="UnifiedStatistics 基準測試")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000], help="知識點數量"
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="重複回合數（取最佳值）")
+    args = parser.parse_args()
+
+    mismatches = 0
+    backends = [("array", False)] + ([("numpy", True)] if _numpy_available else [])
+
+    print("=" * 78)
+    print(f"UnifiedStatistics 基準測試（{args.rounds} 回合取最佳，NumPy 可用: {_numpy_available}）")
+    print("=" * 78)
+    print(
+        f"{'數量':>8}  {'方式':<8}{'建立陣列 (ms)':>16}{'計算 (ms)':>14}{'合計 (ms)':>14}{'加速':>10}"
+    )
+
+    for size in args.sizes:
+        points = make_points(size)
+        loop_ms = best_of(args.rounds, UnifiedStatistics.calculate_point_statistics, points)
+        print(f"{size:>8,}  {'loop':<8}{'-':>16}{loop_ms:>14.2f}{loop_ms:>14.2f}{'1.0x':>10}")
+
+        expected = UnifiedStatistics.calculate_point_statistics(points)
+        for name, use_numpy in backends:
+            build_ms = best_of(args.rounds, PointColumns.from_points, points, use_numpy)
+            columns = PointColumns.from_points(points, use_numpy)
+            compute_ms = best_of(
+                args.rounds, UnifiedStatistics.calculate_point_statistics_columnar, columns
+            )
+            total_ms = build_ms + compute_ms
+            print(
+                f"{size:>8,}  {name:<8}{build_ms:>16.2f}{compute_ms:>14.2f}{total_ms:>14.2f}"
+                f"{loop_ms / total_ms:>9.1f}x"
+            )
+
+            result = UnifiedStatistics.calculate_point_statistics_columnar(columns)
+            if result != expected:
+                mismatches += 1
+                print(f"  ⚠️ {name} 結果與迴圈版本不一致:\n    {result}\n    {expected}")
+        print("-" * 78)
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
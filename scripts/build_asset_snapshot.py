@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+資源快照建置工具
+
+將 `assets/*.json` 與 `core/assets.py` 的例句庫編譯為 `assets/assets.snapshot`。
+修改任何資源檔案後重新執行；快照過期的區段在執行時會自動改回讀取原始檔案。
+
+用法：
+    python scripts/build_asset_snapshot.py [--output assets/assets.snapshot]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.asset_snapshot import DEFAULT_SNAPSHOT_PATH, build_snapshot  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="資源快照建置工具")
+    parser.add_argument("--output", type=Path, default=DEFAULT_SNAPSHOT_PATH, help="快照輸出路徑")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sections = build_snapshot(args.output)
+    elapsed = time.perf_counter() - start
+
+    for name, size in sections.items():
+        print(f"  {name:<48} {size / 1024:>9,.1f} KB")
+    print(f"已寫入 {args.output}（{len(sections)} 個區段，{elapsed * 1000:.1f} ms）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+知識點匯入工具
+
+從 NDJSON（每行一個知識點，例如 /api/knowledge/export 的輸出）或 JSON 文件
+（知識點陣列或舊版 knowledge.json 的 `{"data": [...]}`）匯入知識點。
+每塊記錄以 COPY 寫入暫存表，再以集合式語句合併到正式資料表，並回報吞吐量。
+
+用法：
+    python scripts/import_knowledge.py export.ndjson [--chunk-size 1000] [--dry-run]
+    cat export.ndjson | python scripts/import_knowledge.py - --format ndjson
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+from pathlib import Path
+from typing import IO
+
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database.connection import get_database_connection  # noqa: E402
+from core.database.repositories.know_repo import KnowledgePointRepository  # noqa: E402
+from core.knowledge_import import (  # noqa: E402
+    ImportReport,
+    KnowledgeImporter,
+    iter_json_document,
+    iter_ndjson_lines,
+)
+
+
+def detect_format(path: str, stream: IO[bytes]) -> str:
+    """依副檔名判斷格式；無法判斷時檢查第一行是否為完整的知識點物件。"""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+    first_line = stream.readline()
+    stream.seek(0)
+    try:
+        record = json.loads(first_line)
+    except ValueError:
+        return "json"
+    return "ndjson" if isinstance(record, dict) and "key_point" in record else "json"
+
+
+def print_progress(report: ImportReport) -> None:
+    print(
+        f"  第 {report.chunks:4d} 塊: 已處理 {report.total:>9,}  寫入 {report.imported:>9,}  "
+        f"略過 {report.skipped:>7,}  無效 {report.invalid:>6,}  {report.rate:>9,.0f} 筆/秒",
+        flush=True,
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="知識點匯入工具")
+    parser.add_argument("source", help="NDJSON 或 JSON 檔案路徑，- 表示標準輸入")
+    parser.add_argument("--format", choices=["auto", "ndjson", "json"], default="auto")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="每個 COPY 交易的記錄數")
+    parser.add_argument(
+        "--include-existing", action="store_true", help="不略過資料庫中已存在的 key_point"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="只驗證，不寫入資料庫")
+    args = parser.parse_args()
+
+    if args.format == "auto" and args.source == "-":
+        parser.error("從標準輸入讀取時必須指定 --format")
+
+    # 以位元組讀取：非法 UTF-8 的行只會被記為無效記錄
+    with contextlib.ExitStack() as stack:
+        if args.source == "-":
+            stream = sys.stdin.buffer
+        else:
+            try:
+                stream = stack.enter_context(open(args.source, "rb"))
+            except OSError as e:
+                parser.error(f"無法開啟 {args.source}: {e}")
+
+        source_format = args.format
+        if source_format == "auto":
+            source_format = detect_format(args.source, stream)
+
+        if source_format == "ndjson":
+            records = iter_ndjson_lines(stream)
+        else:
+            try:
+                records = list(iter_json_document(stream.read()))
+            except ValueError as e:
+                parser.error(str(e))
+
+        db_connection = get_database_connection()
+        try:
+            pool = await db_connection.connect()
+            importer = KnowledgeImporter(
+                KnowledgePointRepository(pool),
+                chunk_size=args.chunk_size,
+                skip_existing=not args.include_existing,
+                dry_run=args.dry_run,
+                on_progress=print_progress,
+            )
+            print(f"匯入 {args.source}（{source_format}，每塊 {args.chunk_size:,} 筆）...")
+            report = await importer.run(records)
+        finally:
+            await db_connection.disconnect()
+
+    print("=" * 72)
+    print(f"總記錄數: {report.total:,}")
+    print(f"寫入: {report.imported:,}  略過: {report.skipped:,}  無效: {report.invalid:,}")
+    print(f"耗時: {report.elapsed:.2f} 秒  吞吐量: {report.rate:,.0f} 筆/秒")
+    for error in report.errors[:20]:
+        print(f"  記錄 {error['record']}: {error['error']}")
+    if report.invalid > 20:
+        print(f"  ...另有 {report.invalid - 20} 筆無效記錄")
+    if args.dry_run:
+        print("乾跑模式：未寫入資料庫")
+
+    sys.exit(1 if report.invalid else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -19,9 +19,8 @@ from core.config import DATA_DIR  # noqa: E402
 from core.database.connection import get_database_connection  # noqa: E402
 from core.database.exceptions import DatabaseError  # noqa: E402
 from core.database.repositories.know_repo import KnowledgePointRepository  # noqa: E402
-from core.error_types import ErrorCategory  # noqa: E402
+from core.knowledge_import import ImportReport, KnowledgeImporter  # noqa: E402
 from core.log_config import get_module_logger  # noqa: E402
-from core.models import KnowledgePoint, OriginalError, ReviewExample  # noqa: E402
 
 logger = get_module_logger("migrate_data")
 
@@ -78,103 +77,10 @@ class DataMigrator:
             logger.error(f"載入 JSON 檔案失敗: {e}")
             return None
 
-    def json_to_knowledge_point(self, point_data: dict[str, Any]) -> Optional[KnowledgePoint]:
-        """將 JSON 資料轉換為 KnowledgePoint 物件"""
-        try:
-            # 處理原始錯誤
-            original_error_data = point_data.get("original_error", {})
-            original_error = OriginalError(
-                chinese_sentence=original_error_data.get("chinese_sentence", ""),
-                user_answer=original_error_data.get("user_answer", ""),
-                correct_answer=original_error_data.get("correct_answer", ""),
-                timestamp=original_error_data.get("timestamp", datetime.now().isoformat()),
-            )
-
-            # 處理複習例句
-            review_examples = []
-            for example_data in point_data.get("review_examples", []):
-                review_example = ReviewExample(
-                    chinese_sentence=example_data.get("chinese_sentence", ""),
-                    user_answer=example_data.get("user_answer", ""),
-                    correct_answer=example_data.get("correct_answer", ""),
-                    timestamp=example_data.get("timestamp", datetime.now().isoformat()),
-                    is_correct=example_data.get("is_correct", False),
-                )
-                review_examples.append(review_example)
-
-            # 處理時間數據：確保所有時間都是從 JSON 原始數據來的
-            created_at_str = point_data.get("created_at", datetime.now().isoformat())
-            last_seen_str = point_data.get("last_seen", datetime.now().isoformat())
-            next_review_str = point_data.get("next_review", "")
-            last_modified_str = point_data.get("last_modified", datetime.now().isoformat())
-
-            # 處理時間約束問題：確保 next_review >= last_seen
-            # 如果 next_review 存在但早於 last_seen，則重新計算 next_review
-            if last_seen_str and next_review_str:
-                try:
-                    from datetime import timedelta
-
-                    last_seen_dt = datetime.fromisoformat(last_seen_str.replace("Z", "+00:00"))
-                    next_review_dt = datetime.fromisoformat(next_review_str.replace("Z", "+00:00"))
-
-                    if next_review_dt < last_seen_dt:
-                        logger.warning(
-                            f"修復時間約束問題 - ID {point_data.get('id')}: next_review < last_seen"
-                        )
-                        # 重新計算 next_review：根據掌握度設定複習間隔
-                        mastery_level = float(point_data.get("mastery_level", 0.0))
-                        if mastery_level < 0.3:
-                            # 低掌握度：1天後複習
-                            next_review_dt = last_seen_dt + timedelta(days=1)
-                        elif mastery_level < 0.7:
-                            # 中等掌握度：3天後複習
-                            next_review_dt = last_seen_dt + timedelta(days=3)
-                        else:
-                            # 高掌握度：7天後複習
-                            next_review_dt = last_seen_dt + timedelta(days=7)
-
-                        next_review_str = next_review_dt.isoformat()
-                        logger.info(f"重新設定 next_review 為: {next_review_str}")
-                except ValueError:
-                    logger.warning(f"時間格式錯誤 - ID {point_data.get('id')}: 清空 next_review")
-                    next_review_str = ""
-
-            # 建立 KnowledgePoint
-            knowledge_point = KnowledgePoint(
-                id=point_data.get("id", 0),
-                key_point=point_data.get("key_point", ""),
-                category=ErrorCategory.from_string(point_data.get("category", "")),
-                subtype=point_data.get("subtype", ""),
-                explanation=point_data.get("explanation", ""),
-                original_phrase=point_data.get("original_phrase", ""),
-                correction=point_data.get("correction", ""),
-                original_error=original_error,
-                review_examples=review_examples,
-                mastery_level=float(point_data.get("mastery_level", 0.0)),
-                mistake_count=int(point_data.get("mistake_count", 1)),
-                correct_count=int(point_data.get("correct_count", 0)),
-                created_at=created_at_str,
-                last_seen=last_seen_str,
-                next_review=next_review_str,
-                is_deleted=point_data.get("is_deleted", False),
-                deleted_at=point_data.get("deleted_at", ""),
-                deleted_reason=point_data.get("deleted_reason", ""),
-                tags=point_data.get("tags", []),
-                custom_notes=point_data.get("custom_notes", ""),
-                version_history=point_data.get("version_history", []),
-                last_modified=last_modified_str,
-            )
-
-            return knowledge_point
-
-        except Exception as e:
-            logger.error(f"轉換知識點資料失敗: {e}, 資料: {point_data.get('id', 'unknown')}")
-            return None
-
     async def migrate_knowledge_points(
-        self, json_data: dict[str, Any], batch_size: int = 10
+        self, json_data: dict[str, Any], batch_size: int = 500
     ) -> bool:
-        """遷移知識點資料"""
+        """遷移知識點資料（COPY 暫存表 + 集合式合併，依 key_point 去重）"""
         if not self.repository:
             logger.error("Repository 未初始化")
             return False
@@ -185,46 +91,22 @@ class DataMigrator:
 
         logger.info(f"開始遷移 {self.stats['total_points']} 個知識點...")
 
-        # 批次處理
-        for i in range(0, len(points_data), batch_size):
-            batch = points_data[i : i + batch_size]
-            batch_num = i // batch_size + 1
-            total_batches = (len(points_data) + batch_size - 1) // batch_size
-
-            logger.info(f"處理第 {batch_num}/{total_batches} 批次 ({len(batch)} 個知識點)...")
-
-            async with self.repository.transaction():
-                for point_data in batch:
-                    try:
-                        # 轉換資料
-                        knowledge_point = self.json_to_knowledge_point(point_data)
-                        if not knowledge_point:
-                            self.stats["errors"] += 1
-                            continue
-
-                        # 檢查是否已存在 (根據 key_point 判斷)
-                        existing_points = await self.repository.search(knowledge_point.key_point)
-                        if any(ep.key_point == knowledge_point.key_point for ep in existing_points):
-                            logger.debug(f"知識點已存在，跳過: {knowledge_point.key_point}")
-                            continue
-
-                        # 插入資料庫
-                        await self.repository.create(knowledge_point)
-                        self.stats["migrated_points"] += 1
-
-                        # 進度報告
-                        if self.stats["migrated_points"] % 50 == 0:
-                            progress = (
-                                self.stats["migrated_points"] / self.stats["total_points"]
-                            ) * 100
-                            logger.info(
-                                f"已遷移: {self.stats['migrated_points']}/{self.stats['total_points']} ({progress:.1f}%)"
-                            )
-
-                    except Exception as e:
-                        logger.error(f"遷移知識點失敗: {e}")
-                        self.stats["errors"] += 1
+        def report_progress(report: ImportReport) -> None:
+            progress = (report.total / self.stats["total_points"]) * 100
+            logger.info(
+                f"已處理: {report.total}/{self.stats['total_points']} ({progress:.1f}%)，"
+                f"寫入 {report.imported}，{report.rate:.0f} 筆/秒"
+            )
+
+        importer = KnowledgeImporter(
+            self.repository, chunk_size=batch_size, on_progress=report_progress
+        )
+        report = await importer.run(enumerate(points_data, start=1))
+        for error in report.errors:
+            logger.error(f"知識點 #{error['record']} 遷移失敗: {error['error']}")
 
+        self.stats["migrated_points"] = report.imported
+        self.stats["errors"] = report.invalid
         self.stats["end_time"] = datetime.now()
         return True
 
@@ -316,7 +198,7 @@ async def main():
 
     parser = argparse.ArgumentParser(description="JSON 到 PostgreSQL 資料遷移工具")
     parser.add_argument("--json-file", help="指定 JSON 檔案路徑")
-    parser.add_argument("--batch-size", type=int, default=10, help="批次大小")
+    parser.add_argument("--batch-size", type=int, default=500, help="批次大小")
     parser.add_argument("--dry-run", action="store_true", help="僅驗證，不執行遷移")
     parser.add_argument("--force", action="store_true", help="強制遷移，忽略現有資料")
     parser.add_argument("--verify-only", action="store_true", help="僅執行驗證")
@@ -22,12 +22,17 @@ class ApiEndpoints:
     GENERATE_QUESTION: str = "/api/generate-question"
     GRADE_ANSWER: str = "/api/grade-answer"
     CONFIRM_KNOWLEDGE: str = "/api/confirm-knowledge-points"
+    QUESTION_POOL_STATS: str = "/api/question-pool/stats"
+    AI_PROMPT_STATS: str = "/api/ai/prompt-stats"
 
     # ========== 知識點管理API ==========
     KNOWLEDGE_BASE: str = "/api/knowledge"
     KNOWLEDGE_DETAIL: str = "/api/knowledge/{point_id}"
     KNOWLEDGE_RECOMMENDATIONS: str = "/api/knowledge/recommendations"
     KNOWLEDGE_TRASH_LIST: str = "/api/knowledge/trash/list"
+    KNOWLEDGE_SEARCH: str = "/api/knowledge/search"
+    KNOWLEDGE_EXPORT: str = "/api/knowledge/export"
+    KNOWLEDGE_IMPORT: str = "/api/knowledge/import"
     KNOWLEDGE_TRASH_CLEAR: str = "/api/knowledge/trash/clear"
     KNOWLEDGE_BATCH: str = "/api/knowledge/batch"
     KNOWLEDGE_BATCH_PROGRESS: str = "/api/knowledge/batch/{task_id}/progress"
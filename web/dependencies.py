@@ -8,11 +8,13 @@ from pathlib import Path
 from fastapi.templating import Jinja2Templates
 
 from core.ai_service import AIService
+from core.batch_queue import create_batch_queue_from_env
 
 # TASK-31: 舊的適配器已廢棄，不再導入
 # from core.database.simplified_adapter import KnowledgeManagerAdapter, get_knowledge_manager_async
 from core.knowledge_assets import KnowledgeAssets
 from core.log_config import get_module_logger
+from core.question_pool import create_question_pool_from_env
 from core.services import get_service_registry
 
 # 初始化模組 logger
@@ -28,12 +30,16 @@ _templates = None
 _assets = None
 _knowledge = None
 _ai = None
+_question_pool = None
+_batch_queue = None
 
 # 初始化鎖保護
 _templates_lock = threading.Lock()
 _assets_lock = threading.Lock()
 _knowledge_lock = threading.Lock()
 _ai_lock = threading.Lock()
+_question_pool_lock = threading.Lock()
+_batch_queue_lock = threading.Lock()
 
 
 def get_templates():
@@ -104,6 +110,50 @@ def get_knowledge_assets():
     return _assets
 
 
+def get_question_pool():
+    """獲取新題模式的預生成題目池（線程安全），停用時返回 None"""
+    global _question_pool
+    if _question_pool is None:
+        with _question_pool_lock:
+            # 雙重檢查鎖定模式
+            if _question_pool is None:
+                pool = create_question_pool_from_env()
+                if pool is None:
+                    return None
+
+                async def produce_new_question(length: str, level: int):
+                    examples = get_knowledge_assets().sample_examples(
+                        length=length, difficulty=level, k=5
+                    )
+                    return await get_ai_service().generate_practice_sentence_async(
+                        level=level, length=length, examples=examples or None
+                    )
+
+                pool.register_producer("new", produce_new_question)
+                _question_pool = pool
+                logger.debug("初始化 QuestionPool")
+    return _question_pool
+
+
+def get_batch_queue():
+    """獲取知識點批量任務佇列（線程安全）"""
+    global _batch_queue
+    if _batch_queue is None:
+        with _batch_queue_lock:
+            # 雙重檢查鎖定模式
+            if _batch_queue is None:
+                queue = create_batch_queue_from_env()
+
+                async def execute_chunk(operation: str, ids: list[int], data: dict):
+                    knowledge = await get_know_service()
+                    return await knowledge.apply_batch_operation_async(operation, ids, data)
+
+                queue.set_executor(execute_chunk)
+                _batch_queue = queue
+                logger.debug("初始化 BatchJobQueue")
+    return _batch_queue
+
+
 def get_logger():
     """獲取 logger"""
     return logger
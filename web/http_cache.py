@@ -0,0 +1,221 @@
+"""
+HTTP 條件式請求與壓縮輔助模組
+
+讀多寫少的大型 JSON 回應（句型列表、知識點詳情）以內容版本（資源檔案修改時間、
+`last_modified` 欄位）產生 ETag 與 Last-Modified：
+
+- 請求帶有相符的 `If-None-Match` / `If-Modified-Since` 時直接返回 304，不序列化也不傳送內容。
+- 其他情況依 `Accept-Encoding` 協商壓縮（安裝 `brotli` 套件時優先 br，其次 gzip），
+  內容版本固定的回應可快取壓縮後的位元組，之後的請求不需要重新序列化與壓縮。
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Union
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+
+    _brotli_available = True
+except ImportError:
+    brotli = None
+    _brotli_available = False
+
+# 小於此大小的回應不壓縮，壓縮標頭與 CPU 成本高於節省的傳輸量
+MIN_COMPRESS_SIZE = 1024
+
+# 快取的已編碼回應數量上限（以 ETag 與編碼為鍵）
+ENCODED_CACHE_SIZE = 64
+
+Timestamp = Union[datetime, float, str, None]
+
+
+def make_etag(*parts: Any) -> str:
+    """以內容版本組成弱 ETag（各種壓縮編碼的回應語意相同，共用同一個 ETag）。"""
+    digest = hashlib.blake2b(
+        "\x00".join(str(part) for part in parts).encode("utf-8"), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _to_datetime(value: Timestamp) -> Optional[datetime]:
+    """將時間戳（datetime、epoch 秒數或 ISO 字串）轉為精確到秒的 UTC 時間。"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        moment = datetime.fromtimestamp(value, tz=timezone.utc)
+    elif isinstance(value, str):
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    else:
+        moment = value
+    if moment.tzinfo is None:
+        # 沒有時區的時間由本機時間產生（datetime.now()）
+        moment = moment.astimezone()
+    return moment.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """`If-None-Match` 使用弱比較：忽略 `W/` 前綴。"""
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _validator_headers(etag: str, last_modified: Optional[datetime]) -> dict[str, str]:
+    headers = {
+        "ETag": etag,
+        # 允許瀏覽器保存，但每次使用前都要以條件式請求確認
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def not_modified_response(
+    request: Request, etag: str, last_modified: Timestamp = None
+) -> Optional[Response]:
+    """
+    檢查條件式請求。
+
+    有 `If-None-Match` 時只比較 ETag；否則比較 `If-Modified-Since` 與 `last_modified`。
+
+    Returns:
+        內容未變更時返回 304 回應，否則返回 None。
+    """
+    modified_at = _to_datetime(last_modified)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, etag)
+    else:
+        matched = False
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and modified_at is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                since = None
+            if since is not None:
+                if since.tzinfo is None:
+                    since = since.replace(tzinfo=timezone.utc)
+                matched = modified_at <= since
+
+    if not matched:
+        return None
+    return Response(status_code=304, headers=_validator_headers(etag, modified_at))
+
+
+def negotiate_encoding(request: Request) -> Optional[str]:
+    """依 `Accept-Encoding` 選擇壓縮編碼（br 或 gzip），不接受壓縮時返回 None。"""
+    accepted = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        token, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            accepted[token.strip().lower()] = quality
+
+    def acceptable(encoding: str) -> bool:
+        return accepted.get(encoding, accepted.get("*", 0.0)) > 0
+
+    if _brotli_available and acceptable("br"):
+        return "br"
+    if acceptable("gzip"):
+        return "gzip"
+    return None
+
+
+def _encode(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+class _EncodedBodyCache:
+    """以 (ETag, 協商編碼) 為鍵的 LRU 快取，保存已序列化、已壓縮的內容及其實際編碼。"""
+
+    def __init__(self, max_size: int = ENCODED_CACHE_SIZE):
+        self.max_size = max_size
+        self._items: OrderedDict[tuple[str, Optional[str]], tuple[bytes, Optional[str]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, Optional[str]]) -> Optional[tuple[bytes, Optional[str]]]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+            return entry
+
+    def set(self, key: tuple[str, Optional[str]], entry: tuple[bytes, Optional[str]]) -> None:
+        with self._lock:
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+_encoded_cache = _EncodedBodyCache()
+
+
+def cached_json_response(
+    request: Request,
+    content: Any,
+    etag: str,
+    last_modified: Timestamp = None,
+    cache_body: bool = False,
+) -> Response:
+    """
+    產生帶有 ETag / Last-Modified 並依協商結果壓縮的 JSON 回應。
+
+    Args:
+        request: 目前的請求，用於協商壓縮編碼。
+        content: 回應內容（序列化方式與 `JSONResponse` 相同）。
+        etag: 由 `make_etag` 產生、代表此內容版本的 ETag。
+        last_modified: 內容的最後修改時間。
+        cache_body: ETag 完整涵蓋內容版本時設為 True，快取編碼後的位元組。
+    """
+    key = (etag, negotiate_encoding(request))
+    entry = _encoded_cache.get(key) if cache_body else None
+
+    if entry is None:
+        body = json.dumps(
+            content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        encoding = key[1] if len(body) >= MIN_COMPRESS_SIZE else None
+        entry = (_encode(body, encoding), encoding)
+        if cache_body:
+            _encoded_cache.set(key, entry)
+
+    body, encoding = entry
+    headers = _validator_headers(etag, _to_datetime(last_modified))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
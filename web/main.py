@@ -2,6 +2,8 @@
 Linker Web Application - Main Entry Point
 """
 
+import os
+
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -77,6 +79,52 @@ def create_app() -> FastAPI:
     app.include_router(api_knowledge.router)  # 新增知識點 API 路由
     app.include_router(test_async.router)  # TASK-31 測試異步服務層
 
+    # 題目池：啟動時預熱常用分區，關閉時取消背景補充任務
+    from core.question_pool import parse_prewarm_keys
+    from web.dependencies import get_question_pool
+
+    async def prewarm_question_pool():
+        pool = get_question_pool()
+        spec = os.getenv("QUESTION_POOL_PREWARM", "")
+        if pool and spec:
+            pool.prewarm(parse_prewarm_keys(spec))
+
+    async def shutdown_question_pool():
+        pool = get_question_pool()
+        if pool:
+            await pool.shutdown()
+
+    app.add_event_handler("startup", prewarm_question_pool)
+    app.add_event_handler("shutdown", shutdown_question_pool)
+
+    # 快取失效匯流排：多 worker 部署時以 Postgres LISTEN/NOTIFY 同步快取失效
+    from core.cache_bus import get_invalidation_bus
+
+    app.add_event_handler("startup", get_invalidation_bus().start)
+    app.add_event_handler("shutdown", get_invalidation_bus().stop)
+
+    # 批改快取：啟用持久層時定期刪除資料表中的過期結果
+    from web.dependencies import get_ai_service
+
+    async def start_grading_cache():
+        cache = get_ai_service().grading_cache
+        if cache:
+            await cache.start()
+
+    async def stop_grading_cache():
+        cache = get_ai_service().grading_cache
+        if cache:
+            await cache.stop()
+
+    app.add_event_handler("startup", start_grading_cache)
+    app.add_event_handler("shutdown", stop_grading_cache)
+
+    # 批量任務佇列：啟動工作者池與過期任務清理，關閉時停止（未完成的任務由檢查點繼續）
+    from web.dependencies import get_batch_queue
+
+    app.add_event_handler("startup", get_batch_queue().start)
+    app.add_event_handler("shutdown", get_batch_queue().stop)
+
     logger.info("Linker Web Application initialized successfully")
 
     return app
@@ -2,25 +2,35 @@
 Knowledge management API routes (Fixed routing order)
 """
 
-import asyncio
 import uuid
 from datetime import datetime
 from enum import Enum
 from typing import Any, Literal, Optional
+from urllib.parse import urlencode
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Path
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Path, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from core.exceptions import KnowledgeNotFoundError
+from core.database.repositories.know_repo import (
+    decode_page_cursor,
+    decode_search_cursor,
+    encode_page_cursor,
+    encode_search_cursor,
+)
+from core.exceptions import DatabaseError, KnowledgeNotFoundError
+from core.knowledge_export import EXPORT_MEDIA_TYPES, iter_export
+from core.knowledge_import import iter_json_document, iter_ndjson_chunks
 
 # TASK-34: 引入統一API端點管理系統，消除硬編碼
 # 注意：由於router使用prefix="/api/knowledge"，路由定義只需要相對路徑
 from web.config.api_endpoints import API_ENDPOINTS
 from web.dependencies import (
+    get_batch_queue,
     get_know_service,  # TASK-31: 使用新的純異步服務
     get_logger,
 )
+from web.http_cache import cached_json_response, make_etag, not_modified_response
 from web.models.validation import (
     BatchReq,
     DeleteKnowReq,
@@ -92,7 +102,7 @@ class BatchProgress(BaseModel):
     """批量操作進度"""
 
     task_id: str
-    status: Literal["pending", "processing", "completed", "failed"]
+    status: Literal["pending", "processing", "completed", "failed", "cancelled"]
     progress: int
     total: int
     processed: int
@@ -111,10 +121,6 @@ class RecommendationParams(BaseModel):
 # 預設為預覽模式
 
 
-# 批量操作任務存儲
-batch_tasks: dict[str, BatchProgress] = {}
-
-
 # ==================== 固定路徑路由（必須在動態路徑之前）====================
 
 
@@ -147,6 +153,157 @@ async def get_recommendations(params: RecommendationParams = RecommendationParam
         raise HTTPException(status_code=500, detail=f"獲取推薦失敗: {str(e)}") from e
 
 
+@router.get(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_BASE))
+async def list_knowledge_points(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    view: Literal["summary", "full"] = "summary",
+):
+    """分頁列出活躍知識點
+
+    依最後練習時間排序，以 keyset 游標翻頁；把回應中的 `next_cursor` 傳回即可取得下一頁，
+    為 null 時表示已經是最後一頁。預設只返回摘要欄位，`view=full` 時返回完整知識點。
+    """
+    try:
+        page_cursor = decode_page_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    knowledge = await get_know_service()  # TASK-31: 使用純異步服務
+    points, next_cursor = await knowledge.get_points_page_async(
+        limit, page_cursor, view=view, category=category
+    )
+
+    from dataclasses import asdict
+
+    items = []
+    for point in points:
+        item = asdict(point)
+        item["category"] = point.category.value
+        if view == "full":
+            # 列表不需要原始錯誤與複習例句等關聯資料
+            item.pop("original_error", None)
+            item.pop("review_examples", None)
+            item.pop("version_history", None)
+        items.append(item)
+
+    return JSONResponse(
+        {
+            "success": True,
+            "count": len(items),
+            "items": items,
+            "next_cursor": encode_page_cursor(next_cursor),
+        }
+    )
+
+
+@router.get(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_SEARCH))
+async def search_knowledge_points(
+    q: str = Query(..., min_length=1, max_length=200, description="搜尋關鍵字"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+):
+    """依相關性搜尋活躍知識點
+
+    以 (相關性, id) keyset 游標翻頁；把回應中的 `next_cursor` 傳回即可取得下一頁，
+    為 null 時表示已經是最後一頁。
+    """
+    try:
+        search_cursor = decode_search_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    knowledge = await get_know_service()  # TASK-31: 使用純異步服務
+    points, next_cursor = await knowledge.search_knowledge_points_page_async(
+        q.strip(), limit, search_cursor
+    )
+
+    items = []
+    for point in points:
+        items.append(
+            {
+                "id": point.id,
+                "key_point": point.key_point,
+                "category": point.category.value,
+                "subtype": point.subtype,
+                "original_phrase": point.original_phrase,
+                "correction": point.correction,
+                "explanation": point.explanation,
+                "mastery_level": point.mastery_level,
+                "next_review": point.next_review,
+            }
+        )
+
+    return JSONResponse(
+        {
+            "success": True,
+            "count": len(items),
+            "items": items,
+            "next_cursor": encode_search_cursor(next_cursor),
+        }
+    )
+
+
+@router.get(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_EXPORT))
+async def export_knowledge_points(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="匯出格式"),
+    include_deleted: bool = Query(False, description="是否包含回收站中的知識點"),
+    task_id: Optional[str] = Query(None, description="批量匯出任務ID，只匯出該任務選取的知識點"),
+):
+    """
+    串流匯出知識點（預設全部；指定 `task_id` 時只匯出該批量匯出任務的知識點，含回收站中的）。
+
+    選取的 ID 從任務記錄讀取，不經由網址傳遞，大批量匯出不受請求行長度限制。
+    以分頁逐批讀取資料庫並即時編碼送出，不會一次載入全部知識點。
+    """
+    knowledge = await get_know_service()  # TASK-31: 使用純異步服務
+    if task_id is not None:
+        job = await get_batch_queue().get(task_id)
+        if job is None or job["operation"] != BatchOperation.EXPORT.value:
+            raise HTTPException(status_code=404, detail="匯出任務不存在")
+        points = knowledge.iter_points_by_ids_async(job["ids"])
+    else:
+        points = knowledge.iter_point_details_async(include_deleted=include_deleted)
+
+    filename = f"knowledge_points_{datetime.now():%Y%m%d_%H%M%S}.{format}"
+    return StreamingResponse(
+        iter_export(points, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_IMPORT))
+async def import_knowledge_points(
+    request: Request,
+    skip_existing: bool = Query(True, description="略過已存在的 key_point"),
+    dry_run: bool = Query(False, description="只驗證，不寫入"),
+    chunk_size: int = Query(1000, ge=1, le=10000, description="每個 COPY 交易的記錄數"),
+):
+    """
+    匯入知識點。
+
+    `Content-Type: application/x-ndjson` 時逐行串流讀取請求本文；
+    `application/json` 時讀取整份知識點陣列或 `{"data": [...]}` 文件。
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/ndjson"):
+        records = iter_ndjson_chunks(request.stream())
+    else:
+        try:
+            records = list(iter_json_document(await request.body()))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+    knowledge = await get_know_service()  # TASK-31: 使用純異步服務
+    report = await knowledge.import_points_async(
+        records, chunk_size=chunk_size, skip_existing=skip_existing, dry_run=dry_run
+    )
+    logger.info(f"匯入知識點：寫入 {report.imported}，略過 {report.skipped}，無效 {report.invalid}")
+    return JSONResponse({"success": True, "dry_run": dry_run, **report.to_dict()})
+
+
 @router.get(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_TRASH_LIST))
 async def get_trash_list():
     """獲取回收站中的知識點列表"""
@@ -194,10 +351,8 @@ async def clear_old_trash(days: int = 30):
 
 
 @router.post(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_BATCH))
-async def batch_operation(request: BatchReq, background_tasks: BackgroundTasks):
+async def batch_operation(request: BatchReq):
     """批量操作端點"""
-    knowledge = await get_know_service()  # TASK-31: 使用純異步服務
-
     # 將字符串操作轉換為枚舉
     try:
         operation_enum = BatchOperation(request.operation)
@@ -206,32 +361,35 @@ async def batch_operation(request: BatchReq, background_tasks: BackgroundTasks):
             status_code=400, detail=f"不支持的操作類型: {request.operation}"
         ) from None
 
-    # 生成任務 ID
-    task_id = str(uuid.uuid4())
-
-    # 創建任務記錄
-    task = BatchProgress(
-        task_id=task_id,
-        status="pending",
-        progress=0,
-        total=len(request.ids),
-        processed=0,
-        errors=[],
-    )
-    batch_tasks[task_id] = task
-
-    # 判斷是否需要異步處理
-    if len(request.ids) > 50 or (request.options and request.options.get("async")):
-        # 異步處理
-        background_tasks.add_task(
-            process_batch,
-            task_id,
-            operation_enum,
+    job_id = str(uuid.uuid4())
+    initial_result = None
+    if operation_enum == BatchOperation.EXPORT:
+        # 任務只確認知識點存在，內容由匯出端點依任務記錄中的 ID 串流下載，不寫入任務記錄
+        export_format = "csv" if (request.data or {}).get("format") == "csv" else "ndjson"
+        initial_result = {
+            "format": export_format,
+            "download_url": f"{API_ENDPOINTS.KNOWLEDGE_EXPORT}?"
+            + urlencode({"format": export_format, "task_id": job_id}),
+        }
+
+    # 判斷是否需要異步處理：大批量或指定 async 時交給工作者池，否則在請求內直接執行
+    run_async = len(request.ids) > 50 or bool(request.options and request.options.get("async"))
+
+    queue = get_batch_queue()
+    try:
+        task_id = await queue.submit(
+            operation_enum.value,
             request.ids,
             request.data,
-            knowledge,
+            result=initial_result,
+            wait=not run_async,
+            job_id=job_id,
         )
+    except DatabaseError as e:
+        logger.error(f"建立批量任務失敗: {e}")
+        raise HTTPException(status_code=503, detail="批量任務佇列暫時不可用") from e
 
+    if run_async:
         return JSONResponse(
             {
                 "success": True,
@@ -241,51 +399,57 @@ async def batch_operation(request: BatchReq, background_tasks: BackgroundTasks):
             }
         )
 
-    else:
-        # 同步處理
-        await process_batch(task_id, operation_enum, request.ids, request.data, knowledge)
+    task = _job_to_progress(await queue.get(task_id))
+    return JSONResponse(
+        {
+            "success": task.status == "completed",
+            "async": False,
+            "task_id": task_id,
+            "processed": task.processed,
+            "errors": task.errors,
+            "result": task.result,
+        }
+    )
 
-        task = batch_tasks[task_id]
 
-        return JSONResponse(
-            {
-                "success": task.status == "completed",
-                "async": False,
-                "task_id": task_id,
-                "processed": task.processed,
-                "errors": task.errors,
-                "result": task.result,
-            }
-        )
+def _job_to_progress(job: dict[str, Any]) -> BatchProgress:
+    """將佇列中的任務記錄轉換為進度回應模型。"""
+    finished_at = job.get("finished_at")
+    return BatchProgress(
+        task_id=job["id"],
+        status=job["status"],
+        progress=job["progress"],
+        total=job["total"],
+        processed=job["processed"],
+        errors=job["errors"] or [],
+        eta=finished_at.isoformat() if finished_at else None,
+        result=job["result"],
+    )
 
 
 @router.get(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_BATCH_PROGRESS))
 async def get_batch_progress(task_id: str):
     """查詢批量操作進度"""
-    if task_id not in batch_tasks:
+    job = await get_batch_queue().get(task_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="任務不存在")
 
-    task = batch_tasks[task_id]
-
-    return JSONResponse(task.dict())
+    return JSONResponse(_job_to_progress(job).dict())
 
 
 @router.delete(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_BATCH_DELETE))
 async def cancel_batch(
     task_id: str = Path(..., min_length=8, max_length=100, description="批量任務ID"),
 ):
-    """取消批量操作"""
-    if task_id not in batch_tasks:
+    """取消批量操作；已結束的任務會被清理"""
+    previous_status = await get_batch_queue().cancel(task_id)
+    if previous_status is None:
         raise HTTPException(status_code=404, detail="任務不存在")
 
-    task = batch_tasks[task_id]
-
-    if task.status == "processing":
-        # TODO: 實作取消邏輯
-        return JSONResponse({"success": False, "message": "暫不支援取消進行中的任務"})
-
-    # 清理已完成的任務
-    del batch_tasks[task_id]
+    if previous_status == "processing":
+        return JSONResponse({"success": True, "message": "已要求取消，任務會在目前分塊完成後停止"})
+    if previous_status == "pending":
+        return JSONResponse({"success": True, "message": "任務已取消"})
 
     return JSONResponse({"success": True, "message": "任務已清理"})
 
@@ -326,8 +490,11 @@ async def delete_old_points(request: DeleteOldPointsRequest):
 
 
 @router.get(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_DETAIL))
-async def get_knowledge_point(point_id: int):
-    """獲取單個知識點詳情"""
+async def get_knowledge_point(point_id: int, request: Request):
+    """獲取單個知識點詳情
+
+    以內容版本計算 ETag，支援 `If-None-Match` 條件式請求與壓縮。
+    """
     knowledge = await get_know_service()  # TASK-31: 使用純異步服務
 
     try:
@@ -358,6 +525,20 @@ async def get_knowledge_point(point_id: int):
             },
         )
 
+    # 標籤、複習例句與編輯歷史存放在其他資料表，寫入時不一定更新 last_modified，一併納入版本。
+    # 因此只以 ETag 驗證，不提供 Last-Modified（其秒級精度也無法區分同一秒內的多次修改）
+    etag = make_etag(
+        "knowledge",
+        point.id,
+        point.last_modified,
+        ",".join(point.tags or []),
+        len(point.review_examples),
+        len(point.version_history),
+    )
+    not_modified = not_modified_response(request, etag)
+    if not_modified is not None:
+        return not_modified
+
     # TASK-31: KnowledgePoint 是 dataclass，需要處理 ErrorCategory Enum 序列化
     from dataclasses import asdict
 
@@ -365,7 +546,7 @@ async def get_knowledge_point(point_id: int):
     # ErrorCategory 是 Enum，需要轉換為字符串
     if "category" in point_dict and hasattr(point_dict["category"], "value"):
         point_dict["category"] = point_dict["category"].value
-    return JSONResponse(point_dict)
+    return cached_json_response(request, point_dict, etag)
 
 
 @router.put(_get_relative_path(API_ENDPOINTS.KNOWLEDGE_DETAIL))
@@ -457,125 +638,6 @@ async def update_notes(
     return JSONResponse({"success": True, "message": "筆記已更新", "notes": request.notes})
 
 
-# ==================== 批量操作處理函數 ====================
-
-
-async def process_batch(
-    task_id: str,
-    operation: BatchOperation,
-    ids: list[int],
-    data: Optional[dict[str, Any]],
-    knowledge_manager,
-):
-    """異步處理批量操作"""
-    task = batch_tasks[task_id]
-    task.status = "processing"
-
-    try:
-        if operation == BatchOperation.DELETE:
-            # 批量刪除
-            reason = data.get("reason", "") if data else ""
-            for i, point_id in enumerate(ids):
-                try:
-                    success = await knowledge_manager.delete_point_async(point_id, reason)
-                    if not success:
-                        task.errors.append({"id": point_id, "error": "刪除失敗"})
-                except Exception as e:
-                    task.errors.append({"id": point_id, "error": str(e)})
-
-                task.processed = i + 1
-                task.progress = int((task.processed / task.total) * 100)
-
-                # 避免阻塞
-                if i % 10 == 0:
-                    await asyncio.sleep(0.1)
-
-        elif operation == BatchOperation.UPDATE:
-            # 批量更新
-            updates = data or {}
-            for i, point_id in enumerate(ids):
-                try:
-                    history = await knowledge_manager.edit_knowledge_point_async(point_id, updates)
-                    if not history:
-                        task.errors.append({"id": point_id, "error": "更新失敗"})
-                except Exception as e:
-                    task.errors.append({"id": point_id, "error": str(e)})
-
-                task.processed = i + 1
-                task.progress = int((task.processed / task.total) * 100)
-
-                if i % 10 == 0:
-                    await asyncio.sleep(0.1)
-
-        elif operation == BatchOperation.TAG:
-            # 批量添加標籤
-            tags = data.get("tags", []) if data else []
-            for i, point_id in enumerate(ids):
-                try:
-                    point = await knowledge_manager.get_knowledge_point_async(point_id)
-                    if point:
-                        existing_tags = point.tags or []
-                        new_tags = list(set(existing_tags + tags))
-                        await knowledge_manager.edit_knowledge_point_async(
-                            point_id, {"tags": new_tags}
-                        )
-                    else:
-                        task.errors.append({"id": point_id, "error": "知識點不存在"})
-                except Exception as e:
-                    task.errors.append({"id": point_id, "error": str(e)})
-
-                task.processed = i + 1
-                task.progress = int((task.processed / task.total) * 100)
-
-                if i % 10 == 0:
-                    await asyncio.sleep(0.1)
-
-        elif operation == BatchOperation.EXPORT:
-            # 批量導出
-            export_data = []
-            for i, point_id in enumerate(ids):
-                try:
-                    point = await knowledge_manager.get_knowledge_point_async(point_id)
-                    if point:
-                        export_data.append(point.to_dict())
-                    else:
-                        task.errors.append({"id": point_id, "error": "知識點不存在"})
-                except Exception as e:
-                    task.errors.append({"id": point_id, "error": str(e)})
-
-                task.processed = i + 1
-                task.progress = int((task.processed / task.total) * 100)
-
-            task.result = {
-                "data": export_data,
-                "format": data.get("format", "json") if data else "json",
-            }
-
-        elif operation == BatchOperation.RESTORE:
-            # 批量復原
-            for i, point_id in enumerate(ids):
-                try:
-                    success = await knowledge_manager.restore_point_async(point_id)
-                    if not success:
-                        task.errors.append({"id": point_id, "error": "復原失敗"})
-                except Exception as e:
-                    task.errors.append({"id": point_id, "error": str(e)})
-
-                task.processed = i + 1
-                task.progress = int((task.processed / task.total) * 100)
-
-                if i % 10 == 0:
-                    await asyncio.sleep(0.1)
-
-        task.status = "completed"
-        task.eta = datetime.now().isoformat()
-
-    except Exception as e:
-        task.status = "failed"
-        task.errors.append({"error": f"批量操作失敗: {str(e)}"})
-        logger.error(f"批量操作失敗: {e}")
-
-
 # ==================== TASK-32: 每日知識點上限功能 ====================
 
 
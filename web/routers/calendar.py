@@ -60,7 +60,7 @@ async def get_month_data(year: int, month: int) -> dict:
     await migrate_json_to_db()
 
     km = await get_know_service()  # TASK-31: 使用純異步服務
-    knowledge_points = await km.get_knowledge_points_async()
+    knowledge_points = await km.get_point_summaries_async()
 
     # 計算月份的第一天和最後一天
     first_day = date(year, month, 1)
@@ -219,7 +219,7 @@ async def get_day_details(date_str: str):
         raise HTTPException(status_code=400, detail="Invalid date format") from e
 
     km = await get_know_service()  # TASK-31: 使用純異步服務
-    knowledge_points = await km.get_knowledge_points_async()
+    knowledge_points = await km.get_point_summaries_async()
 
     # 獲取該日的待複習知識點
     due_reviews = []
@@ -6,9 +6,14 @@ from collections import defaultdict
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 
+from core.database.repositories.know_repo import (
+    MASTERY_BANDS,
+    decode_page_cursor,
+    encode_page_cursor,
+)
 from core.error_types import ErrorCategory, ErrorTypeSystem
 
 # TASK-34: 引入統一API端點管理系統，消除硬編碼
@@ -23,14 +28,42 @@ router = APIRouter()
 
 @router.get(API_ENDPOINTS.KNOWLEDGE_PAGE, response_class=HTMLResponse)
 async def knowledge_points(
-    request: Request, category: Optional[str] = None, mastery: Optional[str] = None
+    request: Request,
+    category: Optional[str] = None,
+    mastery: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
 ):
-    """知識點瀏覽頁面"""
+    """知識點瀏覽頁面
+
+    指定 `limit` 時以 keyset 游標分頁載入，只讀取當頁知識點；未指定時載入全部。
+    """
     templates = get_templates()
     knowledge = await get_know_service()  # TASK-31: 使用純異步服務
 
+    next_cursor = None
+    if limit:
+        try:
+            page_cursor = decode_page_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        # 類別與掌握度篩選交給資料庫，避免分頁後再過濾導致頁面變空
+        valid_category = None
+        if category:
+            try:
+                ErrorCategory.from_string(category)
+                valid_category = category
+            except (ValueError, KeyError, AttributeError):
+                pass
+        all_points, page_next = await knowledge.get_points_page_async(
+            limit,
+            page_cursor,
+            category=valid_category,
+            mastery=mastery if mastery in MASTERY_BANDS else None,
+        )
+        next_cursor = encode_page_cursor(page_next)
     # 獲取所有未刪除的知識點
-    if hasattr(knowledge, "get_active_points_async"):
+    elif hasattr(knowledge, "get_active_points_async"):
         all_points = await knowledge.get_active_points_async()
     elif hasattr(knowledge, "get_knowledge_points_async"):
         all_points = await knowledge.get_knowledge_points_async()
@@ -50,8 +83,8 @@ async def knowledge_points(
         except (ValueError, KeyError, AttributeError):
             pass
 
-    # 根據掌握度篩選
-    if mastery:
+    # 根據掌握度篩選（分頁模式已由資料庫篩選）
+    if mastery and not limit:
         if mastery == "low":
             all_points = [p for p in all_points if p.mastery_level < 0.3]
         elif mastery == "medium":
@@ -147,6 +180,8 @@ async def knowledge_points(
             "review_queue": review_queue,  # 複習佇列
             "due_points": due_points,  # 已到期的知識點
             "now": now,  # 當前時間
+            "page_limit": limit,  # 分頁模式的每頁數量
+            "next_cursor": next_cursor,  # 下一頁游標（None 表示沒有下一頁）
             "active": "knowledge",
         },
     )
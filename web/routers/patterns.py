@@ -2,16 +2,17 @@
 Grammar patterns routes for the Linker web application.
 """
 
-import json
-from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 
+from core.pattern_catalog import get_pattern_catalog
+
 # TASK-34: 引入統一API端點管理系統，消除硬編碼
 from web.config.api_endpoints import API_ENDPOINTS
 from web.dependencies import get_knowledge_assets, get_logger, get_templates
+from web.http_cache import cached_json_response, make_etag, not_modified_response
 
 router = APIRouter()
 logger = get_logger()
@@ -23,60 +24,41 @@ def patterns(request: Request, category: Optional[str] = None, q: Optional[str]
     templates = get_templates()
     assets = get_knowledge_assets()
 
-    # 載入所有擴充的句型資料
-    enriched_file = Path("assets/patterns_enriched_complete.json")
-    if enriched_file.exists():
-        with open(enriched_file, encoding="utf-8") as f:
-            data = json.load(f)
-            # 支援新舊兩種格式
-            patterns = data.get("patterns", data.get("data", []))
+    catalog = get_pattern_catalog()
+    if catalog.patterns:
+        categories = catalog.categories
+        filtered_patterns = catalog.filter(category=category, q=q)
     else:
-        # 降級使用原始資料
-        grammar_file = Path("data/grammar_patterns.json")
-        if grammar_file.exists():
-            with open(grammar_file, encoding="utf-8") as f:
-                data = json.load(f)
-                # 支援新舊兩種格式
-                if isinstance(data, dict):
-                    patterns = data.get("patterns", data.get("data", []))
-                else:
-                    patterns = data  # 舊格式純陣列
-        else:
-            # 使用 assets 作為最後的後備
-            all_patterns = assets.get_grammar_patterns()
-            patterns = [
-                {
-                    "id": p.id or f"GP{i:03d}",
-                    "pattern": p.pattern,
-                    "category": p.category,
-                    "explanation": p.explanation,
-                    "examples": [{"zh": p.example_zh, "en": p.example_en}]
-                    if p.example_zh or p.example_en
-                    else [],
-                }
-                for i, p in enumerate(all_patterns, 1)
-            ]
-
-    # 提取分類
-    categories = sorted({p.get("category") for p in patterns if p.get("category")})
-
-    # 篩選
-    filtered_patterns = patterns
-    if category:
-        filtered_patterns = [p for p in filtered_patterns if p.get("category") == category]
-    if q:
-        query = q.strip().lower()
-        filtered_patterns = [
-            p
-            for p in filtered_patterns
-            if (query in p.get("pattern", "").lower())
-            or (query in p.get("formula", "").lower())
-            or (query in p.get("explanation", "").lower())
-            or any(
-                query in ex.get("zh", "").lower() or query in ex.get("en", "").lower()
-                for ex in p.get("examples", [])
-            )
+        # 沒有句型檔案時，使用 assets 作為最後的後備
+        all_patterns = assets.get_grammar_patterns()
+        patterns = [
+            {
+                "id": p.id or f"GP{i:03d}",
+                "pattern": p.pattern,
+                "category": p.category,
+                "explanation": p.explanation,
+                "examples": [{"zh": p.example_zh, "en": p.example_en}]
+                if p.example_zh or p.example_en
+                else [],
+            }
+            for i, p in enumerate(all_patterns, 1)
         ]
+        categories = sorted({p.get("category") for p in patterns if p.get("category")})
+        filtered_patterns = patterns
+        if category:
+            filtered_patterns = [p for p in filtered_patterns if p.get("category") == category]
+        if q:
+            query = q.strip().lower()
+            filtered_patterns = [
+                p
+                for p in filtered_patterns
+                if (query in (p.get("pattern") or "").lower())
+                or (query in (p.get("explanation") or "").lower())
+                or any(
+                    query in (ex.get("zh") or "").lower() or query in (ex.get("en") or "").lower()
+                    for ex in p.get("examples", [])
+                )
+            ]
 
     return templates.TemplateResponse(
         "patterns.html",
@@ -96,32 +78,7 @@ def pattern_detail(request: Request, pattern_id: str):
     """句型詳情頁面"""
     templates = get_templates()
 
-    # 載入擴充資料
-    enriched_file = Path("assets/patterns_enriched_complete.json")
-    if enriched_file.exists():
-        with open(enriched_file, encoding="utf-8") as f:
-            data = json.load(f)
-            # 支援新舊兩種格式
-            patterns = data.get("patterns", data.get("data", []))
-    else:
-        # 嘗試從 grammar_patterns.json 載入
-        grammar_file = Path("data/grammar_patterns.json")
-        if grammar_file.exists():
-            with open(grammar_file, encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    patterns = data.get("patterns", data.get("data", []))
-                else:
-                    patterns = data
-        else:
-            patterns = []
-
-    # 尋找指定句型
-    pattern = None
-    for p in patterns:
-        if p.get("id") == pattern_id:
-            pattern = p
-            break
+    pattern = get_pattern_catalog().get(pattern_id)
 
     if not pattern:
         # 如果找不到，返回列表頁
@@ -138,33 +95,32 @@ def pattern_detail(request: Request, pattern_id: str):
 
 
 @router.get(API_ENDPOINTS.PATTERNS_BASE, response_class=JSONResponse)
-def get_all_patterns_api():
-    """API 端點：獲取所有文法句型列表，用於練習模式選擇。"""
+def get_all_patterns_api(request: Request):
+    """API 端點：獲取所有文法句型列表，用於練習模式選擇。
+
+    以句型檔案的修改時間作為版本，支援 ETag / Last-Modified 條件式請求與壓縮。
+    """
     try:
-        enriched_file = Path("assets/patterns_enriched_complete.json")
-        if not enriched_file.exists():
+        catalog = get_pattern_catalog()
+        (source, mtime), patterns_summary = catalog.versioned_summaries()
+        if not patterns_summary:
             return JSONResponse(
                 {"success": False, "error": "Patterns data not found."}, status_code=404
             )
 
-        with open(enriched_file, encoding="utf-8") as f:
-            data = json.load(f)
-            patterns = data.get("patterns", data.get("data", []))
-
-        # 只回傳必要的資訊以減小傳輸量
-        patterns_summary = [
-            {
-                "id": p.get("id"),
-                "pattern": p.get("pattern"),
-                "category": p.get("category", "未分類"),
-                "formula": p.get("formula", ""),
-                "core_concept": p.get("core_concept", ""),
-            }
-            for p in patterns
-            if p.get("id") and p.get("pattern")
-        ]
-
-        return JSONResponse({"success": True, "patterns": patterns_summary})
+        etag = make_etag("patterns", source, mtime)
+        not_modified = not_modified_response(request, etag, mtime)
+        if not_modified is not None:
+            return not_modified
+
+        # 只回傳必要的資訊以減小傳輸量（摘要在載入時預先建立，編碼結果依版本快取）
+        return cached_json_response(
+            request,
+            {"success": True, "patterns": patterns_summary},
+            etag,
+            last_modified=mtime,
+            cache_body=True,
+        )
 
     except Exception as e:
         logger.error(f"Error fetching patterns API: {e}", exc_info=True)
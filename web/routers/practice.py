@@ -2,13 +2,13 @@
 Practice routes for the Linker web application. (Refactored for API-first approach)
 """
 
-import json
 from datetime import datetime
-from pathlib import Path
 
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 
+from core.pattern_catalog import get_pattern_catalog
+
 # TASK-34: 引入統一API端點管理系統，消除硬編碼
 from web.config.api_endpoints import API_ENDPOINTS
 from web.dependencies import (
@@ -16,6 +16,7 @@ from web.dependencies import (
     get_know_service,  # TASK-31: 使用新的純異步服務
     get_knowledge_assets,
     get_logger,
+    get_question_pool,
     get_templates,
 )
 from web.models.validation import (
@@ -98,7 +99,7 @@ async def grade_answer_api(request: GradeAnswerRequest):
         target_point_ids = request.target_point_ids
 
         # 1. 使用 AI 進行批改
-        result = ai.grade_translation(chinese=chinese, english=english)
+        result = await ai.grade_translation_async(chinese=chinese, english=english)
 
         # 檢查 AI 服務是否真的成功（檢測 fallback response）
         if result.get("service_error") or "AI 服務暫時不可用" in result.get(
@@ -119,8 +120,8 @@ async def grade_answer_api(request: GradeAnswerRequest):
         # 2. 更新知識點掌握度（如果是複習模式）
         is_correct = result.get("is_generally_correct", False)
         if mode == "review" and target_point_ids:
-            for point_id in target_point_ids:
-                await knowledge.update_knowledge_point(point_id, is_correct)  # TASK-31: 添加 await
+            # 所有目標知識點以單一原子語句更新，不需逐一讀取再寫回
+            await knowledge.update_mastery_batch_async(target_point_ids, is_correct)
 
         # 3. 根據配置決定是自動保存還是返回待確認點
         pending_knowledge_points = []
@@ -232,59 +233,18 @@ async def confirm_knowledge_points(request: ConfirmKnowledgeRequest):
     knowledge = await get_know_service()  # TASK-31: 使用純異步服務
 
     try:
-        confirmed_ids = []
-
-        for point_data in request.confirmed_points:
-            # 為每個錯誤創建知識點
-            error = point_data.error
-
-            # 調用現有的 _process_error 邏輯或直接添加知識點
-            if hasattr(knowledge, "add_knowledge_point_from_error"):
-                point_id = await knowledge.add_knowledge_point_from_error(  # TASK-31: 添加 await
-                    chinese_sentence=point_data.chinese_sentence,
-                    user_answer=point_data.user_answer,
-                    error=error,
-                    correct_answer=point_data.correct_answer,
-                )
-            else:
-                # 如果方法不存在，使用現有的添加知識點邏輯
-                from datetime import datetime
-
-                from core.knowledge import KnowledgePoint
-
-                point = KnowledgePoint(
-                    id=knowledge._get_next_id()
-                    if hasattr(knowledge, "_get_next_id")
-                    else len(knowledge.knowledge_points) + 1,
-                    key_point=error.get("key_point_summary", "未知錯誤"),
-                    original_phrase=error.get("original_phrase", point_data.user_answer),
-                    correction=error.get("correction", point_data.correct_answer),
-                    explanation=error.get("explanation", ""),
-                    category=error.get("category", "other"),
-                    subtype=error.get("subtype", "general"),
-                    mastery_level=0.1,
-                    mistake_count=1,
-                    correct_count=0,
-                    last_seen=datetime.now().isoformat(),
-                    next_review=datetime.now().isoformat(),
-                    created_at=datetime.now().isoformat(),
-                    original_error={
-                        "chinese_sentence": point_data.chinese_sentence,
-                        "user_answer": point_data.user_answer,
-                        "correct_answer": point_data.correct_answer,
-                        "timestamp": datetime.now().isoformat(),
-                    },
-                )
-
-                if hasattr(knowledge, "knowledge_points"):
-                    knowledge.knowledge_points.append(point)
-                    point_id = point.id
-                else:
-                    # 使用適配器的方法
-                    point_id = await knowledge.add_knowledge_point_async(point)
-
-            confirmed_ids.append(point_id)
-
+        # 批次寫入：整批確認只需固定次數的資料庫往返
+        confirmed_ids = await knowledge.add_knowledge_points_from_errors(
+            [
+                {
+                    "chinese_sentence": point_data.chinese_sentence,
+                    "user_answer": point_data.user_answer,
+                    "error": point_data.error,
+                    "correct_answer": point_data.correct_answer,
+                }
+                for point_data in request.confirmed_points
+            ]
+        )
         logger.info(f"Confirmed {len(confirmed_ids)} knowledge points: {confirmed_ids}")
 
         return JSONResponse(
@@ -321,7 +281,7 @@ async def generate_question_api(request: GenerateQuestionRequest):
             if not review_points:
                 return JSONResponse({"success": False, "error": "沒有待複習的知識點"})
 
-            payload = ai.generate_review_sentence(
+            payload = await ai.generate_review_sentence_async(
                 knowledge_points=review_points, level=level, length=length
             )
             
@@ -350,17 +310,14 @@ async def generate_question_api(request: GenerateQuestionRequest):
 
         # 文法句型模式 - 現在支援隨機選擇
         elif mode == "pattern":
-            # 載入句型資料
-            enriched_file = Path("assets/patterns_enriched_complete.json")
-            if not enriched_file.exists():
+            # 句型資料由程序內共用的句型目錄提供，不再每次讀檔
+            catalog = get_pattern_catalog()
+            all_patterns = catalog.patterns
+            if not all_patterns:
                 return JSONResponse(
                     {"success": False, "error": "Patterns data not found."}, status_code=404
                 )
 
-            with open(enriched_file, encoding="utf-8") as f:
-                patterns_data = json.load(f)
-                all_patterns = patterns_data.get("patterns", patterns_data.get("data", []))
-
             # 如果沒有指定 pattern_id，隨機選擇一個
             if not pattern_id:
                 import random
@@ -371,14 +328,14 @@ async def generate_question_api(request: GenerateQuestionRequest):
                 )
             else:
                 # 尋找指定的句型
-                target_pattern = next((p for p in all_patterns if p.get("id") == pattern_id), None)
+                target_pattern = catalog.get(pattern_id)
                 if not target_pattern:
                     return JSONResponse(
                         {"success": False, "error": "找不到指定的句型"}, status_code=404
                     )
 
             # 呼叫 AI Service 生成與句型相關的題目
-            payload = ai.generate_sentence_for_pattern(
+            payload = await ai.generate_sentence_for_pattern_async(
                 pattern_data=target_pattern, level=level, length=length
             )
 
@@ -405,11 +362,14 @@ async def generate_question_api(request: GenerateQuestionRequest):
                 }
             )
 
-        # 預設為新題模式
-        bank = assets.get_example_bank(length=length, difficulty=level)
-        payload = ai.generate_practice_sentence(
-            level=level, length=length, examples=bank[:5] if bank else None
-        )
+        # 預設為新題模式：優先從預生成題目池取題，池中無題時才即時生成
+        pool = get_question_pool()
+        payload = pool.take(mode, length, level) if pool and pool.supports(mode) else None
+        if payload is None:
+            examples = assets.sample_examples(length=length, difficulty=level, k=5)
+            payload = await ai.generate_practice_sentence_async(
+                level=level, length=length, examples=examples or None
+            )
         
         # 🔥 透明化改造：檢查真實的服務狀態，不再說謊！
         if payload.get("service_error"):
@@ -448,7 +408,7 @@ async def ai_service_health_check():
     提供真實的 AI 服務健康狀況，不再隱藏問題！
     """
     ai = get_ai_service()
-    health_report = ai.health_check()
+    health_report = await ai.health_check_async()
     
     # 根據真實的健康狀況返回適當的 HTTP 狀態碼
     status_code_map = {
@@ -473,6 +433,27 @@ async def ai_service_health_check():
     return JSONResponse(health_report, status_code=status_code)
 
 
+@router.get(API_ENDPOINTS.QUESTION_POOL_STATS, response_class=JSONResponse)
+async def question_pool_stats():
+    """題目池狀態：各分區存量與命中率"""
+    pool = get_question_pool()
+    if pool is None:
+        return JSONResponse({"enabled": False})
+    return JSONResponse({"enabled": True, **pool.get_stats()})
+
+
+@router.get(API_ENDPOINTS.AI_PROMPT_STATS, response_class=JSONResponse)
+async def ai_prompt_stats():
+    """AI 提示詞範本統計：各範本的版本、靜態 token 數與平均提示詞 / 回應大小，以及批改快取命中率"""
+    ai = get_ai_service()
+    return JSONResponse(
+        {
+            "templates": ai.prompts.get_stats(),
+            "grading_cache": ai.grading_cache.get_stats() if ai.grading_cache else None,
+        }
+    )
+
+
 @router.get("/api/test-transparency", response_class=JSONResponse)
 async def test_transparency():
     """
@@ -494,7 +475,7 @@ async def test_transparency():
     
     # 嘗試生成問題
     try:
-        payload = ai.generate_practice_sentence(
+        payload = await ai.generate_practice_sentence_async(
             level=fake_request.level, 
             length=fake_request.length,
             examples=["透明化測試例句"]
@@ -141,7 +141,7 @@ class BatchOperations {
             const result = await response.json();
             
             if (result.success && result.result) {
-                this.downloadExportData(result.result);
+                this.downloadExportData(result.result, result.processed - (result.errors?.length || 0));
             } else {
                 this.handleBatchResult(result, '批量導出');
             }
@@ -228,7 +228,7 @@ class BatchOperations {
                 this.updateProgressBar(taskId, progress);
                 
                 // 檢查是否完成
-                if (progress.status === 'completed' || progress.status === 'failed') {
+                if (['completed', 'failed', 'cancelled'].includes(progress.status)) {
                     clearInterval(pollInterval);
                     this.progressPollers.delete(taskId);
                     
@@ -440,42 +440,16 @@ class BatchOperations {
     }
     
     /**
-     * 下載導出數據
+     * 下載導出數據（由匯出端點串流產生，任務結果只包含下載連結）
      */
-    downloadExportData(exportResult) {
-        const { data, format } = exportResult;
-        
-        let content;
-        let filename;
-        let mimeType;
-        
-        if (format === 'json') {
-            content = JSON.stringify(data, null, 2);
-            filename = `knowledge_export_${new Date().toISOString().split('T')[0]}.json`;
-            mimeType = 'application/json';
-        } else if (format === 'csv') {
-            // TODO: 實作 CSV 格式轉換
-            content = this.convertToCSV(data);
-            filename = `knowledge_export_${new Date().toISOString().split('T')[0]}.csv`;
-            mimeType = 'text/csv';
-        } else {
-            content = JSON.stringify(data, null, 2);
-            filename = `knowledge_export_${new Date().toISOString().split('T')[0]}.txt`;
-            mimeType = 'text/plain';
-        }
-        
-        // 創建下載連結
-        const blob = new Blob([content], { type: mimeType });
-        const url = URL.createObjectURL(blob);
+    downloadExportData(exportResult, count) {
         const link = document.createElement('a');
-        link.href = url;
-        link.download = filename;
+        link.href = exportResult.download_url;
         document.body.appendChild(link);
         link.click();
         document.body.removeChild(link);
-        URL.revokeObjectURL(url);
         
-        this.showNotification(`已導出 ${data.length} 個知識點`, 'success');
+        this.showNotification(`已導出 ${count} 個知識點`, 'success');
     }
     
     /**
@@ -574,31 +548,6 @@ class BatchOperations {
         }, 3000);
     }
     
-    /**
-     * 轉換為 CSV 格式
-     */
-    convertToCSV(data) {
-        if (!data || data.length === 0) return '';
-        
-        const headers = ['ID', '關鍵點', '錯誤片段', '正確片段', '分類', '掌握度', '錯誤次數'];
-        const rows = data.map(point => [
-            point.id,
-            point.key_point,
-            point.original_phrase,
-            point.correction,
-            point.category,
-            (point.mastery_level * 100).toFixed(0) + '%',
-            point.mistake_count
-        ]);
-        
-        const csvContent = [
-            headers.join(','),
-            ...rows.map(row => row.map(cell => `"${cell}"`).join(','))
-        ].join('\n');
-        
-        return csvContent;
-    }
-    
     /**
      * 獲取所有樣式
      */
@@ -29,6 +29,9 @@ class ApiEndpointManager {
             knowledge: '/api/knowledge',
             knowledgeDetail: '/api/knowledge/{id}',
             knowledgeRecommendations: '/api/knowledge/recommendations',
+            knowledgeSearch: '/api/knowledge/search',
+            knowledgeExport: '/api/knowledge/export',
+            knowledgeImport: '/api/knowledge/import',
             knowledgeBatch: '/api/knowledge/batch',
             knowledgeBatchProgress: '/api/knowledge/batch/{taskId}/progress',
             knowledgeRestore: '/api/knowledge/{id}/restore',